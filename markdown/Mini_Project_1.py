@@ -1,9 +1,27 @@
-
-import re
 import requests
 import json
 import os
-from datetime import datetime
+import argparse
+import contextlib
+import sys
+import time
+
+from batch import find_markdown_files, analyze_incremental, iter_analyze_files, iter_incremental
+from batch import summarize
+from extractors import EXTRACTORS
+from github_client import GitHubClient, RateLimitError
+from html_report import write_report
+from image_checker import describe_image, resolve_image, validate_images
+from link_cache import LinkCache
+from link_checker import is_external, validate_links
+from link_index import LinkIndex, document_root, search_roots
+from link_policy import ValidationPolicy
+from manifest import Manifest
+from output import FORMATS as OUTPUT_FORMATS, RecordWriter
+from patterns import CODE_BLOCK, HEADING, IMAGE, INLINE_CODE, LINK, MARKDOWN_SYNTAX
+from patterns import REF_LINK, WIKI_LINK
+from tokenizer import analyze_content, analyze_file
+from watcher import create_watcher
 
 
 def load_config():
@@ -14,7 +32,31 @@ def load_config():
         'validate_images': False,
         'generate_html': False,
         'exclude_extensions': [],
-        'github_token': None
+        'github_token': None,
+        'max_workers': 10,
+        'max_per_host': 4,
+        'link_cache_file': 'link_cache.db',
+        'cache_ttl_ok': 86400,
+        'cache_ttl_broken': 3600,
+        'cache_max_entries': 50000,
+        'manifest_file': None,
+        'github_api_url': 'https://api.github.com',
+        'github_raw_url': 'https://raw.githubusercontent.com',
+        'github_ref': 'HEAD',
+        'github_recursive': True,
+        'github_workers': 8,
+        'github_max_rate_limit_wait': 60,
+        'github_cache_file': 'github_cache.db',
+        'extractors': [],
+        'max_image_bytes': 1048576,
+        'resolve_local_links': True,
+        'max_retries': 2,
+        'retry_backoff': 0.5,
+        'retry_max_backoff': 8,
+        'circuit_breaker_threshold': 3,
+        'circuit_breaker_reset': 60,
+        'watch_interval': 0.5,
+        'watch_refresh': 1
     }
     
     config_file = 'config.json'
@@ -33,11 +75,11 @@ def load_config():
 def count_words(content):
     """Count words in markdown content, excluding code blocks."""
     # Remove code blocks
-    content_no_code = re.sub(r'```[\s\S]*?```', '', content)
-    content_no_code = re.sub(r'`[^`]+`', '', content_no_code)
+    content_no_code = CODE_BLOCK.sub('', content)
+    content_no_code = INLINE_CODE.sub('', content_no_code)
     
     # Remove markdown syntax
-    content_clean = re.sub(r'[#*_\[\]()!]', ' ', content_no_code)
+    content_clean = MARKDOWN_SYNTAX.sub(' ', content_no_code)
     
     # Count words
     words = content_clean.split()
@@ -48,8 +90,7 @@ def count_headings(content):
     """Count headings by level (h1-h6)."""
     headings = {'h1': 0, 'h2': 0, 'h3': 0, 'h4': 0, 'h5': 0, 'h6': 0}
     
-    heading_pattern = r'^(#{1,6})\s+.+$'
-    matches = re.finditer(heading_pattern, content, re.MULTILINE)
+    matches = HEADING.finditer(content)
     
     for match in matches:
         level = len(match.group(1))
@@ -63,8 +104,7 @@ def extract_links(content):
     links = []
     
     # Standard markdown links
-    link_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-    matches = re.finditer(link_pattern, content)
+    matches = LINK.finditer(content)
     
     for match in matches:
         links.append({
@@ -74,8 +114,7 @@ def extract_links(content):
         })
     
     # Wiki-style links [[Page Name]]
-    wiki_pattern = r'\[\[([^\]]+)\]\]'
-    wiki_matches = re.finditer(wiki_pattern, content)
+    wiki_matches = WIKI_LINK.finditer(content)
     
     for match in wiki_matches:
         links.append({
@@ -85,8 +124,7 @@ def extract_links(content):
         })
     
     # Reference-style links [text][ref]
-    ref_pattern = r'\[([^\]]+)\]\[([^\]]+)\]'
-    ref_matches = re.finditer(ref_pattern, content)
+    ref_matches = REF_LINK.finditer(content)
     
     for match in ref_matches:
         links.append({
@@ -101,8 +139,7 @@ def extract_links(content):
 def extract_images(content):
     """Extract all markdown images ![alt](url)."""
     images = []
-    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    matches = re.finditer(image_pattern, content)
+    matches = IMAGE.finditer(content)
     
     for match in matches:
         images.append({
@@ -113,299 +150,11 @@ def extract_images(content):
     return images
 
 
-def validate_links(links, config):
-    """Validate a list of links by checking if they're accessible."""
-    broken_links = []
-    timeout = config.get('timeout', 5)
-    
-    for link in links:
-        url = link['url']
-        
-        # Skip anchor links, relative paths, wiki links, and references
-        if (url.startswith('#') or 
-            url.startswith('ref:') or 
-            link.get('type') == 'wiki' or
-            not url.startswith(('http://', 'https://'))):
-            link['status'] = 'Skipped (local/anchor/wiki)'
-            continue
-        
-        try:
-            response = requests.head(url, timeout=timeout, allow_redirects=True)
-            if response.status_code < 400:
-                link['status'] = f'OK ({response.status_code})'
-            else:
-                link['status'] = f'Broken ({response.status_code})'
-                broken_links.append(link)
-        except requests.exceptions.Timeout:
-            link['status'] = 'Broken (Timeout)'
-            broken_links.append(link)
-        except Exception as e:
-            link['status'] = f'Broken ({type(e).__name__})'
-            broken_links.append(link)
-    
-    return broken_links
-
-
 def generate_html_report(filename, word_count, headings, links, images, broken_links):
     """Generate an HTML report with charts."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Calculate statistics
-    total_headings = sum(headings.values())
-    total_links = len(links)
-    total_broken = len(broken_links)
-    total_images = len(images)
-    
-    # Prepare heading data for chart
-    heading_labels = [f"H{i}" for i in range(1, 7) if headings[f'h{i}'] > 0]
-    heading_values = [headings[f'h{i}'] for i in range(1, 7) if headings[f'h{i}'] > 0]
-    
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Markdown Analysis Report - {os.path.basename(filename)}</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 10px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{ font-size: 2.5em; margin-bottom: 10px; }}
-        .header p {{ opacity: 0.9; }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 8px;
-            text-align: center;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            transition: transform 0.3s;
-        }}
-        .stat-card:hover {{ transform: translateY(-5px); }}
-        .stat-icon {{ font-size: 3em; margin-bottom: 10px; }}
-        .stat-value {{ font-size: 2.5em; font-weight: bold; color: #667eea; }}
-        .stat-label {{ color: #666; margin-top: 5px; }}
-        .content {{
-            padding: 30px;
-        }}
-        .section {{
-            margin-bottom: 40px;
-        }}
-        .section h2 {{
-            color: #333;
-            border-bottom: 3px solid #667eea;
-            padding-bottom: 10px;
-            margin-bottom: 20px;
-        }}
-        .chart-container {{
-            position: relative;
-            height: 300px;
-            margin: 20px 0;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background: #667eea;
-            color: white;
-            font-weight: 600;
-        }}
-        tr:hover {{ background: #f5f5f5; }}
-        .badge {{
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            font-weight: 600;
-        }}
-        .badge-success {{ background: #d4edda; color: #155724; }}
-        .badge-danger {{ background: #f8d7da; color: #721c24; }}
-        .badge-warning {{ background: #fff3cd; color: #856404; }}
-        .footer {{
-            background: #f8f9fa;
-            padding: 20px;
-            text-align: center;
-            color: #666;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📊 Markdown Analysis Report</h1>
-            <p>{os.path.basename(filename)}</p>
-            <p style="font-size: 0.9em; opacity: 0.8;">Generated on {timestamp}</p>
-        </div>
-        
-        <div class="stats">
-            <div class="stat-card">
-                <div class="stat-icon">📝</div>
-                <div class="stat-value">{word_count:,}</div>
-                <div class="stat-label">Words</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-icon">📑</div>
-                <div class="stat-value">{total_headings}</div>
-                <div class="stat-label">Headings</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-icon">🔗</div>
-                <div class="stat-value">{total_links}</div>
-                <div class="stat-label">Links</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-icon">🖼️</div>
-                <div class="stat-value">{total_images}</div>
-                <div class="stat-label">Images</div>
-            </div>
-        </div>
-        
-        <div class="content">
-            <div class="section">
-                <h2>📑 Heading Distribution</h2>
-                <div class="chart-container">
-                    <canvas id="headingChart"></canvas>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>🔗 Link Analysis</h2>
-                <div class="chart-container" style="height: 200px;">
-                    <canvas id="linkChart"></canvas>
-                </div>
-                {f'''
-                <h3 style="margin-top: 30px; color: #dc3545;">⚠️ Broken Links ({total_broken})</h3>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>URL</th>
-                            <th>Status</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"<tr><td>{link['url']}</td><td><span class='badge badge-danger'>{link['status']}</span></td></tr>" for link in broken_links])}
-                    </tbody>
-                </table>
-                ''' if broken_links else '<p style="color: #28a745; font-weight: 600;">✓ All links are valid!</p>'}
-            </div>
-            
-            {f'''
-            <div class="section">
-                <h2>🖼️ Images</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Alt Text</th>
-                            <th>URL</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {"".join([f"<tr><td>{img['alt'] if img['alt'] else '<em>(no alt text)</em>'}</td><td>{img['url']}</td></tr>" for img in images])}
-                    </tbody>
-                </table>
-            </div>
-            ''' if images else ''}
-        </div>
-        
-        <div class="footer">
-            <p>Generated by Markdown File Analyzer</p>
-        </div>
-    </div>
-    
-    <script>
-        // Heading Distribution Chart
-        const headingCtx = document.getElementById('headingChart').getContext('2d');
-        new Chart(headingCtx, {{
-            type: 'bar',
-            data: {{
-                labels: {heading_labels},
-                datasets: [{{
-                    label: 'Count',
-                    data: {heading_values},
-                    backgroundColor: 'rgba(102, 126, 234, 0.6)',
-                    borderColor: 'rgba(102, 126, 234, 1)',
-                    borderWidth: 2
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{ display: false }},
-                    title: {{ display: false }}
-                }},
-                scales: {{
-                    y: {{
-                        beginAtZero: true,
-                        ticks: {{ stepSize: 1 }}
-                    }}
-                }}
-            }}
-        }});
-        
-        // Link Status Chart
-        const linkCtx = document.getElementById('linkChart').getContext('2d');
-        new Chart(linkCtx, {{
-            type: 'doughnut',
-            data: {{
-                labels: ['Valid Links', 'Broken Links'],
-                datasets: [{{
-                    data: [{total_links - total_broken}, {total_broken}],
-                    backgroundColor: ['rgba(40, 167, 69, 0.6)', 'rgba(220, 53, 69, 0.6)'],
-                    borderColor: ['rgba(40, 167, 69, 1)', 'rgba(220, 53, 69, 1)'],
-                    borderWidth: 2
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{ position: 'bottom' }}
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>
-"""
-    
     output_file = filename.replace('.md', '_report.html')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    write_report(output_file, os.path.basename(filename), word_count, headings,
+                 links, images, broken_links)
     
     print(f"\n✓ HTML report generated: {output_file}")
     return output_file
@@ -444,13 +193,30 @@ def generate_report(word_count, headings, links, images, broken_links):
     if images:
         for img in images:
             alt = img['alt'] if img['alt'] else '(no alt text)'
-            print(f"   - {alt}: {img['url']}")
+            if 'status' in img:
+                print(f"   - {alt}: {img['url']} [{describe_image(img)}]")
+            else:
+                print(f"   - {alt}: {img['url']}")
+        broken_images = sum(1 for img in images if img.get('status', '').startswith('Broken'))
+        oversized = sum(1 for img in images if img.get('oversized'))
+        if broken_images:
+            print(f"   Broken: {broken_images}")
+        if oversized:
+            print(f"   ⚠️ Oversized: {oversized} (over max_image_bytes, slow to load)")
     print()
     
     print("=" * 60)
 
 
-def analyze_github_repo(repo_url, config):
+def print_extractor_results(analysis, extractors):
+    """Print one summary line per enabled extractor."""
+    for name in extractors:
+        print(f"🧩 {name}: {EXTRACTORS[name].summary(analysis[name])}")
+    if extractors:
+        print()
+
+
+def analyze_github_repo(repo_url, config, client=None):
     """Analyze markdown files from a GitHub repository."""
     try:
         # Extract owner and repo name from URL
@@ -458,33 +224,20 @@ def analyze_github_repo(repo_url, config):
         owner = parts[-2]
         repo = parts[-1]
         
-        # GitHub API endpoint
-        api_url = f"https://api.github.com/repos/{owner}/{repo}/contents"
-        
-        headers = {}
-        if config.get('github_token'):
-            headers['Authorization'] = f"token {config['github_token']}"
+        client = client or GitHubClient.from_config(config)
+        recursive = config.get('github_recursive', True)
         
         print(f"\n🔍 Fetching repository contents from GitHub...")
-        response = requests.get(api_url, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            print(f"❌ Failed to fetch repository: {response.status_code}")
+        try:
+            md_files = client.list_markdown_files(owner, repo, config.get('github_ref', 'HEAD'),
+                                                  recursive=recursive)
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ Failed to fetch repository: {e.response.status_code}")
             return None
         
-        contents = response.json()
-        
-        # Find all markdown files
-        md_files = []
-        for item in contents:
-            if item['name'].endswith('.md') or item['name'].endswith('.markdown'):
-                md_files.append({
-                    'name': item['name'],
-                    'url': item['download_url']
-                })
-        
         if not md_files:
-            print("⚠️ No markdown files found in repository root.")
+            print("⚠️ No markdown files found in repository" +
+                  ("." if recursive else " root."))
             return None
         
         print(f"✓ Found {len(md_files)} markdown file(s)")
@@ -515,8 +268,10 @@ def analyze_github_repo(repo_url, config):
         return None
 
 
-def download_github_file(file_info):
+def download_github_file(file_info, client=None):
     """Download a markdown file from GitHub."""
+    if client is not None:
+        return client.download(file_info)
     try:
         response = requests.get(file_info['url'], timeout=10)
         if response.status_code == 200:
@@ -529,15 +284,348 @@ def download_github_file(file_info):
         return None
 
 
-def main():
+def analyze_batch(paths, config, workers=None, writer=None):
+    """Analyze every markdown file under paths and print one combined report.
+
+    With a RecordWriter, each file's result is written as a record as soon
+    as it has been analyzed and its links validated, and no text report is
+    printed.
+    """
+    files = find_markdown_files(paths, config.get('exclude_extensions', []))
+    if not files:
+        print("⚠️ No markdown files found.")
+        return None
+
+    extractors = config.get('extractors', [])
+    resolve_local = config.get('resolve_local_links', True)
+    parse_extractors = parse_extractors_for(config)
+    roots = search_roots(paths)
+    print(f"\n🔍 Analyzing {len(files)} markdown file(s)...")
+    if writer is not None:
+        index = LinkIndex.build(roots) if resolve_local else None
+        return stream_batch(files, config, workers, parse_extractors, writer, index, roots)
+
+    manifest = Manifest.from_config(config)
+    try:
+        results, stale = analyze_incremental(files, manifest, workers, parse_extractors)
+        if manifest is not None:
+            print(f"♻️ Reused {len(files) - len(stale)} unchanged file(s)")
+
+        # Validate the links of every changed file together, resolving local
+        # links against one index of the whole tree
+        print("Validating links...")
+        index = None
+        if resolve_local:
+            index = LinkIndex.build(roots, results)
+            # Lookups only, so unchanged files are re-resolved too: whether
+            # their local links work depends on the other files
+            for result in results:
+                if 'error' not in result:
+                    index.resolve_links(result['links'], result['file'])
+        # One circuit breaker for links and images, so a dead host is given up on once
+        policy = ValidationPolicy.from_config(config)
+        validate_links([link for result in stale if 'error' not in result
+                        for link in result['links']
+                        if index is None or is_external(link)], config, policy=policy)
+        if config.get('validate_images'):
+            print("Validating images...")
+            validate_images([image for result in stale if 'error' not in result
+                             for image in resolve_images(result, roots)], config,
+                            policy=policy)
+        if manifest is not None:
+            for result in stale:
+                if 'error' not in result:
+                    manifest.update(result)
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+    totals = summarize(results)
+    broken_links = [link for link in totals['links'] if link['status'].startswith('Broken')]
+
+    print()
+    print("=" * 60)
+    print("PER-FILE RESULTS")
+    print("=" * 60)
+    for result in results:
+        if 'error' in result:
+            print(f"❌ {result['file']}: {result['error']}")
+            continue
+        broken = sum(1 for link in result['links'] if link['status'].startswith('Broken'))
+        print(f"📄 {result['file']}: {result['word_count']} words, "
+              f"{sum(result['headings'].values())} headings, "
+              f"{len(result['links'])} links ({broken} broken), "
+              f"{len(result['images'])} images")
+        for name in extractors:
+            print(f"   🧩 {name}: {EXTRACTORS[name].summary(result[name])}")
+    print()
+
+    print(f"📁 Files analyzed: {totals['files']}" +
+          (f" ({totals['failed']} failed)" if totals['failed'] else ""))
+    generate_report(totals['word_count'], totals['headings'], totals['links'],
+                    totals['images'], broken_links)
+
+    if config.get('generate_html'):
+        generate_html_report('batch.md', totals['word_count'], totals['headings'],
+                             totals['links'], totals['images'], broken_links)
+
+    return results
+
+
+def parse_extractors_for(config):
+    """Configured extractors, plus the heading anchors the local link index needs."""
+    extractors = config.get('extractors', [])
+    if config.get('resolve_local_links', True) and 'anchors' not in extractors:
+        return extractors + ['anchors']
+    return extractors
+
+
+def watch_batch(paths, config, workers=None, watcher=None, stop=None,
+                report_file='batch_report.html'):
+    """Analyze paths, then re-analyze files as they change until interrupted.
+
+    Parsed results, link statuses (an in-memory LinkCache unless
+    link_cache_file is set), the circuit breaker and the local link index
+    stay in memory between edits, so a save re-parses only the files that
+    changed and checks only URLs that have not been seen before. The
+    combined HTML report is rewritten in place after every change and
+    reloads itself in the browser every watch_refresh seconds.
+
+    stop (a threading.Event) ends the loop; by default it runs until
+    Ctrl+C.
+    """
+    exclude = config.get('exclude_extensions', [])
+    extractors = parse_extractors_for(config)
+    roots = search_roots(paths)
+    report_path = os.path.abspath(report_file)
+    ignored = {report_path, report_path + '.tmp'}
+    index = LinkIndex.build(roots) if config.get('resolve_local_links', True) else None
+    link_cache = LinkCache.from_config(config) or LinkCache(':memory:')
+    policy = ValidationPolicy.from_config(config)
+    own_watcher = watcher is None
+    if own_watcher:
+        watcher = create_watcher(roots, config.get('watch_interval', 0.5))
+    results = {}
+
+    def update(files, parse, parse_workers):
+        start = time.perf_counter()
+        parsed = []
+        for result in iter_analyze_files(parse, parse_workers, extractors):
+            results[result['file']] = result
+            parsed.append(result)
+            if index is not None and 'anchors' in result:
+                index.add_anchors(result['file'], result['anchors'])
+
+        ordered = [results[path] for path in files]
+        if index is not None:
+            # Lookups only, so every file is re-resolved: a change to one
+            # file can fix or break links in the others
+            for result in ordered:
+                if 'error' not in result:
+                    index.resolve_links(result['links'], result['file'])
+        fresh = [result for result in parsed if 'error' not in result]
+        validate_links([link for result in fresh for link in result['links']
+                        if index is None or is_external(link)], config, link_cache,
+                       policy=policy)
+        if config.get('validate_images'):
+            validate_images([image for result in fresh
+                             for image in resolve_images(result, roots)], config, policy=policy)
+
+        totals = summarize(ordered)
+        broken_links = [link for link in totals['links'] if link['status'].startswith('Broken')]
+        write_report(report_file, f"{totals['files']} watched file(s)", totals['word_count'],
+                     totals['headings'], totals['links'], totals['images'], broken_links,
+                     refresh=config.get('watch_refresh', 1))
+        elapsed = (time.perf_counter() - start) * 1000
+        for result in parsed:
+            if 'error' in result:
+                print(f"❌ {result['file']}: {result['error']}")
+            else:
+                broken = sum(1 for link in result['links'] if link['status'].startswith('Broken'))
+                print(f"📄 {result['file']}: {result['word_count']} words, "
+                      f"{len(result['links'])} links ({broken} broken)")
+        print(f"✓ {time.strftime('%H:%M:%S')} {report_file} updated in {elapsed:.1f} ms "
+              f"({totals['files']} files, {len(broken_links)} broken links)")
+
+    try:
+        files = find_markdown_files(paths, exclude)
+        print(f"\n👀 Watching {len(files)} markdown file(s) (Ctrl+C to stop)...")
+        update(files, files, workers)
+        while stop is None or not stop.is_set():
+            changed = watcher.wait(0.2) - ignored
+            if not changed:
+                continue
+            if index is not None:
+                for path in changed:
+                    if os.path.exists(path):
+                        index.add_file(path)
+                    else:
+                        index.discard(path)
+            files = find_markdown_files(paths, exclude)
+            removed = set(results) - set(files)
+            for path in removed:
+                del results[path]
+            # Edits touch a few files: parse them here rather than on a pool
+            parse = [path for path in files
+                     if path not in results or os.path.abspath(path) in changed]
+            if parse or removed or index is not None:
+                update(files, parse, 1)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        link_cache.close()
+        if own_watcher:
+            watcher.close()
+    return [results[path] for path in files if path in results]
+
+
+# Fields of a batch result written by --format json/ndjson, besides extractor results
+RECORD_FIELDS = ('file', 'error', 'word_count', 'headings', 'links', 'images')
+
+
+def resolve_images(result, roots=()):
+    """Resolve a batch result's image paths against its file's directory.
+
+    Root-relative paths resolve against the innermost of roots containing
+    the file, as local links do.
+    """
+    base = os.path.dirname(result['file']) or '.'
+    root = document_root(result['file'], roots)
+    for image in result['images']:
+        image['resolved'] = resolve_image(image['url'], base, root)
+    return result['images']
+
+
+def output_record(result, extractors):
+    """The structured-output record of a batch result.
+
+    Keeps the file, its counts, links, images and the configured
+    extractors' results, dropping what the analyzer adds for itself: the
+    anchors parsed for the link index and each image's resolved target.
+    """
+    record = {key: value for key, value in result.items()
+              if key in RECORD_FIELDS or key in extractors}
+    if 'images' in record:
+        record['images'] = [{key: value for key, value in image.items() if key != 'resolved'}
+                            for image in record['images']]
+    return record
+
+
+def stream_batch(files, config, workers, extractors, writer, index=None, roots=()):
+    """Analyze files and write one record per file as each one completes.
+
+    Local links are resolved against index, which picks up each file's
+    anchors as its result arrives. roots are the searched directories that
+    root-relative image paths resolve against.
+    """
+    manifest = Manifest.from_config(config)
+    # One cache for the whole run, so a URL shared by many files is checked once
+    link_cache = LinkCache.from_config(config) or LinkCache(':memory:')
+    # ...and one circuit breaker, so a dead host is given up on once
+    policy = ValidationPolicy.from_config(config)
+    # Anchors may be parsed for the index only; records carry what was asked for
+    wanted = config.get('extractors', [])
+    failed = 0
+    try:
+        for result, stale in iter_incremental(files, manifest, workers, extractors):
+            if 'error' in result:
+                failed += 1
+                writer.write(result)
+                continue
+            if index is not None and 'anchors' in result:
+                index.add_anchors(result['file'], result['anchors'])
+            if not stale:
+                # Remote statuses come from the manifest; local ones depend
+                # on the other files, so they are looked up again
+                if index is not None:
+                    index.resolve_links(result['links'], result['file'])
+            else:
+                validate_links(result['links'], config, link_cache, index, result['file'],
+                               policy)
+                if config.get('validate_images'):
+                    validate_images(resolve_images(result, roots), config, policy=policy)
+                if manifest is not None:
+                    manifest.update(result)
+            writer.write(output_record(result, wanted))
+    finally:
+        link_cache.close()
+        if manifest is not None:
+            manifest.close()
+
+    print(f"📁 Files analyzed: {writer.count - failed}" +
+          (f" ({failed} failed)" if failed else ""))
+    return None
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments; with no paths the analyzer is interactive."""
+    parser = argparse.ArgumentParser(description="Analyze markdown files.")
+    parser.add_argument('paths', nargs='*',
+                        help="markdown files, directories or glob patterns to analyze "
+                             "without prompting")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes for batch mode (default: CPU count)")
+    parser.add_argument('--manifest', metavar='FILE', default=None,
+                        help="reuse results for unchanged files via this manifest "
+                             "(overrides manifest_file in config.json)")
+    parser.add_argument('--format', choices=('text',) + OUTPUT_FORMATS, default='text',
+                        help="batch output: a text report, or one JSON record per file "
+                             "streamed as a JSON array or as NDJSON")
+    parser.add_argument('--output', metavar='FILE', default='-',
+                        help="where to write JSON/NDJSON records (default: stdout)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and re-analyze files as they change, "
+                             "refreshing batch_report.html in place")
+    args = parser.parse_args(argv)
+    if args.format != 'text' and not args.paths:
+        parser.error(f"--format {args.format} needs files or directories to analyze")
+    if args.watch and (args.format != 'text' or not args.paths):
+        parser.error("--watch needs files or directories to analyze and the text format")
+    return args
+
+
+def main(argv=None):
     """Main function with enhanced features."""
+    args = parse_args(argv)
+
+    if args.format != 'text':
+        # Records go to the output; progress messages go to stderr
+        stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        writer = RecordWriter(stream, args.format)
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                config = load_config()
+                if args.manifest:
+                    config['manifest_file'] = args.manifest
+                analyze_batch(args.paths, config, args.workers, writer)
+        finally:
+            writer.close()
+            if stream is not sys.stdout:
+                stream.close()
+        return
+
     print("=" * 60)
     print("MARKDOWN FILE ANALYZER - Enhanced Edition")
     print("=" * 60)
     
     # Load configuration
     config = load_config()
+    extractors = config.get('extractors', [])
     
+    if args.manifest:
+        config['manifest_file'] = args.manifest
+
+    if args.watch:
+        watch_batch(args.paths, config, args.workers)
+        return
+
+    if args.paths:
+        analyze_batch(args.paths, config, args.workers)
+        return
+
+    # One circuit breaker for every link and image checked below
+    policy = ValidationPolicy.from_config(config)
+
     # Ask for input type
     print("\nChoose input method:")
     print("  1. Local file")
@@ -547,69 +635,94 @@ def main():
     
     if choice == '2':
         repo_url = input("Enter GitHub repository URL: ").strip()
-        files = analyze_github_repo(repo_url, config)
+        client = GitHubClient.from_config(config)
+        files = analyze_github_repo(repo_url, config, client)
         
         if not files:
+            client.close()
             return
         
-        # Process GitHub files
-        for file_info in files:
-            print(f"\n{'=' * 60}")
-            print(f"Analyzing: {file_info['name']}")
-            print('=' * 60)
+        # Process GitHub files as their parallel downloads complete
+        try:
+            for file_info, content in client.download_all(files):
+                print(f"\n{'=' * 60}")
+                print(f"Analyzing: {file_info['name']}")
+                print('=' * 60)
             
-            content = download_github_file(file_info)
-            if not content:
-                continue
+                if not content:
+                    continue
             
-            # Perform analysis
-            word_count = count_words(content)
-            headings = count_headings(content)
-            links = extract_links(content)
-            images = extract_images(content)
+                # Perform analysis
+                analysis = analyze_content(content, extractors)
+                word_count = analysis['word_count']
+                headings = analysis['headings']
+                links = analysis['links']
+                images = analysis['images']
             
-            # Validate links
-            print("Validating links...")
-            broken_links = validate_links(links, config)
+                # Validate links
+                print("Validating links...")
+                broken_links = validate_links(links, config, policy=policy)
+                if config.get('validate_images'):
+                    print("Validating images...")
+                    # Relative image paths resolve against the file's raw URL,
+                    # root-relative ones against the repository root
+                    root = file_info['url'].rsplit('/', file_info['name'].count('/') + 1)[0]
+                    validate_images(images, config, file_info['url'], root + '/', policy)
             
-            # Generate reports
-            print()
-            generate_report(word_count, headings, links, images, broken_links)
+                # Generate reports
+                print()
+                generate_report(word_count, headings, links, images, broken_links)
+                print_extractor_results(analysis, extractors)
             
-            if config.get('generate_html'):
-                generate_html_report(file_info['name'], word_count, headings, 
-                                   links, images, broken_links)
+                if config.get('generate_html'):
+                    # Files from subdirectories get flat report names
+                    generate_html_report(file_info['name'].replace('/', '_'), word_count, headings, 
+                                       links, images, broken_links)
+        except RateLimitError as e:
+            print(f"\n❌ {e}")
+        finally:
+            client.close()
     
     else:
         # Local file analysis
         filename = input("Enter markdown file path: ").strip()
         
+        print(f"\nAnalyzing '{filename}'...\n")
+
+        # Perform analysis, streaming the file in chunks
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read()
+            analysis = analyze_file(filename, extractors=parse_extractors_for(config))
         except FileNotFoundError:
             print(f"Error: File '{filename}' not found.")
             return
 
-        if not content.strip():
+        if analysis is None:
             print("⚠️ The markdown file is empty. Nothing to analyze.")
             return
 
-        print(f"\nAnalyzing '{filename}'...\n")
-        
-        # Perform analysis
-        word_count = count_words(content)
-        headings = count_headings(content)
-        links = extract_links(content)
-        images = extract_images(content)
+        word_count = analysis['word_count']
+        headings = analysis['headings']
+        links = analysis['links']
+        images = analysis['images']
         
         # Validate links
         print("Validating links...")
-        broken_links = validate_links(links, config)
+        index = None
+        if config.get('resolve_local_links', True):
+            # One file's links touch a few targets: stat those rather than
+            # walking the whole directory, and reuse the anchors just parsed
+            index = LinkIndex.on_demand([os.path.dirname(filename) or '.'],
+                                        [dict(analysis, file=filename)])
+        broken_links = validate_links(links, config, index=index, source=filename,
+                                      policy=policy)
+        if config.get('validate_images'):
+            print("Validating images...")
+            validate_images(images, config, os.path.dirname(filename) or '.', policy=policy)
         
         # Generate reports
         print()
         generate_report(word_count, headings, links, images, broken_links)
+        print_extractor_results(analysis, extractors)
         
         if config.get('generate_html'):
             generate_html_report(filename, word_count, headings, links, images, broken_links)
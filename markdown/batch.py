@@ -0,0 +1,147 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from tokenizer import analyze_file
+
+
+MARKDOWN_EXTENSIONS = ('.md', '.markdown')
+
+
+def find_markdown_files(paths, exclude_extensions=()):
+    """Expand files, directories and glob patterns into markdown file paths.
+
+    Directories are searched recursively. Files whose extension is listed
+    in exclude_extensions are skipped. Each file is returned once, in the
+    order it was first found.
+    """
+    excluded = tuple(ext.lower() for ext in exclude_extensions)
+    found = {}
+
+    def add(path):
+        lower = path.lower()
+        if lower.endswith(MARKDOWN_EXTENSIONS) and not (excluded and lower.endswith(excluded)):
+            found.setdefault(os.path.normpath(path), None)
+
+    for pattern in paths:
+        if os.path.isdir(pattern):
+            candidates = [pattern]
+        else:
+            candidates = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for candidate in candidates:
+            if os.path.isdir(candidate):
+                for root, dirs, files in os.walk(candidate):
+                    dirs.sort()
+                    for name in sorted(files):
+                        add(os.path.join(root, name))
+            elif os.path.isfile(candidate):
+                add(candidate)
+
+    return list(found)
+
+
+def analyze_path(path, extractors=()):
+    """Analyze one file; runs in a worker process.
+
+    Returns a result dict with the file's analysis, or an 'error' entry if
+    it could not be read.
+    """
+    try:
+        analysis = analyze_file(path, extractors=extractors)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'file': path, 'error': f"{type(e).__name__}: {e}"}
+    if analysis is None:
+        return {'file': path, 'error': 'empty file'}
+    analysis['file'] = path
+    return analysis
+
+
+def iter_analyze_files(files, workers=None, extractors=()):
+    """Parse files on a process pool, yielding their results in order.
+
+    Each result is yielded as soon as it and all earlier ones are done.
+    workers defaults to the number of CPUs; with one worker, or a single
+    file, everything runs in this process. extractors names extra
+    extractors to run on every file.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            yield analyze_path(path, extractors)
+        return
+
+    # Hand out files in batches so the per-task overhead stays small
+    chunksize = max(1, len(files) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(partial(analyze_path, extractors=tuple(extractors)), files,
+                            chunksize=chunksize)
+
+
+def analyze_files(files, workers=None, extractors=()):
+    """Parse files on a process pool and return their results in order."""
+    return list(iter_analyze_files(files, workers, extractors))
+
+
+def iter_incremental(files, manifest, workers=None, extractors=()):
+    """Yield (result, stale) for each file in order, reusing manifest results.
+
+    stale is True when the result's links still need validating: for every
+    re-parsed file, and for unchanged files whose stored link statuses
+    have expired.
+    """
+    reused = {}
+    changed = []
+    for index, path in enumerate(files):
+        found = manifest.lookup(path) if manifest is not None else None
+        # Results stored before an extractor was enabled lack its entry
+        if found is None or any(name not in found[0] for name in extractors):
+            changed.append(path)
+        else:
+            reused[index] = found
+
+    parsed = iter_analyze_files(changed, workers, extractors)
+    for index in range(len(files)):
+        if index in reused:
+            result, fresh = reused.pop(index)
+            yield result, not fresh
+        else:
+            yield next(parsed), True
+
+
+def analyze_incremental(files, manifest, workers=None, extractors=()):
+    """Like analyze_files, but reuse manifest results for unchanged files.
+
+    Returns (results, stale) where stale lists the results whose links
+    still need validating (see iter_incremental).
+    """
+    results = []
+    stale = []
+    for result, needs_validation in iter_incremental(files, manifest, workers, extractors):
+        results.append(result)
+        if needs_validation:
+            stale.append(result)
+    return results, stale
+
+
+def summarize(results):
+    """Combine per-file results into batch totals."""
+    totals = {
+        'files': 0,
+        'failed': 0,
+        'word_count': 0,
+        'headings': {'h1': 0, 'h2': 0, 'h3': 0, 'h4': 0, 'h5': 0, 'h6': 0},
+        'links': [],
+        'images': [],
+    }
+    for result in results:
+        if 'error' in result:
+            totals['failed'] += 1
+            continue
+        totals['files'] += 1
+        totals['word_count'] += result['word_count']
+        for level, count in result['headings'].items():
+            totals['headings'][level] += count
+        totals['links'].extend(result['links'])
+        totals['images'].extend(result['images'])
+    return totals
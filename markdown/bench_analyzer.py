@@ -0,0 +1,288 @@
+"""Benchmark the markdown analysis functions on synthetic documents.
+
+Usage: python bench_analyzer.py [--sizes 1KB 1MB 100MB] [--baseline FILE]
+                                [--save-baseline FILE] [--profile cprofile|pyinstrument]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Mini_Project_1 import (count_words, count_headings, extract_links, extract_images,
+                            generate_html_report)
+from tokenizer import analyze_content, analyze_file
+
+SIZES = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+STAGES = ('count_words', 'count_headings', 'extract_links', 'extract_images',
+          'analyze_content', 'analyze_file', 'generate_html_report')
+# The functions analyze_content replaces with a single pass
+SEPARATE_STAGES = STAGES[:4]
+
+# Distinct sections generated per document; larger documents repeat them
+_SECTION_POOL = 256
+_WORDS = ('markdown analyzer report heading link image table code block words '
+          'document section paragraph example config value request cache').split()
+
+
+def parse_size(text):
+    """'1KB' -> 1024, '100MB' -> 104857600; plain numbers are bytes."""
+    text = text.strip().upper()
+    for suffix, factor in SIZES.items():
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def generate_markdown(size, link_density=5, image_density=1, code_density=0.2,
+                      heading_depth=3, seed=0):
+    """Return a synthetic markdown document of about size bytes.
+
+    link_density and image_density are per 100 words of prose,
+    code_density is the fraction of sections that are fenced code blocks,
+    and headings go down to heading_depth levels.
+    """
+    rng = random.Random(seed)
+    sections = []
+    for i in range(_SECTION_POOL):
+        level = rng.randint(1, max(1, min(6, heading_depth)))
+        lines = [f"{'#' * level} {rng.choice(_WORDS).title()} {i}", '']
+        if rng.random() < code_density:
+            lines += ['```python'] + [f"value_{j} = '{rng.choice(_WORDS)}'" for j in range(8)] + ['```']
+        else:
+            words = []
+            for j in range(rng.randint(40, 120)):
+                roll = rng.random() * 100
+                if roll < link_density:
+                    words.append(f"[{rng.choice(_WORDS)}](https://example.com/{i}/{j})")
+                elif roll < link_density + image_density:
+                    words.append(f"![{rng.choice(_WORDS)}](images/{i}-{j}.png)")
+                else:
+                    words.append(rng.choice(_WORDS))
+            lines.append(' '.join(words))
+        sections.append('\n'.join(lines) + '\n\n')
+
+    parts = []
+    length = 0
+    i = 0
+    while length < size:
+        section = sections[i % _SECTION_POOL]
+        parts.append(section)
+        length += len(section)
+        i += 1
+    return ''.join(parts)[:size]
+
+
+def stage_calls(content, report_dir):
+    """Map each stage name to a zero-argument call on content.
+
+    analyze_file reads a copy of content written to report_dir, so its
+    numbers include streaming the file from disk in chunks.
+    """
+    inputs = {}
+    path = os.path.join(report_dir, 'bench.md')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    def report():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return generate_html_report(path, *inputs['report'])
+
+    calls = {
+        'count_words': lambda: count_words(content),
+        'count_headings': lambda: count_headings(content),
+        'extract_links': lambda: extract_links(content),
+        'extract_images': lambda: extract_images(content),
+        'analyze_content': lambda: analyze_content(content),
+        'analyze_file': lambda: analyze_file(path),
+        'generate_html_report': report,
+    }
+    links = extract_links(content)
+    for link in links:
+        link['status'] = 'OK (200)'
+    inputs['report'] = (count_words(content), count_headings(content), links,
+                        extract_images(content), [])
+    return calls
+
+
+def measure(call, repeat):
+    """Return (best seconds over repeat runs, peak bytes allocated by one run)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        call()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def profile(call, kind, path):
+    """Run call once under cProfile or pyinstrument and write the profile to path."""
+    if kind == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.runcall(call)
+        profiler.dump_stats(path + '.prof')
+        return path + '.prof'
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        raise SystemExit("pyinstrument is not installed (pip install pyinstrument)")
+    profiler = Profiler()
+    profiler.start()
+    try:
+        call()
+    finally:
+        profiler.stop()
+    with open(path + '.html', 'w', encoding='utf-8') as f:
+        f.write(profiler.output_html())
+    return path + '.html'
+
+
+def run(sizes, repeat=3, profiler=None, profile_dir='profiles', **shape):
+    """Benchmark every stage on a document of each size.
+
+    Returns {size label: {stage: {'seconds': ..., 'peak_bytes': ...}}}.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as report_dir:
+        for label in sizes:
+            content = generate_markdown(parse_size(label), **shape)
+            calls = stage_calls(content, report_dir)
+            results[label] = {}
+            for stage in STAGES:
+                seconds, peak = measure(calls[stage], repeat)
+                results[label][stage] = {'seconds': seconds, 'peak_bytes': peak}
+                if profiler:
+                    os.makedirs(profile_dir, exist_ok=True)
+                    profile(calls[stage], profiler, os.path.join(profile_dir, f"{label}-{stage}"))
+            del content, calls
+    return results
+
+
+def speedup(stages):
+    """How many times faster analyze_content is than SEPARATE_STAGES together, or None."""
+    if 'analyze_content' not in stages or not stages['analyze_content']['seconds']:
+        return None
+    separate = sum(stages[stage]['seconds'] for stage in SEPARATE_STAGES)
+    return separate / stages['analyze_content']['seconds']
+
+
+def compare(results, baseline, tolerance=1.25, min_seconds=0.001):
+    """Return the measurements that regressed against baseline.
+
+    A stage regresses when its time or peak memory grew by more than the
+    tolerance factor, and analyze_content does when its speedup over the
+    separate functions shrank by more than that factor. Time differences
+    under min_seconds, and speedups of runs shorter than that, are ignored
+    as noise. Each regression is (size, stage, metric, baseline, current).
+    """
+    regressions = []
+    for label, stages in results.items():
+        for stage, current in stages.items():
+            old = baseline.get(label, {}).get(stage)
+            if old is None:
+                continue
+            if current['seconds'] > old['seconds'] * tolerance and \
+                    current['seconds'] - old['seconds'] >= min_seconds:
+                regressions.append((label, stage, 'seconds', old['seconds'], current['seconds']))
+            if current['peak_bytes'] > old['peak_bytes'] * tolerance:
+                regressions.append((label, stage, 'peak_bytes', old['peak_bytes'],
+                                    current['peak_bytes']))
+        old, new = speedup(baseline.get(label, {})), speedup(stages)
+        if old and new and stages['analyze_content']['seconds'] >= min_seconds and \
+                new * tolerance < old:
+            regressions.append((label, 'analyze_content', 'speedup', old, new))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'size':>6} {'stage':<22} {'ms':>10} {'peak KiB':>10} {'vs base':>8}")
+    for label, stages in results.items():
+        for stage, current in stages.items():
+            old = (baseline or {}).get(label, {}).get(stage)
+            ratio = f"{current['seconds'] / old['seconds']:>7.2f}x" \
+                if old and old['seconds'] else f"{'-':>8}"
+            print(f"{label:>6} {stage:<22} {current['seconds'] * 1000:>10.2f} "
+                  f"{current['peak_bytes'] / 1024:>10,.0f} {ratio}")
+        if speedup(stages):
+            print(f"{label:>6} {'single-pass speedup':<22} {speedup(stages):>9.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['1KB', '1MB'],
+                        help="document sizes, e.g. 1KB 1MB 100MB (default: 1KB 1MB)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument('--link-density', type=float, default=5, help="links per 100 words")
+    parser.add_argument('--image-density', type=float, default=1, help="images per 100 words")
+    parser.add_argument('--code-density', type=float, default=0.2,
+                        help="fraction of sections that are code blocks")
+    parser.add_argument('--heading-depth', type=int, default=3, help="deepest heading level")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help="compare against results saved in this JSON file")
+    parser.add_argument('--save-baseline', help="write these results to this JSON file")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="slowdown/growth factor that counts as a regression")
+    parser.add_argument('--min-speedup', type=float,
+                        help="fail unless analyze_content is at least this many times faster "
+                             "than the separate functions together")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help="also dump a profile of every stage")
+    parser.add_argument('--profile-dir', default='profiles')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, max(1, args.repeat), args.profile, args.profile_dir,
+                  link_density=args.link_density, image_density=args.image_density,
+                  code_density=args.code_density, heading_depth=args.heading_depth,
+                  seed=args.seed)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.profile:
+        print(f"\nProfiles written to {args.profile_dir}/")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(results, indent=4) + "\n")
+        print(f"\n✓ Baseline saved to {args.save_baseline}")
+
+    if args.min_speedup:
+        slow = {label: speedup(stages) for label, stages in results.items()
+                if speedup(stages) < args.min_speedup}
+        if slow:
+            print(f"\n⚠️ analyze_content is less than {args.min_speedup:g}x faster than the "
+                  f"separate functions:")
+            for label, value in slow.items():
+                print(f"   {label}: {value:.2f}x")
+            return 1
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} regression(s) against {args.baseline}:")
+            for label, stage, metric, old, new in regressions:
+                print(f"   {label} {stage} {metric}: {old:,.4g} -> {new:,.4g}")
+            return 1
+        print(f"\n✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Benchmark validate_links against a local HTTP server with injected latency.
+
+Usage: python bench_validate_links.py [--links N] [--latency SECONDS]
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from link_checker import validate_links
+
+
+def start_stub_server(latency):
+    """Start a threaded HTTP server that sleeps `latency` seconds per request."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--links', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    print(f"{args.links} links, {args.latency * 1000:.0f} ms injected latency")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    try:
+        for workers in args.workers:
+            links = [{'text': str(i), 'url': f'{base}/{i}', 'type': 'standard'}
+                     for i in range(args.links)]
+            # Everything is on one host, so lift the per-host cap to the pool size
+            config = {'timeout': 5, 'max_workers': workers, 'max_per_host': workers}
+
+            start = time.perf_counter()
+            broken = validate_links(links, config)
+            elapsed = time.perf_counter() - start
+
+            if broken:
+                print(f"⚠️ {len(broken)} links unexpectedly broken")
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.1f}x")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
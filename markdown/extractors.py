@@ -0,0 +1,377 @@
+"""Pluggable extractors that run inside MarkdownTokenizer's single pass.
+
+An extractor sees the same buffered text as the built-in scanners, so
+adding one does not add another pass over the document. Register a
+subclass of Extractor (or of PatternExtractor, which only needs a
+precompiled pattern and a handle() method) with @register_extractor and
+enable it by name:
+
+    analyze_content(text, extractors=['footnotes', 'tables'])
+
+Results appear in the analysis dict under the extractor's name.
+"""
+
+import re
+from abc import ABC, abstractmethod
+
+EXTRACTORS = {}
+
+# How far past the start of a construct that is still open (an unclosed
+# '[', a table that keeps growing) streaming scanners wait for it to end;
+# after that it is handled as it stands, so the buffer stays bounded
+MAX_LOOKAHEAD = 1 << 16
+
+
+def register_extractor(cls):
+    """Class decorator that makes an extractor available by its name."""
+    EXTRACTORS[cls.name] = cls
+    return cls
+
+
+def create_extractors(names):
+    """Return fresh extractor instances for a list of registered names."""
+    extractors = []
+    for name in names:
+        if name not in EXTRACTORS:
+            raise ValueError(f"Unknown extractor: {name!r} "
+                             f"(available: {', '.join(sorted(EXTRACTORS))})")
+        extractors.append(EXTRACTORS[name]())
+    return extractors
+
+
+class Extractor(ABC):
+    """Base class; one instance handles one document.
+
+    scan(buf, pos, final) is called every time text is fed. buf holds the
+    unprocessed tail of the document (at the start it is the document with
+    a '\\n' prepended) and pos is the value scan returned last time, shifted
+    to buf's current start. Return the position to resume from; text
+    before the smallest resume position of all scanners is discarded.
+    When final is True no more text will arrive.
+    """
+
+    name = None
+
+    @abstractmethod
+    def scan(self, buf, pos, final):
+        """Process buf from pos on; return the position to resume from."""
+
+    @abstractmethod
+    def result(self):
+        """The extractor's result for the whole document."""
+
+    @staticmethod
+    def summary(result):
+        """One-line description of a result for the text report."""
+        return str(result)
+
+
+class PatternExtractor(Extractor):
+    """Extractor driven by one precompiled pattern over complete lines.
+
+    handle(match) is called once per match, in document order. A match that
+    reaches the last complete line is held back until more text arrives,
+    so a pattern spanning several lines (e.g. a table) is never cut short
+    at a chunk boundary, unless it started more than MAX_LOOKAHEAD
+    characters back. A pattern that needs to see lookahead_lines more
+    lines before it can match at all gets those last lines scanned again
+    once the next ones arrive.
+
+    starts lists where matches can begin: '\\n' for the start of a line,
+    any other character for matches beginning with it. The tokenizer runs
+    all pattern extractors that set it in one PatternScanner pass; with
+    starts = None the pattern gets a pass of its own. Patterns scanned
+    together must not use backreferences or named groups.
+    """
+
+    pattern = None
+    starts = None
+    lookahead_lines = 0
+
+    def scan(self, buf, pos, final):
+        # Used on its own rather than through the tokenizer's scanners
+        if not hasattr(self, '_scanner'):
+            self._scanner = PatternScanner([self])
+        return self._scanner.scan(buf, pos, final)
+
+    @abstractmethod
+    def handle(self, match):
+        """Called with each match of pattern, in document order."""
+
+
+def scanners_for(extractors):
+    """The scanners that run a document's extractors.
+
+    Pattern extractors with starts set share one PatternScanner; every
+    other extractor scans on its own.
+    """
+    shared = [e for e in extractors if isinstance(e, PatternExtractor) and e.starts]
+    scanners = [PatternScanner(shared)] if shared else []
+    for extractor in extractors:
+        if isinstance(extractor, PatternExtractor) and not extractor.starts:
+            scanners.append(PatternScanner([extractor]))
+        elif not isinstance(extractor, PatternExtractor):
+            scanners.append(extractor)
+    return scanners
+
+
+class PatternScanner:
+    """Finds the matches of several PatternExtractors in one pass.
+
+    Their patterns are compiled into one alternation with a named group
+    per extractor. Each branch begins with a character from the
+    extractor's starts and checks the pattern in a lookahead, so the
+    search jumps straight between those characters and overlapping
+    matches of different extractors are all found. The group that matched
+    names the extractor; its own pattern is then matched at that position
+    to give handle() the match it expects.
+
+    Resume positions point at the newline before the first line to scan
+    again, so line-start branches can anchor on it.
+    """
+
+    def __init__(self, extractors):
+        self.extractors = list(extractors)
+        self.lookahead_lines = max(e.lookahead_lines for e in self.extractors)
+        self._handled_offsets = [0] * len(self.extractors)
+        self._combined = None
+        if self.extractors[0].starts:
+            self._combined, self._groups = _combine(self.extractors)
+
+    def scan(self, buf, pos, final):
+        limit = len(buf) if final else buf.rfind('\n') + 1
+        if limit <= pos + 1:
+            return pos
+        # Each extractor skips matches starting before the end of the last
+        # one it handled, as a finditer over its pattern alone would
+        handled = [pos + offset for offset in self._handled_offsets]
+        for i, match in self._matches(buf, pos, limit, handled):
+            if not final and match.end() >= limit - 1 and match.start() >= limit - MAX_LOOKAHEAD:
+                resume = self._line_break(buf, pos, match.start())
+                self._handled_offsets = [max(0, end - resume) for end in handled]
+                return resume
+            self.extractors[i].handle(match)
+            handled[i] = match.end()
+
+        resume = limit if final else limit - 1
+        if not final:
+            for _ in range(self.lookahead_lines):
+                resume = self._line_break(buf, pos, resume)
+        self._handled_offsets = [max(0, end - resume) for end in handled]
+        return resume
+
+    def _matches(self, buf, pos, limit, handled):
+        """Yield (extractor index, match) in document order."""
+        if self._combined is None:
+            for match in self.extractors[0].pattern.finditer(buf, pos + 1, limit):
+                if match.start() >= handled[0]:
+                    yield 0, match
+            return
+        for hit in self._combined.finditer(buf, pos, limit):
+            offset, candidates = self._groups[hit.lastgroup]
+            start = hit.start() + offset
+            # Later extractors with the same start character may match here too
+            for i in candidates:
+                if start >= handled[i]:
+                    match = self.extractors[i].pattern.match(buf, start, limit)
+                    if match is not None:
+                        yield i, match
+
+    @staticmethod
+    def _line_break(buf, pos, index):
+        """The newline before index, or pos if there is none after pos."""
+        return max(buf.rfind('\n', pos, index), pos)
+
+
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+def _combine(extractors):
+    """Compile the extractors' patterns into one, branching on start characters.
+
+    Returns the pattern and, per group name, the offset from the hit to
+    the match start and the extractors to try there.
+    """
+    by_start = {}
+    for i, extractor in enumerate(extractors):
+        for char in extractor.starts:
+            by_start.setdefault(char, []).append(i)
+
+    branches, groups = [], {}
+    for n, (char, indexes) in enumerate(by_start.items()):
+        lookaheads = []
+        for k, i in enumerate(indexes):
+            name = f'_{n}_{i}'
+            groups[name] = (1 if char == '\n' else 0, indexes[k:])
+            pattern = extractors[i].pattern
+            flags = ''.join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+            lookaheads.append(f'(?=(?P<{name}>(?{flags}:{pattern.pattern})))' if flags
+                              else f'(?=(?P<{name}>{pattern.pattern}))')
+        if char == '\n':
+            # Consume the newline; the match starts on the line after it
+            branches.append(f"\\n(?:{'|'.join(lookaheads)})")
+        else:
+            # Consume the character, then look back to check the pattern
+            # from it: every branch starts with a literal, which lets re
+            # skip straight to the next candidate
+            branches.append(f"{re.escape(char)}(?<=(?:{'|'.join(lookaheads)}).)")
+    return re.compile('|'.join(branches)), groups
+
+
+@register_extractor
+class FootnoteExtractor(PatternExtractor):
+    """Footnote definitions ([^id]: text) and references ([^id])."""
+
+    name = 'footnotes'
+    starts = '['
+    pattern = re.compile(r'^\[\^([^\]\s]+)\]:[ \t]*(.*)$|\[\^([^\]\s]+)\]', re.MULTILINE)
+
+    def __init__(self):
+        self.definitions = {}
+        self.references = []
+
+    def handle(self, match):
+        if match.group(1) is not None:
+            self.definitions[match.group(1)] = match.group(2)
+        else:
+            self.references.append(match.group(3))
+
+    def result(self):
+        return {
+            'definitions': self.definitions,
+            'references': self.references,
+            'undefined': sorted(set(self.references) - set(self.definitions)),
+        }
+
+    @staticmethod
+    def summary(result):
+        text = (f"{len(result['definitions'])} footnote(s), "
+                f"{len(result['references'])} reference(s)")
+        if result['undefined']:
+            text += f", undefined: {', '.join(result['undefined'])}"
+        return text
+
+
+@register_extractor
+class TableExtractor(PatternExtractor):
+    """GitHub-style pipe tables: a header row, a delimiter row and body rows."""
+
+    name = 'tables'
+    starts = '\n'
+    # A header row only matches once the delimiter row below it is here
+    lookahead_lines = 1
+    _CELL = r'[ \t]*:?-+:?[ \t]*'
+    pattern = re.compile(
+        r'^([^\n]*\|[^\n]*)\n'
+        rf'[ \t]*\|?{_CELL}(?:\|{_CELL})*\|?[ \t]*$'
+        r'((?:\n[^\n]*\|[^\n]*)*)',
+        re.MULTILINE
+    )
+
+    def __init__(self):
+        self.tables = []
+
+    def handle(self, match):
+        header = match.group(1).strip()
+        if header.startswith('|'):
+            header = header[1:]
+        if header.endswith('|'):
+            header = header[:-1]
+        self.tables.append({
+            'columns': header.count('|') + 1,
+            'rows': match.group(2).count('\n'),
+        })
+
+    def result(self):
+        return self.tables
+
+    @staticmethod
+    def summary(result):
+        return f"{len(result)} table(s), {sum(t['rows'] for t in result)} row(s)"
+
+
+def slugify(text):
+    """Return the GitHub-style anchor slug for a heading's text."""
+    text = _SLUG_STRIP.sub('', text.strip().lower())
+    return text.replace(' ', '-')
+
+
+_SLUG_STRIP = re.compile(r'[^\w\- ]')
+
+
+@register_extractor
+class AnchorExtractor(PatternExtractor):
+    """Anchor slugs of every heading, numbered like GitHub's (intro, intro-1)."""
+
+    name = 'anchors'
+    starts = '\n'
+    pattern = re.compile(r'^ {0,3}#{1,6}[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$', re.MULTILINE)
+
+    def __init__(self):
+        self.slugs = []
+        self._seen = {}
+
+    def handle(self, match):
+        slug = slugify(match.group(1))
+        count = self._seen.get(slug, 0)
+        self._seen[slug] = count + 1
+        self.slugs.append(f"{slug}-{count}" if count else slug)
+
+    def result(self):
+        return self.slugs
+
+    @staticmethod
+    def summary(result):
+        return f"{len(result)} anchor(s)"
+
+
+@register_extractor
+class FrontMatterExtractor(Extractor):
+    """YAML-style front matter delimited by '---' lines at the very start.
+
+    Only flat 'key: value' lines are read; nested values are kept as the
+    raw text after the colon. A block that is not closed within
+    MAX_LENGTH characters is not treated as front matter.
+    """
+
+    name = 'front_matter'
+    MAX_LENGTH = 1 << 16
+    _BLOCK = re.compile(r'\A\n---[ \t]*\n(.*?)^(?:---|\.\.\.)[ \t]*$', re.MULTILINE | re.DOTALL)
+    _FIELD = re.compile(r'^([A-Za-z0-9_-]+)[ \t]*:[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+
+    def __init__(self):
+        self.done = False
+        self.fields = None
+
+    def scan(self, buf, pos, final):
+        if self.done:
+            return len(buf)
+        first_line_end = buf.find('\n', 1)
+        if first_line_end < 0 and not final:
+            return pos
+        if buf[1:first_line_end if first_line_end >= 0 else None].rstrip(' \t') != '---':
+            self.done = True
+            return len(buf)
+
+        match = self._BLOCK.match(buf)
+        if match is not None and match.end() == len(buf) and not final:
+            # The closing line may not be complete yet
+            match = None
+        if match is None:
+            if final or len(buf) > self.MAX_LENGTH:
+                self.done = True
+                return len(buf)
+            return pos
+        self.fields = {key: value.strip('\'"')
+                       for key, value in self._FIELD.findall(match.group(1))}
+        self.done = True
+        return len(buf)
+
+    def result(self):
+        return self.fields
+
+    @staticmethod
+    def summary(result):
+        if result is None:
+            return "no front matter"
+        return f"front matter: {', '.join(result) or '(empty)'}"
@@ -0,0 +1,223 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from batch import MARKDOWN_EXTENSIONS
+from response_cache import ResponseCache
+
+
+class RateLimitError(Exception):
+    """GitHub's rate limit is exhausted for longer than we are willing to wait.
+
+    reset is the time (seconds since the epoch) when the budget refills.
+    """
+
+    def __init__(self, reset):
+        self.reset = reset
+        super().__init__("GitHub rate limit exceeded; resets at "
+                         f"{time.strftime('%H:%M:%S', time.localtime(reset))}")
+
+
+class GitHubClient:
+    """Lists and downloads repository files over one pooled keep-alive session.
+
+    The whole tree is listed with a single git-trees API call, and blobs are
+    downloaded in parallel from the raw host. Rate-limit headers on every
+    response are tracked: when the budget runs out the client sleeps until
+    it resets (up to max_rate_limit_wait seconds) instead of failing.
+
+    With a ResponseCache, requests for URLs fetched before carry
+    If-None-Match/If-Modified-Since, and a 304 answer is turned into a 200
+    response with the stored body (marked with from_cache = True).
+    """
+
+    # Requests per URL, counting retries after a rate-limit response
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, token=None, api_url='https://api.github.com',
+                 raw_url='https://raw.githubusercontent.com', timeout=10,
+                 max_workers=8, max_rate_limit_wait=60, cache=None,
+                 sleep=time.sleep, clock=time.time):
+        self.api_url = api_url.rstrip('/')
+        self.raw_url = raw_url.rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.cache = cache
+        self.sleep = sleep
+        self.clock = clock
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if token:
+            self.session.headers['Authorization'] = f"token {token}"
+
+        self._lock = threading.Lock()
+        self.rate_limit_remaining = None
+        self.rate_limit_reset = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(token=config.get('github_token'),
+                   api_url=config.get('github_api_url', 'https://api.github.com'),
+                   raw_url=config.get('github_raw_url', 'https://raw.githubusercontent.com'),
+                   max_workers=config.get('github_workers', 8),
+                   max_rate_limit_wait=config.get('github_max_rate_limit_wait', 60),
+                   cache=ResponseCache.from_config(config))
+
+    def get(self, url, **kwargs):
+        """GET url on the shared session, waiting out the rate limit if needed."""
+        kwargs.setdefault('timeout', self.timeout)
+        cached = None
+        if self.cache is not None:
+            url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+            cached = self.cache.get(url)
+            if cached is not None:
+                etag, last_modified, _, _ = cached
+                headers = dict(kwargs.get('headers') or {})
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+                kwargs['headers'] = headers
+
+        response = self._get(url, **kwargs)
+        response.from_cache = False
+        if cached is not None and response.status_code == 304:
+            _, _, body, encoding = cached
+            response.status_code = 200
+            response._content = body
+            response.encoding = encoding
+            response.from_cache = True
+        elif self.cache is not None and response.status_code == 200:
+            self.cache.put(url, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'),
+                           response.content, response.encoding)
+        return response
+
+    def _get(self, url, **kwargs):
+        for attempt in range(self.MAX_ATTEMPTS):
+            self._wait_for_budget()
+            response = self.session.get(url, **kwargs)
+            self._record_rate_limit(response)
+            wait = self._retry_after(response)
+            if wait is None or attempt == self.MAX_ATTEMPTS - 1:
+                return response
+            self._sleep_up_to_limit(wait)
+
+    def list_markdown_files(self, owner, repo, ref='HEAD', recursive=True):
+        """Return [{'name', 'url', 'sha', 'size'}] for markdown blobs in the repo.
+
+        With recursive=False only files in the repository root are listed.
+        """
+        url = f"{self.api_url}/repos/{owner}/{repo}/git/trees/{quote(ref, safe='')}"
+        params = {'recursive': '1'} if recursive else None
+        response = self.get(url, params=params,
+                            headers={'Accept': 'application/vnd.github+json'})
+        response.raise_for_status()
+        tree = response.json()
+        if tree.get('truncated'):
+            print("⚠️ Repository tree is too large; GitHub returned a truncated listing.")
+
+        files = []
+        for item in tree['tree']:
+            if item['type'] == 'blob' and item['path'].lower().endswith(MARKDOWN_EXTENSIONS):
+                files.append({
+                    'name': item['path'],
+                    'url': f"{self.raw_url}/{owner}/{repo}/{quote(ref)}/{quote(item['path'])}",
+                    'sha': item.get('sha'),
+                    'size': item.get('size'),
+                })
+        return files
+
+    def download(self, file_info):
+        """Return the text of one file, or None if it could not be downloaded."""
+        try:
+            response = self.get(file_info['url'])
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error downloading {file_info['name']}: {e}")
+            return None
+        if response.status_code != 200:
+            print(f"❌ Failed to download {file_info['name']}: {response.status_code}")
+            return None
+        return response.text
+
+    def download_all(self, files):
+        """Download files in parallel, yielding (file_info, text) in order."""
+        if self.max_workers == 1 or len(files) <= 1:
+            for file_info in files:
+                yield file_info, self.download(file_info)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            yield from zip(files, pool.map(self.download, files))
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _record_rate_limit(self, response):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining, reset = int(remaining), float(reset)
+        except ValueError:
+            return
+        with self._lock:
+            self.rate_limit_remaining = remaining
+            self.rate_limit_reset = reset
+
+    def _retry_after(self, response):
+        """Seconds to wait before retrying a rate-limited response, else None."""
+        if response.status_code not in (403, 429):
+            return None
+        wait = _seconds_until(response.headers.get('Retry-After'), self.clock())
+        if wait is not None:
+            return wait
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                return max(0.0, float(response.headers.get('X-RateLimit-Reset')) - self.clock())
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    def _wait_for_budget(self):
+        with self._lock:
+            exhausted = self.rate_limit_remaining == 0
+            reset = self.rate_limit_reset
+        if exhausted and reset > self.clock():
+            self._sleep_up_to_limit(reset - self.clock())
+
+    def _sleep_up_to_limit(self, wait):
+        if wait > self.max_rate_limit_wait:
+            raise RateLimitError(self.clock() + wait)
+        self.sleep(wait)
+        # The budget has been refilled; the next response reports the new value
+        with self._lock:
+            self.rate_limit_remaining = None
+
+
+def _seconds_until(retry_after, now):
+    """Seconds a Retry-After header asks to wait, or None if absent or unreadable.
+
+    The value is either a number of seconds or an HTTP date.
+    """
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
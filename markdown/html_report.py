@@ -0,0 +1,340 @@
+"""Streaming HTML report writer.
+
+The page shell (stylesheet and markup around the data) is compiled into
+templates once at import. Table rows are written to the file one at a time
+instead of being joined into one large string, so memory use does not grow
+with the size of the report. Charts are drawn as inline SVG, so the report
+needs no JavaScript library or network access to display.
+"""
+
+import math
+import os
+from datetime import datetime
+from html import escape
+from string import Template
+
+from image_checker import describe_image
+
+_STYLE = """
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 20px;
+            min-height: 100vh;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 10px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+            overflow: hidden;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }
+        .header h1 { font-size: 2.5em; margin-bottom: 10px; }
+        .header p { opacity: 0.9; }
+        .stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            padding: 30px;
+            background: #f8f9fa;
+        }
+        .stat-card {
+            background: white;
+            padding: 25px;
+            border-radius: 8px;
+            text-align: center;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            transition: transform 0.3s;
+        }
+        .stat-card:hover { transform: translateY(-5px); }
+        .stat-icon { font-size: 3em; margin-bottom: 10px; }
+        .stat-value { font-size: 2.5em; font-weight: bold; color: #667eea; }
+        .stat-label { color: #666; margin-top: 5px; }
+        .content {
+            padding: 30px;
+        }
+        .section {
+            margin-bottom: 40px;
+        }
+        .section h2 {
+            color: #333;
+            border-bottom: 3px solid #667eea;
+            padding-bottom: 10px;
+            margin-bottom: 20px;
+        }
+        .chart-container {
+            position: relative;
+            height: 300px;
+            margin: 20px 0;
+        }
+        .chart-container svg { width: 100%; height: 100%; }
+        .chart-label { font-size: 14px; fill: #666; }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 15px;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        th {
+            background: #667eea;
+            color: white;
+            font-weight: 600;
+        }
+        tr:hover { background: #f5f5f5; }
+        td { word-break: break-all; }
+        .badge {
+            display: inline-block;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-size: 0.85em;
+            font-weight: 600;
+        }
+        .badge-success { background: #d4edda; color: #155724; }
+        .badge-danger { background: #f8d7da; color: #721c24; }
+        .badge-warning { background: #fff3cd; color: #856404; }
+        .footer {
+            background: #f8f9fa;
+            padding: 20px;
+            text-align: center;
+            color: #666;
+            font-size: 0.9em;
+        }
+"""
+
+_HEAD = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Markdown Analysis Report - $name</title>$refresh
+    <style>""" + _STYLE.replace('$', '$$') + """    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📊 Markdown Analysis Report</h1>
+            <p>$name</p>
+            <p style="font-size: 0.9em; opacity: 0.8;">Generated on $timestamp</p>
+        </div>
+
+        <div class="stats">
+            <div class="stat-card">
+                <div class="stat-icon">📝</div>
+                <div class="stat-value">$word_count</div>
+                <div class="stat-label">Words</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-icon">📑</div>
+                <div class="stat-value">$total_headings</div>
+                <div class="stat-label">Headings</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-icon">🔗</div>
+                <div class="stat-value">$total_links</div>
+                <div class="stat-label">Links</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-icon">🖼️</div>
+                <div class="stat-value">$total_images</div>
+                <div class="stat-label">Images</div>
+            </div>
+        </div>
+
+        <div class="content">
+            <div class="section">
+                <h2>📑 Heading Distribution</h2>
+                <div class="chart-container">
+                    $heading_chart
+                </div>
+            </div>
+
+            <div class="section">
+                <h2>🔗 Link Analysis</h2>
+                <div class="chart-container" style="height: 200px;">
+                    $link_chart
+                </div>
+""")
+
+_REFRESH = '\n    <meta http-equiv="refresh" content="{seconds}">'
+
+_BROKEN_START = Template("""
+                <h3 style="margin-top: 30px; color: #dc3545;">⚠️ Broken Links ($total_broken)</h3>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>URL</th>
+                            <th>Status</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""")
+_BROKEN_ROW = ("                        <tr><td>{url}</td>"
+               "<td><span class='badge badge-danger'>{status}</span></td></tr>\n")
+_ALL_VALID = '                <p style="color: #28a745; font-weight: 600;">✓ All links are valid!</p>\n'
+
+_IMAGES_START = """
+            <div class="section">
+                <h2>🖼️ Images</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Alt Text</th>
+                            <th>URL</th>
+                            <th>Status</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+_IMAGE_ROW = "                        <tr><td>{alt}</td><td>{url}</td><td>{status}</td></tr>\n"
+_IMAGE_STATUS = "<span class='badge {badge}'>{text}</span>"
+_NO_ALT = '<em>(no alt text)</em>'
+
+_TABLE_END = """                    </tbody>
+                </table>
+"""
+_SECTION_END = "            </div>\n"
+
+_FOOT = """        </div>
+
+        <div class="footer">
+            <p>Generated by Markdown File Analyzer</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+_BAR_COLOR = 'rgba(102, 126, 234, 0.6)'
+_BAR_BORDER = 'rgba(102, 126, 234, 1)'
+_VALID_COLOR = 'rgba(40, 167, 69, 0.6)'
+_BROKEN_COLOR = 'rgba(220, 53, 69, 0.6)'
+
+
+def heading_chart_svg(headings):
+    """Bar chart of the heading levels that occur, as inline SVG."""
+    levels = [(f"H{i}", headings[f'h{i}']) for i in range(1, 7) if headings[f'h{i}'] > 0]
+    if not levels:
+        return ('<svg viewBox="0 0 600 260" role="img" aria-label="No headings">'
+                '<text x="300" y="130" text-anchor="middle" class="chart-label">No headings</text>'
+                '</svg>')
+
+    width, height, base = 600, 260, 230
+    top = max(count for _, count in levels)
+    slot = width / len(levels)
+    parts = [f'<svg viewBox="0 0 {width} {height}" role="img" aria-label="Heading distribution">']
+    for i, (label, count) in enumerate(levels):
+        bar_height = (base - 20) * count / top
+        x = i * slot + slot * 0.2
+        parts.append(
+            f'<rect x="{x:.1f}" y="{base - bar_height:.1f}" width="{slot * 0.6:.1f}" '
+            f'height="{bar_height:.1f}" fill="{_BAR_COLOR}" stroke="{_BAR_BORDER}" '
+            f'stroke-width="2"><title>{label}: {count}</title></rect>'
+            f'<text x="{x + slot * 0.3:.1f}" y="{base - bar_height - 5:.1f}" '
+            f'text-anchor="middle" class="chart-label">{count}</text>'
+            f'<text x="{x + slot * 0.3:.1f}" y="{base + 20}" '
+            f'text-anchor="middle" class="chart-label">{label}</text>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def link_chart_svg(valid, broken):
+    """Doughnut of valid versus broken links, as inline SVG."""
+    radius = 60
+    circumference = 2 * math.pi * radius
+    total = valid + broken
+    parts = ['<svg viewBox="0 0 400 200" role="img" aria-label="Link status">',
+             f'<circle cx="100" cy="100" r="{radius}" fill="none" stroke="#eee" '
+             f'stroke-width="30"/>']
+    offset = 0.0
+    for count, color in ((valid, _VALID_COLOR), (broken, _BROKEN_COLOR)):
+        if not count:
+            continue
+        length = circumference * count / total
+        parts.append(
+            f'<circle cx="100" cy="100" r="{radius}" fill="none" stroke="{color}" '
+            f'stroke-width="30" stroke-dasharray="{length:.2f} {circumference:.2f}" '
+            f'stroke-dashoffset="{-offset:.2f}" transform="rotate(-90 100 100)"/>'
+        )
+        offset += length
+    for y, label, count, color in ((80, 'Valid Links', valid, _VALID_COLOR),
+                                   (120, 'Broken Links', broken, _BROKEN_COLOR)):
+        parts.append(
+            f'<rect x="200" y="{y - 12}" width="16" height="16" fill="{color}"/>'
+            f'<text x="224" y="{y + 1}" class="chart-label">{label}: {count}</text>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def _image_status(image):
+    """Badge for a validated image; empty if images were not validated."""
+    if 'status' not in image:
+        return ''
+    if image['status'].startswith('Broken'):
+        badge = 'badge-danger'
+    elif image.get('oversized'):
+        badge = 'badge-warning'
+    else:
+        badge = 'badge-success'
+    return _IMAGE_STATUS.format(badge=badge, text=escape(describe_image(image)))
+
+
+def write_report(output_file, name, word_count, headings, links, images, broken_links,
+                 refresh=None):
+    """Stream an HTML report to output_file.
+
+    name is shown in the page title and header. All document-derived text
+    (URLs, statuses, alt text, the name) is HTML-escaped. The report is
+    written to a temporary file and moved into place, so a browser never
+    sees a half-written page; with refresh, the page reloads itself every
+    refresh seconds.
+    """
+    total_links = len(links)
+    total_broken = len(broken_links)
+    partial = output_file + '.tmp'
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write(_HEAD.substitute(
+            name=escape(name),
+            refresh=_REFRESH.format(seconds=refresh) if refresh else '',
+            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            word_count=f"{word_count:,}",
+            total_headings=sum(headings.values()),
+            total_links=total_links,
+            total_images=len(images),
+            heading_chart=heading_chart_svg(headings),
+            link_chart=link_chart_svg(total_links - total_broken, total_broken),
+        ))
+
+        if broken_links:
+            f.write(_BROKEN_START.substitute(total_broken=total_broken))
+            f.writelines(_BROKEN_ROW.format(url=escape(link['url']), status=escape(link['status']))
+                         for link in broken_links)
+            f.write(_TABLE_END)
+        else:
+            f.write(_ALL_VALID)
+        f.write(_SECTION_END)
+
+        if images:
+            f.write(_IMAGES_START)
+            f.writelines(_IMAGE_ROW.format(alt=escape(img['alt']) if img['alt'] else _NO_ALT,
+                                           url=escape(img['url']),
+                                           status=_image_status(img))
+                         for img in images)
+            f.write(_TABLE_END)
+            f.write(_SECTION_END)
+
+        f.write(_FOOT)
+    os.replace(partial, output_file)
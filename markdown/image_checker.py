@@ -0,0 +1,214 @@
+import mimetypes
+import os
+import re
+import struct
+from urllib.parse import unquote, urljoin, urlsplit
+
+from link_checker import normalize_url, run_per_host
+from link_policy import ValidationPolicy
+
+
+def resolve_image(url, base, root=None):
+    """Return the file path or absolute URL an image reference points at.
+
+    base is the directory of the markdown file, or the URL it was
+    downloaded from. Root-relative paths ('/img/a.png') resolve against
+    root, the document root (a directory, or a URL ending in '/'), when
+    one is given and against base otherwise.
+    Returns None for data: URIs and other schemes.
+    """
+    if url.startswith('//'):
+        url = 'https:' + url
+    if url.startswith(('http://', 'https://')):
+        return normalize_url(url)
+    if ':' in url.split('/', 1)[0]:
+        return None
+    if url.startswith('/'):
+        base, url = root if root is not None else base, url.lstrip('/')
+    if base.startswith(('http://', 'https://')):
+        return normalize_url(urljoin(base, url))
+    path = unquote(urlsplit(url).path)
+    if not path:
+        return None
+    return os.path.normpath(os.path.join(base, path))
+
+
+def image_dimensions(path):
+    """Return (width, height) read from an image file's header, or None.
+
+    Only the bytes needed to find the size are read: PNG, GIF, BMP and
+    WebP keep it in a fixed-size header, JPEG in the first frame marker,
+    and SVG in the root element's width/height attributes.
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(32)
+            if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                return struct.unpack('>II', head[16:24])
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                return struct.unpack('<HH', head[6:10])
+            if head.startswith(b'BM') and len(head) >= 26:
+                width, height = struct.unpack('<ii', head[18:26])
+                return width, abs(height)
+            if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+                return _webp_dimensions(head)
+            if head.startswith(b'\xff\xd8'):
+                return _jpeg_dimensions(f)
+            if path.lower().endswith('.svg'):
+                f.seek(0)
+                return _svg_dimensions(f.read(4096))
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _webp_dimensions(head):
+    chunk = head[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X':
+        return (int.from_bytes(head[24:27], 'little') + 1,
+                int.from_bytes(head[27:30], 'little') + 1)
+    return None
+
+
+# Start-of-frame markers; C4, C8 and CC share the range but are not frames
+_JPEG_FRAMES = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(f):
+    """Walk JPEG segment headers, seeking over their bodies, to the first frame."""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] == 0xFF:
+            # Fill byte before the real marker
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        if marker[1] in _JPEG_FRAMES:
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)
+
+
+_SVG_SIZE = re.compile(rb'<svg\b[^>]*?\b(width|height)\s*=\s*["\']([\d.]+)(?:px)?["\']'
+                       rb'[^>]*?\b(width|height)\s*=\s*["\']([\d.]+)(?:px)?["\']', re.DOTALL)
+
+
+def _svg_dimensions(data):
+    match = _SVG_SIZE.search(data)
+    if match is None:
+        return None
+    size = {match.group(1): float(match.group(2)), match.group(3): float(match.group(4))}
+    if set(size) != {b'width', b'height'}:
+        return None
+    return round(size[b'width']), round(size[b'height'])
+
+
+def check_local_image(path):
+    """Describe a local image with a stat call and a header read."""
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return {'status': 'Broken (not found)', 'content_type': None, 'size': None}
+    info = {
+        'status': 'OK (local)',
+        'content_type': mimetypes.guess_type(path)[0],
+        'size': size,
+    }
+    dimensions = image_dimensions(path)
+    if dimensions is not None:
+        info['width'], info['height'] = dimensions
+    return info
+
+
+def check_remote_image(url, policy, session=None):
+    """Check an image URL with policy (see ValidationPolicy) and describe the response."""
+    status, response = policy.request(url, session)
+    if response is None:
+        return {'status': status, 'content_type': None, 'size': None}
+
+    length = response.headers.get('Content-Length')
+    content_type = response.headers.get('Content-Type')
+    info = {
+        'status': status,
+        'content_type': content_type.split(';')[0].strip() if content_type else None,
+        'size': int(length) if length and length.isdigit() else None,
+    }
+    if info['status'].startswith('OK') and info['content_type'] and \
+            not info['content_type'].startswith('image/'):
+        info['status'] = f"Broken (not an image: {info['content_type']})"
+    return info
+
+
+def validate_images(images, config, base='.', root=None, policy=None):
+    """Check every image and record what was found on each image dict.
+
+    Each image gets 'status', 'content_type', 'size' in bytes (None if
+    unknown), 'width'/'height' for local files whose header could be read,
+    and 'oversized' when size exceeds config['max_image_bytes']. Relative
+    paths are resolved against base and root (see resolve_image) unless
+    the image already carries a 'resolved' target. Remote images are
+    checked concurrently like links: under the link checker's per-host
+    limits and with policy's retries, GET fallback and circuit breaker
+    (a ValidationPolicy, built from config if not given). Each distinct
+    image is checked once. Returns the broken images.
+    """
+    if policy is None:
+        policy = ValidationPolicy.from_config(config)
+    max_bytes = config.get('max_image_bytes', 1 << 20)
+
+    targets = {}
+    for image in images:
+        if 'resolved' not in image:
+            image['resolved'] = resolve_image(image['url'], base, root)
+        if image['resolved'] is None:
+            image.update(status='Skipped (not a file or URL)', content_type=None,
+                         size=None, oversized=False)
+        else:
+            targets.setdefault(image['resolved'], []).append(image)
+
+    found = {}
+    remote = []
+    for target in targets:
+        if target.startswith(('http://', 'https://')):
+            remote.append(target)
+        else:
+            found[target] = check_local_image(target)
+
+    def check(url, session):
+        found[url] = check_remote_image(url, policy, session)
+
+    run_per_host(remote, check, max(1, config.get('max_workers', 10)),
+                 max(1, config.get('max_per_host', 4)))
+
+    for target, target_images in targets.items():
+        info = found[target]
+        for image in target_images:
+            image.update(info)
+            image['oversized'] = info['size'] is not None and info['size'] > max_bytes
+
+    return [image for image in images if image['status'].startswith('Broken')]
+
+
+def describe_image(image):
+    """Short summary of a validated image for the text report."""
+    parts = [image['status']]
+    if image.get('content_type'):
+        parts.append(image['content_type'])
+    if image.get('width') is not None:
+        parts.append(f"{image['width']}x{image['height']}")
+    if image.get('size') is not None:
+        parts.append(f"{image['size'] / 1024:,.1f} KB")
+    if image.get('oversized'):
+        parts.append("⚠️ oversized")
+    return ', '.join(parts)
@@ -0,0 +1,99 @@
+import sqlite3
+import time
+
+
+class LinkCache:
+    """Persistent URL -> status cache backed by SQLite.
+
+    OK and broken results expire after separate TTLs, and the table is
+    trimmed to max_entries by dropping the oldest checks first.
+    """
+
+    # SQLite's default limit on host parameters in one statement
+    _BATCH = 900
+
+    def __init__(self, db="link_cache.db", ok_ttl=86400, broken_ttl=3600,
+                 max_entries=50000, clock=time.time):
+        self.ok_ttl = ok_ttl
+        self.broken_ttl = broken_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.conn = sqlite3.connect(db)
+        self.c = self.conn.cursor()
+        self.c.execute('''CREATE TABLE IF NOT EXISTS link_status (
+            url TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            checked_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )''')
+        self.c.execute('CREATE INDEX IF NOT EXISTS idx_link_status_checked '
+                       'ON link_status (checked_at)')
+        self.conn.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        """Open the cache described by config, or return None if disabled."""
+        db = config.get('link_cache_file')
+        if not db:
+            return None
+        return cls(db,
+                   ok_ttl=config.get('cache_ttl_ok', 86400),
+                   broken_ttl=config.get('cache_ttl_broken', 3600),
+                   max_entries=config.get('cache_max_entries', 50000))
+
+    def get_many(self, urls):
+        """Return {url: status} for every url with an unexpired entry."""
+        now = self.clock()
+        urls = list(dict.fromkeys(urls))
+        found = {}
+        for i in range(0, len(urls), self._BATCH):
+            batch = urls[i:i + self._BATCH]
+            placeholders = ','.join('?' * len(batch))
+            self.c.execute(
+                f'SELECT url, status FROM link_status '
+                f'WHERE url IN ({placeholders}) AND expires_at > ?',
+                (*batch, now)
+            )
+            found.update(self.c.fetchall())
+        return found
+
+    def get(self, url):
+        return self.get_many([url]).get(url)
+
+    def put_many(self, statuses):
+        """Store {url: status} results and evict down to max_entries."""
+        now = self.clock()
+        rows = []
+        for url, status in statuses.items():
+            ttl = self.broken_ttl if status.startswith('Broken') else self.ok_ttl
+            rows.append((url, status, now, now + ttl))
+        self.c.executemany(
+            'INSERT OR REPLACE INTO link_status (url,status,checked_at,expires_at) '
+            'VALUES (?,?,?,?)',
+            rows
+        )
+        self.evict()
+        self.conn.commit()
+
+    def put(self, url, status):
+        self.put_many({url: status})
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones beyond max_entries."""
+        self.c.execute('DELETE FROM link_status WHERE expires_at <= ?', (self.clock(),))
+        self.c.execute('SELECT COUNT(*) FROM link_status')
+        excess = self.c.fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.c.execute(
+                'DELETE FROM link_status WHERE url IN '
+                '(SELECT url FROM link_status ORDER BY checked_at LIMIT ?)',
+                (excess,)
+            )
+
+    def __len__(self):
+        self.c.execute('SELECT COUNT(*) FROM link_status')
+        return self.c.fetchone()[0]
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
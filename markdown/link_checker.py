@@ -0,0 +1,173 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from link_cache import LinkCache
+from link_policy import CIRCUIT_OPEN_STATUS, ValidationPolicy
+
+
+SKIPPED_STATUS = 'Skipped (local/anchor/wiki)'
+
+
+def is_external(link):
+    """Return True if the link points to an http(s) URL that can be checked."""
+    url = link['url']
+    if (url.startswith('#') or
+        url.startswith('ref:') or
+        link.get('type') == 'wiki' or
+        not url.startswith(('http://', 'https://'))):
+        return False
+    return True
+
+
+def normalize_url(url):
+    """Return a canonical form of url for deduplication.
+
+    The scheme and host are lowercased, default ports and the fragment are
+    dropped, and an empty path becomes '/'. The query is kept as-is.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rpartition(':')[2]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rpartition(':')[0]
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def check_url(url, timeout, session=None):
+    """Check url once (HEAD, falling back to GET) and return a status string."""
+    return ValidationPolicy(timeout=timeout, max_retries=0).check(url, session)
+
+
+def _interleave_by_host(urls):
+    """Order URLs round-robin across hosts so no host hogs the pool."""
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urlsplit(url).netloc, []).append(url)
+
+    ordered = []
+    queues = list(by_host.values())
+    index = 0
+    while queues:
+        remaining = []
+        for queue in queues:
+            if index < len(queue):
+                ordered.append(queue[index])
+                remaining.append(queue)
+        queues = remaining
+        index += 1
+    return ordered
+
+
+def run_per_host(urls, check, max_workers, max_per_host):
+    """Call check(url, session) for every URL on a thread pool.
+
+    Each host gets one keep-alive requests.Session and at most
+    max_per_host concurrent calls; hosts are interleaved so none of them
+    hogs the pool.
+    """
+    host_limits = {}
+    sessions = {}
+    host_lock = threading.Lock()
+
+    def host_session(host):
+        with host_lock:
+            if host not in sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_per_host)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                sessions[host] = session
+                host_limits[host] = threading.Semaphore(max_per_host)
+            return sessions[host], host_limits[host]
+
+    def run(url):
+        session, limit = host_session(urlsplit(url).netloc)
+        with limit:
+            check(url, session)
+
+    try:
+        if max_workers == 1 or len(urls) <= 1:
+            for url in urls:
+                run(url)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                # list() re-raises any unexpected error from a worker
+                list(pool.map(run, _interleave_by_host(urls)))
+    finally:
+        for session in sessions.values():
+            session.close()
+
+
+def validate_links(links, config, cache=None, index=None, source=None, policy=None):
+    """Validate a list of links by checking if they're accessible.
+
+    Each distinct URL (after normalize_url) is checked once, however many
+    links point at it, and the status is copied to every occurrence.
+    External links are checked concurrently on a thread pool of
+    config['max_workers'] threads, with at most config['max_per_host']
+    requests in flight to any single host and one keep-alive session per
+    host. Statuses found in the link
+    cache (an open LinkCache, or the one named by config) are reused
+    instead of hitting the network. Each link gets a 'status' string and
+    the broken ones are returned in document order.
+
+    Relative, #anchor and [[wiki]] links are resolved against index (a
+    LinkIndex) as links in the file source; without an index they are
+    marked as skipped.
+
+    Each URL is checked according to policy (a ValidationPolicy, built from
+    config if not given): failed attempts are retried with backoff, HEAD
+    falls back to GET, and hosts that keep failing are cut off by a
+    circuit breaker. Pass the same policy to several calls to share the
+    breaker's state between them.
+    """
+    if policy is None:
+        policy = ValidationPolicy.from_config(config)
+    own_cache = cache is None
+    if own_cache:
+        cache = LinkCache.from_config(config)
+    try:
+        return _validate_links(links, config, cache, index, source, policy)
+    finally:
+        if own_cache and cache is not None:
+            cache.close()
+
+
+def _validate_links(links, config, cache, index, source, policy):
+    max_workers = max(1, config.get('max_workers', 10))
+    max_per_host = max(1, config.get('max_per_host', 4))
+
+    external = []
+    occurrences = {}
+    for link in links:
+        if is_external(link):
+            external.append(link)
+            occurrences.setdefault(normalize_url(link['url']), []).append(link)
+        elif index is not None:
+            link['status'] = index.resolve(link, source)
+        else:
+            link['status'] = SKIPPED_STATUS
+
+    statuses = cache.get_many(occurrences) if cache is not None else {}
+    to_check = [url for url in occurrences if url not in statuses]
+
+    def check(url, session):
+        statuses[url] = policy.check(url, session)
+
+    run_per_host(to_check, check, max_workers, max_per_host)
+
+    if cache is not None and to_check:
+        # An open circuit says nothing about the URL itself, so don't remember it
+        cache.put_many({url: statuses[url] for url in to_check
+                        if statuses[url] != CIRCUIT_OPEN_STATUS})
+
+    # Fan each status back out to every occurrence of the URL
+    for url, url_links in occurrences.items():
+        for link in url_links:
+            link['status'] = statuses[url]
+
+    return [link for link in links if link['status'].startswith('Broken')]
@@ -0,0 +1,218 @@
+import os
+import re
+from urllib.parse import unquote, urlsplit
+
+from batch import MARKDOWN_EXTENSIONS
+from extractors import slugify
+from link_checker import SKIPPED_STATUS, is_external
+from tokenizer import analyze_file
+
+LOCAL_OK = 'OK (local)'
+MISSING_FILE = 'Broken (missing file)'
+MISSING_ANCHOR = 'Broken (missing anchor)'
+MISSING_PAGE = 'Broken (no such page)'
+
+_PAGE_SEPARATORS = re.compile(r'[\s_-]+')
+_GLOB_MAGIC = re.compile(r'[*?[]')
+
+
+def search_roots(paths):
+    """Directories to index for the given files, directories and glob patterns.
+
+    A glob pattern contributes the directory before its first wildcard.
+    """
+    roots = []
+    for path in paths:
+        magic = _GLOB_MAGIC.search(path)
+        if magic:
+            path = os.path.dirname(path[:magic.start()]) or '.'
+        if os.path.exists(path):
+            roots.append(path)
+    return roots
+
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _root_dirs(roots):
+    """Normalized directories of roots, innermost (longest) first."""
+    return sorted((_key(root if os.path.isdir(root) else os.path.dirname(root) or '.')
+                   for root in roots), key=len, reverse=True)
+
+
+def _innermost_root(path, root_dirs):
+    key = _key(path)
+    for root in root_dirs:
+        if key == root or key.startswith(root.rstrip(os.sep) + os.sep):
+            return root
+    return None
+
+
+def document_root(source, roots):
+    """The directory root-relative ('/docs/x.md') paths in file source resolve against.
+
+    That is the innermost of roots containing source, or the file's own
+    directory if none does.
+    """
+    return _innermost_root(source, _root_dirs(roots)) or os.path.dirname(_key(source))
+
+
+def page_key(name):
+    """Normalize a wiki page name or file stem: 'Getting Started' == 'getting-started'."""
+    return _PAGE_SEPARATORS.sub('-', name.strip().lower())
+
+
+class LinkIndex:
+    """Every file path, wiki page name and heading anchor under a set of roots.
+
+    Built once (usually per batch) so relative, #anchor and [[wiki]] links
+    can be checked with set and dict lookups instead of touching the disk
+    or the network. Anchors of markdown files that were not analyzed yet
+    are read on first use with a headings-only pass and then cached.
+    """
+
+    def __init__(self, roots=()):
+        # Directories that root-relative ('/docs/x.md') links resolve against
+        self.roots = _root_dirs(roots)
+        self.files = set()
+        self.pages = {}
+        self.anchors = {}
+        # Directories and files given as roots, walked by build() or, for an
+        # on_demand() index, only once a wiki link needs the page names
+        self._unwalked = []
+
+    @classmethod
+    def build(cls, roots, results=()):
+        """Index the files under roots plus the anchors of analyzed results."""
+        index = cls(roots)
+        index._walk(roots)
+        index._add_results(results)
+        return index
+
+    @classmethod
+    def on_demand(cls, roots, results=()):
+        """An index that looks linked files up as links need them.
+
+        Suits checking the links of one or a few files: instead of walking
+        every root up front, each linked path costs one stat, and the tree
+        is only walked the first time a [[wiki]] link needs page names.
+        """
+        index = cls(roots)
+        index._unwalked = list(roots)
+        index._add_results(results)
+        return index
+
+    def _walk(self, roots):
+        for root in roots:
+            if os.path.isdir(root):
+                for directory, dirs, files in os.walk(root):
+                    self.add_file(directory)
+                    for name in files:
+                        self.add_file(os.path.join(directory, name))
+            elif os.path.isfile(root):
+                self.add_file(root)
+
+    def _add_results(self, results):
+        for result in results:
+            if 'anchors' in result:
+                self.add_anchors(result['file'], result['anchors'])
+
+    def add_file(self, path):
+        key = _key(path)
+        self.files.add(key)
+        stem, ext = os.path.splitext(os.path.basename(key))
+        if ext.lower() in MARKDOWN_EXTENSIONS:
+            self.pages.setdefault(page_key(stem), key)
+
+    def discard(self, path):
+        """Forget a file that was deleted."""
+        key = _key(path)
+        self.files.discard(key)
+        self.anchors.pop(key, None)
+        stem, ext = os.path.splitext(os.path.basename(key))
+        if self.pages.get(page_key(stem)) == key:
+            del self.pages[page_key(stem)]
+
+    def add_anchors(self, path, anchors):
+        key = _key(path)
+        self.files.add(key)
+        self.anchors[key] = set(anchors)
+
+    def resolve(self, link, source):
+        """Return a status for a local, anchor or wiki link in file source.
+
+        External URLs and links that cannot be checked locally (reference
+        links, other schemes) get SKIPPED_STATUS.
+        """
+        url = link['url']
+        if link.get('type') == 'wiki':
+            page, _, anchor = url.split('|', 1)[0].partition('#')
+            anchor = slugify(anchor)
+            if not page.strip():
+                return self._check_anchor(_key(source), anchor)
+            if self._unwalked:
+                roots, self._unwalked = self._unwalked, []
+                self._walk(roots)
+            target = self.pages.get(page_key(page))
+            if target is None:
+                return MISSING_PAGE
+            return self._check_anchor(target, anchor)
+
+        if is_external(link) or url.startswith('ref:'):
+            return SKIPPED_STATUS
+        parts = urlsplit(url)
+        if parts.scheme or parts.netloc:
+            return SKIPPED_STATUS
+        if not parts.path:
+            return self._check_anchor(_key(source), unquote(parts.fragment))
+
+        path = unquote(parts.path)
+        if path.startswith('/'):
+            base = self._root_of(source) or os.path.dirname(_key(source))
+            path = path.lstrip('/')
+        else:
+            base = os.path.dirname(_key(source))
+        target = _key(os.path.join(base, path))
+        if target not in self.files:
+            if self._unwalked and os.path.exists(target):
+                self.add_file(target)
+            # Outside the indexed tree: fall back to the file system
+            elif self._root_of(target) is not None or not os.path.exists(target):
+                return MISSING_FILE
+        return self._check_anchor(target, unquote(parts.fragment))
+
+    def resolve_links(self, links, source):
+        """Set 'status' on every non-external link; return the broken ones."""
+        broken = []
+        for link in links:
+            if is_external(link):
+                continue
+            link['status'] = self.resolve(link, source)
+            if link['status'].startswith('Broken'):
+                broken.append(link)
+        return broken
+
+    def _check_anchor(self, target, anchor):
+        if not anchor:
+            return LOCAL_OK
+        anchors = self._anchors_of(target)
+        if anchors is None or anchor.lower() in anchors:
+            return LOCAL_OK
+        return MISSING_ANCHOR
+
+    def _anchors_of(self, target):
+        """Anchors of a markdown file, or None if it is not markdown."""
+        if target not in self.anchors:
+            if not target.lower().endswith(MARKDOWN_EXTENSIONS):
+                return None
+            try:
+                analysis = analyze_file(target, extractors=['anchors'])
+            except (OSError, UnicodeDecodeError):
+                return None
+            self.anchors[target] = set(analysis['anchors'] if analysis else ())
+        return self.anchors[target]
+
+    def _root_of(self, path):
+        """The innermost indexed root containing path, or None."""
+        return _innermost_root(path, self.roots)
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# Not checked because the host's circuit is open: unknown, not broken
+CIRCUIT_OPEN_STATUS = 'Skipped (circuit open)'
+
+# Answers that may succeed if asked again a little later
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Answers from servers that do not implement HEAD
+HEAD_UNSUPPORTED = frozenset({405, 501})
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker for link checks.
+
+    After threshold consecutive failed URLs (ones that still timed out or
+    could not connect after their retries, not HTTP error statuses) a
+    host's circuit opens and its links are skipped without a request.
+    After reset_after seconds one trial request is let through; if it
+    succeeds the circuit closes again.
+    """
+
+    def __init__(self, threshold=3, reset_after=60, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+
+    def allow(self, host):
+        """Return False while host's circuit is open."""
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if self.clock() - opened_at < self.reset_after:
+                return False
+            # Half-open: let this request through and restart the timer, so
+            # concurrent callers keep failing fast until it reports back
+            self._opened_at[host] = self.clock()
+            return True
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self.threshold > 0 and self._failures[host] >= self.threshold:
+                self._opened_at[host] = self.clock()
+
+
+class ValidationPolicy:
+    """How a single URL is checked: retries, backoff, fallbacks and limits.
+
+    A HEAD request is sent first. Servers that answer 405/501 are asked
+    again with a streamed GET whose body is never read. Timeouts,
+    connection errors and 429/502/503/504 answers are retried up to
+    max_retries times, sleeping a random time of up to
+    backoff * 2**attempt seconds (at most max_backoff) between attempts,
+    or the server's Retry-After if it sent one. Redirect chains longer than
+    max_redirects are broken. Every attempt goes through the breaker, and
+    a URL that fails for good counts once against its host, so a dead host
+    stops costing a full timeout per link.
+    """
+
+    def __init__(self, timeout=5, max_retries=2, backoff=0.5, max_backoff=8,
+                 max_redirects=5, breaker=None, sleep=time.sleep, rng=random.random):
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_redirects = max_redirects
+        self.breaker = breaker if breaker is not None else CircuitBreaker(threshold=0)
+        self.sleep = sleep
+        self.rng = rng
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(timeout=config.get('timeout', 5),
+                   max_retries=config.get('max_retries', 2),
+                   backoff=config.get('retry_backoff', 0.5),
+                   max_backoff=config.get('retry_max_backoff', 8),
+                   max_redirects=config.get('max_redirects', 5),
+                   breaker=CircuitBreaker(config.get('circuit_breaker_threshold', 3),
+                                          config.get('circuit_breaker_reset', 60)))
+
+    def check(self, url, session=None):
+        """Check url and return a status string such as 'OK (200)'."""
+        return self.request(url, session)[0]
+
+    def request(self, url, session=None):
+        """Check url like check(); returns (status, final response or None).
+
+        The response's body has not been read, but its headers are there
+        for callers that want more than the status.
+        """
+        if session is None:
+            with requests.Session() as session:
+                return self.request(url, session)
+        session.max_redirects = self.max_redirects
+
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow(host):
+                return CIRCUIT_OPEN_STATUS, None
+            status, retry_after, response = self._attempt(url, session, host)
+            if retry_after is None or attempt == self.max_retries:
+                if response is None and retry_after is not None:
+                    # Out of retries on a timeout or connection error
+                    self.breaker.record_failure(host)
+                return status, response
+            self.sleep(self._delay(attempt, retry_after))
+
+    def _attempt(self, url, session, host):
+        """One HEAD (plus GET fallback); returns (status, retry_after, response).
+
+        retry_after is None when the answer is final, else the server's
+        requested delay in seconds (0 if it did not ask for one). response
+        is None when no answer came.
+        """
+        try:
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in HEAD_UNSUPPORTED:
+                # stream=True returns once the headers arrive; the body is never read
+                with session.get(url, timeout=self.timeout, allow_redirects=True,
+                                 stream=True) as response:
+                    pass
+        except requests.exceptions.TooManyRedirects:
+            self.breaker.record_success(host)
+            return 'Broken (TooManyRedirects)', None, None
+        except requests.exceptions.Timeout:
+            return 'Broken (Timeout)', 0, None
+        except requests.exceptions.ConnectionError as e:
+            return f'Broken ({type(e).__name__})', 0, None
+        except Exception as e:
+            return f'Broken ({type(e).__name__})', None, None
+
+        self.breaker.record_success(host)
+        code = response.status_code
+        if code < 400:
+            return f'OK ({code})', None, response
+        if code in RETRY_STATUSES:
+            return f'Broken ({code})', _retry_after(response), response
+        return f'Broken ({code})', None, response
+
+    def _delay(self, attempt, retry_after):
+        """Full jitter: a random delay up to the exponential backoff ceiling."""
+        if retry_after:
+            return min(self.max_backoff, retry_after)
+        return self.rng() * min(self.max_backoff, self.backoff * 2 ** attempt)
+
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After', '')
+    return int(value) if value.isdigit() else 0
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from link_policy import CIRCUIT_OPEN_STATUS
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Per-file content hashes and analysis results from earlier runs.
+
+    A file whose size and modification time are unchanged is trusted
+    without reading it; otherwise its content hash decides whether the
+    stored results can be reused. Stored link statuses stay fresh for the
+    same TTLs as the link cache, after which only validation is redone.
+    """
+
+    def __init__(self, db="analysis_manifest.db", ok_ttl=86400, broken_ttl=3600,
+                 clock=time.time):
+        self.ok_ttl = ok_ttl
+        self.broken_ttl = broken_ttl
+        self.clock = clock
+        self.conn = sqlite3.connect(db)
+        self.c = self.conn.cursor()
+        self.c.execute('''CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            validated_at REAL NOT NULL,
+            result TEXT NOT NULL
+        )''')
+        self.conn.commit()
+        self.c.execute('SELECT path, size, mtime_ns, sha256, validated_at, result FROM files')
+        self._entries = {row[0]: row[1:] for row in self.c.fetchall()}
+
+    @classmethod
+    def from_config(cls, config):
+        """Open the manifest named by config, or return None if disabled."""
+        db = config.get('manifest_file')
+        if not db:
+            return None
+        return cls(db,
+                   ok_ttl=config.get('cache_ttl_ok', 86400),
+                   broken_ttl=config.get('cache_ttl_broken', 3600))
+
+    def lookup(self, path):
+        """Return (result, statuses_fresh) stored for an unchanged file, else None.
+
+        statuses_fresh is False once the stored link statuses are older
+        than their TTL and the links should be validated again.
+        """
+        key = os.path.abspath(path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        size, mtime_ns, sha256, validated_at, result = entry
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            if stat.st_size != size or file_digest(path) != sha256:
+                return None
+            # Touched but not modified: remember the new mtime
+            self._store(key, stat, sha256, validated_at, result)
+
+        result = json.loads(result)
+        result['file'] = path
+        if any(item.get('status') == CIRCUIT_OPEN_STATUS
+               for item in result['links'] + result['images']):
+            # Some URLs were skipped, not checked: check them on this run
+            return result, False
+        broken = any(link['status'].startswith('Broken') for link in result['links'])
+        ttl = self.broken_ttl if broken else self.ok_ttl
+        return result, self.clock() < validated_at + ttl
+
+    def update(self, result):
+        """Store a file's analysis result, including its link statuses."""
+        path = result['file']
+        stat = os.stat(path)
+        stored = dict(result)
+        del stored['file']
+        self._store(os.path.abspath(path), stat, file_digest(path), self.clock(),
+                    json.dumps(stored))
+
+    def _store(self, key, stat, sha256, validated_at, result):
+        row = (stat.st_size, stat.st_mtime_ns, sha256, validated_at, result)
+        self._entries[key] = row
+        self.c.execute(
+            'INSERT OR REPLACE INTO files (path,size,mtime_ns,sha256,validated_at,result) '
+            'VALUES (?,?,?,?,?,?)',
+            (key, *row)
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
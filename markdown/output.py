@@ -0,0 +1,34 @@
+import json
+
+FORMATS = ('json', 'ndjson')
+
+
+class RecordWriter:
+    """Write one JSON record per analyzed file to a stream as it completes.
+
+    'ndjson' writes one object per line. 'json' writes a single array, with
+    each element written as it arrives; close() finishes the array. The
+    stream is flushed after every record so consumers see results
+    immediately.
+    """
+
+    def __init__(self, stream, format='ndjson'):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown output format: {format!r}")
+        self.stream = stream
+        self.format = format
+        self.count = 0
+
+    def write(self, result):
+        record = json.dumps(result, ensure_ascii=False)
+        if self.format == 'ndjson':
+            self.stream.write(record + '\n')
+        else:
+            self.stream.write(('[\n' if self.count == 0 else ',\n') + record)
+        self.stream.flush()
+        self.count += 1
+
+    def close(self):
+        if self.format == 'json':
+            self.stream.write('\n]\n' if self.count else '[]\n')
+        self.stream.flush()
@@ -0,0 +1,42 @@
+"""Precompiled regular expressions shared by the analyzers.
+
+Compiling once at import keeps re's pattern cache lookup out of every
+call. The link and image patterns are shared by the legacy functions in
+Mini_Project_1 and the single-pass tokenizer, so the two cannot drift.
+"""
+
+import re
+
+CODE_BLOCK = re.compile(r'```[\s\S]*?```')
+INLINE_CODE = re.compile(r'`[^`]+`')
+MARKDOWN_SYNTAX = re.compile(r'[#*_\[\]()!]')
+
+HEADING = re.compile(r'^(#{1,6})\s+.+$', re.MULTILINE)
+
+# Pieces shared by the link-like patterns below, so the separate patterns
+# and the tokenizer's combined one cannot drift apart
+_TEXT = r'[^\]]+'
+_ALT = r'[^\]]*'
+_URL = r'[^)]+'
+
+# Each link-like pattern is an opener, text up to the first ']', then a
+# second bracket pair; the tokenizer relies on this shape
+LINK = re.compile(rf'\[({_TEXT})\]\(({_URL})\)')
+WIKI_LINK = re.compile(rf'\[\[({_TEXT})\]\]')
+REF_LINK = re.compile(rf'\[({_TEXT})\]\[({_TEXT})\]')
+IMAGE = re.compile(rf'!\[({_ALT})\]\(({_URL})\)')
+
+# Headings, links, wiki links, reference links and images in one scan.
+# Only the first character ('\n', '!' or '[') is consumed and the rest is
+# matched in a lookahead, so constructs that overlap for the separate
+# patterns (e.g. the link inside every image) are all found. At most one
+# alternative can match at a position; the group closed last (lastgroup)
+# names it: title, src, page, url or ref. Headings are anchored on the
+# newline before them, which is much faster to search for than ^.
+TOKENS = re.compile(
+    r'\n(?=(?P<hashes>#{1,6})\s+(?P<title>.+)$)'
+    rf'|!(?=\[(?P<alt>{_ALT})\]\((?P<src>{_URL})\))'
+    rf'|\[(?=\[(?P<page>{_TEXT})\]\]'
+    rf'|(?P<text>{_TEXT})\](?:\((?P<url>{_URL})\)|\[(?P<ref>{_TEXT})\]))',
+    re.MULTILINE
+)
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """On-disk store of response bodies and their validators, keyed by URL.
+
+    Entries keep the ETag and Last-Modified headers of the response so a
+    later request can be made conditional; a 304 answer is then served from
+    the stored body. Safe to share between threads.
+    """
+
+    def __init__(self, db="github_cache.db", clock=time.time):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db, check_same_thread=False)
+        self.c = self.conn.cursor()
+        self.c.execute('''CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB NOT NULL,
+            encoding TEXT,
+            stored_at REAL NOT NULL
+        )''')
+        self.conn.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        """Open the cache named by config, or return None if disabled."""
+        db = config.get('github_cache_file')
+        if not db:
+            return None
+        return cls(db)
+
+    def get(self, url):
+        """Return (etag, last_modified, body, encoding) for url, or None."""
+        with self._lock:
+            self.c.execute('SELECT etag, last_modified, body, encoding FROM responses '
+                           'WHERE url = ?', (url,))
+            return self.c.fetchone()
+
+    def put(self, url, etag, last_modified, body, encoding=None):
+        """Store a response body; responses without validators are not stored."""
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self.c.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url,etag,last_modified,body,encoding,stored_at) VALUES (?,?,?,?,?,?)',
+                (url, etag, last_modified, body, encoding, self.clock())
+            )
+            self.conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            self.c.execute('SELECT COUNT(*) FROM responses')
+            return self.c.fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The analyzer modules live in markdown/, not in an installed package; make
+# them importable however pytest is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubServer:
+    """Local HTTP server whose responses are configured per path."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.connections = set()
+        self.latency = 0
+        self._lock = threading.Lock()
+        self._active = 0
+        self.max_active = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive so connection reuse can be observed
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self, with_body):
+                with stub._lock:
+                    stub.requests.append((self.command, self.path, dict(self.headers)))
+                    stub.connections.add(self.client_address)
+                    stub._active += 1
+                    stub.max_active = max(stub.max_active, stub._active)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    status, headers, body = stub.routes.get(self.path, (200, {}, b''))
+                    if callable(status):
+                        status, headers, body = status(self)
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    if with_body:
+                        self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub._active -= 1
+
+            def do_HEAD(self):
+                self._respond(with_body=False)
+
+            def do_GET(self):
+                self._respond(with_body=True)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from batch import find_markdown_files, analyze_files, summarize
+from Mini_Project_1 import analyze_batch
+from tokenizer import analyze_content
+
+
+@pytest.fixture
+def docs(tmp_path):
+    (tmp_path / 'guide').mkdir()
+    (tmp_path / 'guide' / 'intro.md').write_text('# Intro\n\nHello [home](#top) world.\n')
+    (tmp_path / 'guide' / 'setup.markdown').write_text('## Setup\n\n![logo](logo.png) Run it.\n')
+    (tmp_path / 'README.md').write_text('# Project\n\nSee [[Guide]].\n')
+    (tmp_path / 'notes.txt').write_text('# not markdown\n')
+    (tmp_path / 'draft.tmp.md').write_text('# draft\n')
+    return tmp_path
+
+
+def test_find_markdown_files_walks_directories(docs):
+    files = find_markdown_files([str(docs)])
+
+    assert sorted(os.path.relpath(f, docs) for f in files) == sorted([
+        'README.md', 'draft.tmp.md',
+        os.path.join('guide', 'intro.md'), os.path.join('guide', 'setup.markdown'),
+    ])
+
+
+def test_find_markdown_files_globs_and_excludes(docs):
+    files = find_markdown_files([str(docs / '**' / '*.md'), str(docs / 'README.md')],
+                                exclude_extensions=['.tmp.md'])
+
+    assert sorted(os.path.relpath(f, docs) for f in files) == [
+        'README.md', os.path.join('guide', 'intro.md'),
+    ]
+
+
+def test_process_pool_matches_single_process(docs):
+    files = find_markdown_files([str(docs)])
+
+    pooled = analyze_files(files, workers=2)
+    local = analyze_files(files, workers=1)
+
+    assert pooled == local
+    for result in pooled:
+        with open(result['file'], encoding='utf-8') as f:
+            expected = analyze_content(f.read())
+        assert {key: result[key] for key in expected} == expected
+
+
+def test_summarize_totals(docs):
+    results = analyze_files(find_markdown_files([str(docs)]), workers=1)
+    results.append({'file': 'missing.md', 'error': 'FileNotFoundError'})
+
+    totals = summarize(results)
+
+    assert totals['files'] == 4
+    assert totals['failed'] == 1
+    assert totals['word_count'] == sum(r.get('word_count', 0) for r in results)
+    assert totals['headings']['h1'] == 3
+    assert totals['headings']['h2'] == 1
+    # extract_links also reports the image as a standard link
+    assert len(totals['links']) == 3
+    assert len(totals['images']) == 1
+
+
+def test_analyze_batch_prints_combined_report(docs, capsys):
+    config = {'exclude_extensions': [], 'generate_html': False}
+
+    results = analyze_batch([str(docs)], config, workers=2)
+
+    out = capsys.readouterr().out
+    assert len(results) == 4
+    assert 'intro.md' in out and 'setup.markdown' in out
+    assert 'Files analyzed: 4' in out
+    assert 'MARKDOWN ANALYSIS REPORT' in out
+
+
+def test_analyze_batch_validates_images_relative_to_each_file(docs, capsys):
+    (docs / 'guide' / 'logo.png').write_bytes(b'GIF89a\x10\x00\x08\x00' + b'\x00' * 20)
+    (docs / 'README.md').write_text('# Project\n\n![missing](img/none.png)\n')
+    config = {'exclude_extensions': [], 'generate_html': False, 'validate_images': True}
+
+    results = analyze_batch([str(docs)], config, workers=1)
+
+    images = {image['url']: image for result in results for image in result['images']}
+    assert images['logo.png']['status'] == 'OK (local)'
+    assert (images['logo.png']['width'], images['logo.png']['height']) == (16, 8)
+    assert images['img/none.png']['status'] == 'Broken (not found)'
+    assert 'Broken: 1' in capsys.readouterr().out
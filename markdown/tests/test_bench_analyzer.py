@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from bench_analyzer import (SEPARATE_STAGES, compare, generate_markdown, main, parse_size,
+                           speedup)
+from Mini_Project_1 import count_headings, extract_images, extract_links
+
+
+def test_parse_size():
+    assert parse_size('1KB') == 1024
+    assert parse_size('100mb') == 100 << 20
+    assert parse_size('512') == 512
+
+
+def test_generated_document_matches_requested_shape():
+    content = generate_markdown(64 << 10, link_density=10, heading_depth=2)
+
+    assert len(content) == 64 << 10
+    headings = count_headings(content)
+    assert headings['h1'] and headings['h2'] and not headings['h3']
+    assert len(extract_links(content)) > len(extract_images(content)) > 0
+    assert generate_markdown(4096, seed=1) == generate_markdown(4096, seed=1)
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = {'1MB': {'count_words': {'seconds': 0.010, 'peak_bytes': 1000},
+                        'extract_links': {'seconds': 0.010, 'peak_bytes': 1000}}}
+    results = {'1MB': {'count_words': {'seconds': 0.020, 'peak_bytes': 1100},
+                       'extract_links': {'seconds': 0.011, 'peak_bytes': 5000}},
+               '1KB': {'count_words': {'seconds': 1.0, 'peak_bytes': 1}}}
+
+    assert compare(results, baseline) == [
+        ('1MB', 'count_words', 'seconds', 0.010, 0.020),
+        ('1MB', 'extract_links', 'peak_bytes', 1000, 5000),
+    ]
+
+
+def test_compare_flags_a_shrinking_single_pass_speedup():
+    def stages(separate, single):
+        timings = {stage: {'seconds': separate / 4, 'peak_bytes': 0} for stage in SEPARATE_STAGES}
+        timings['analyze_content'] = {'seconds': single, 'peak_bytes': 0}
+        return {'1MB': timings}
+
+    assert speedup(stages(0.2, 0.1)['1MB']) == pytest.approx(2)
+    assert compare(stages(0.2, 0.1), stages(0.2, 0.1)) == []
+    assert compare(stages(0.1, 0.1), stages(0.2, 0.1)) == [
+        ('1MB', 'analyze_content', 'speedup', pytest.approx(2), pytest.approx(1))]
+
+
+def test_main_checks_the_minimum_speedup(capsys):
+    assert main(['--sizes', '2KB', '--repeat', '1', '--min-speedup', '1000']) == 1
+    assert 'less than 1000x faster' in capsys.readouterr().out
+
+
+def test_main_saves_and_checks_a_baseline(tmp_path, capsys):
+    path = str(tmp_path / 'baseline.json')
+
+    assert main(['--sizes', '2KB', '--repeat', '1', '--save-baseline', path]) == 0
+    with open(path) as f:
+        saved = json.load(f)
+    assert set(saved['2KB']) == {'count_words', 'count_headings', 'extract_links',
+                                 'extract_images', 'analyze_content', 'analyze_file',
+                                 'generate_html_report'}
+
+    for stage in saved['2KB'].values():
+        stage['peak_bytes'] = 0
+    with open(path, 'w') as f:
+        json.dump(saved, f)
+    assert main(['--sizes', '2KB', '--repeat', '1', '--baseline', path]) == 1
+    assert 'regression(s)' in capsys.readouterr().out
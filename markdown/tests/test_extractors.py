@@ -0,0 +1,135 @@
+import re
+
+import pytest
+
+from extractors import (EXTRACTORS, Extractor, PatternExtractor, PatternScanner, create_extractors,
+                        register_extractor, scanners_for)
+from tokenizer import MarkdownTokenizer, analyze_content, analyze_file
+
+
+DOC = """---
+title: "Release notes"
+tags: [a, b]
+---
+# Notes
+
+Fast path[^fast] and slow path[^slow].
+
+| Name | Speed |
+|------|:-----:|
+| fast | 10 |
+| slow | 1 |
+
+Text after the table [^fast].
+
+[^fast]: Uses the cache.
+Some | pipes | but no delimiter row
+a | b
+"""
+
+ALL = ['footnotes', 'tables', 'front_matter']
+
+
+def test_builtin_extractors():
+    result = analyze_content(DOC, ALL)
+
+    assert result['footnotes'] == {
+        'definitions': {'fast': 'Uses the cache.'},
+        'references': ['fast', 'slow', 'fast'],
+        'undefined': ['slow'],
+    }
+    assert result['tables'] == [{'columns': 2, 'rows': 2}]
+    assert result['front_matter'] == {'title': 'Release notes', 'tags': '[a, b]'}
+
+
+def test_extractors_do_not_change_builtin_results():
+    plain = analyze_content(DOC)
+    extended = analyze_content(DOC, ALL)
+
+    assert {key: extended[key] for key in plain} == plain
+
+
+@pytest.mark.parametrize('step', [1, 2, 3, 7, 16, 64])
+def test_results_do_not_depend_on_chunking(step):
+    tokenizer = MarkdownTokenizer(ALL)
+    for pos in range(0, len(DOC), step):
+        tokenizer.feed(DOC[pos:pos + step])
+
+    assert tokenizer.close() == analyze_content(DOC, ALL)
+
+
+def test_table_at_end_of_file_and_front_matter_absent(tmp_path):
+    path = tmp_path / 'doc.md'
+    path.write_text('Intro\n\na|b|c\n-|-|-\n1|2|3')
+
+    result = analyze_file(str(path), chunk_size=4, extractors=ALL)
+
+    assert result['tables'] == [{'columns': 3, 'rows': 1}]
+    assert result['front_matter'] is None
+
+
+def test_unclosed_front_matter_is_ignored():
+    assert analyze_content('---\ntitle: x\n\nbody\n', ['front_matter'])['front_matter'] is None
+
+
+def test_unknown_extractor():
+    with pytest.raises(ValueError, match='nope'):
+        analyze_content('text', ['nope'])
+
+
+def test_custom_extractor_runs_in_the_same_pass(monkeypatch):
+    monkeypatch.setattr('extractors.EXTRACTORS', dict(EXTRACTORS))
+
+    @register_extractor
+    class TodoExtractor(PatternExtractor):
+        name = 'todos'
+        pattern = re.compile(r'TODO: (.*)$', re.MULTILINE)
+
+        def __init__(self):
+            self.todos = []
+
+        def handle(self, match):
+            self.todos.append(match.group(1))
+
+        def result(self):
+            return self.todos
+
+    result = analyze_content('# Plan\nTODO: write tests\ntext\nTODO: ship', ['todos'])
+    assert result['todos'] == ['write tests', 'ship']
+
+    # Declaring where matches start lets it join the shared scan
+    TodoExtractor.starts = 'T'
+    result = analyze_content('# Plan\nTODO: write tests\ntext\nTODO: ship[^1]',
+                             ['todos', 'footnotes'])
+    assert result['todos'] == ['write tests', 'ship[^1]']
+    assert result['footnotes']['references'] == ['1']
+
+
+def test_pattern_extractors_share_one_scan():
+    extractors = create_extractors(['footnotes', 'tables', 'anchors', 'front_matter'])
+
+    scanners = scanners_for(extractors)
+
+    assert len(scanners) == 2
+    assert isinstance(scanners[0], PatternScanner)
+    assert scanners[0].extractors == extractors[:3]
+    assert scanners[1] is extractors[3]
+
+
+def test_shared_scan_finds_overlapping_matches():
+    doc = ('# Intro[^1] | a | b\n|---|---|\n| [^2] | x |\n\n'
+           '[^1]: first\n## Intro\n')
+
+    result = analyze_content(doc, ['footnotes', 'tables', 'anchors'])
+
+    assert result['footnotes']['references'] == ['1', '2']
+    assert result['footnotes']['definitions'] == {'1': 'first'}
+    assert result['tables'] == [{'columns': 3, 'rows': 1}]
+    assert result['anchors'] == ['intro1--a--b', 'intro']
+
+
+def test_extractor_base_classes_are_abstract():
+    with pytest.raises(TypeError):
+        Extractor()
+    with pytest.raises(TypeError):
+        PatternExtractor()
@@ -0,0 +1,217 @@
+import json
+import time
+
+import pytest
+
+import Mini_Project_1
+from github_client import GitHubClient, RateLimitError
+from Mini_Project_1 import main
+from response_cache import ResponseCache
+
+
+TREE = {
+    'sha': 'abc',
+    'truncated': False,
+    'tree': [
+        {'path': 'README.md', 'type': 'blob', 'sha': '1', 'size': 12},
+        {'path': 'docs', 'type': 'tree', 'sha': '2'},
+        {'path': 'docs/guide.markdown', 'type': 'blob', 'sha': '3', 'size': 20},
+        {'path': 'docs/deep/notes.md', 'type': 'blob', 'sha': '4', 'size': 8},
+        {'path': 'src/main.py', 'type': 'blob', 'sha': '5', 'size': 30},
+    ],
+}
+
+
+@pytest.fixture
+def github(stub_server):
+    stub_server.routes['/repos/octo/demo/git/trees/HEAD?recursive=1'] = (
+        200, {'Content-Type': 'application/json'}, json.dumps(TREE).encode())
+    for path in ('README.md', 'docs/guide.markdown', 'docs/deep/notes.md'):
+        stub_server.routes[f'/raw/octo/demo/HEAD/{path}'] = (200, {}, f'# {path}\n'.encode())
+    return stub_server
+
+
+def make_client(server, **kwargs):
+    return GitHubClient(api_url=server.url, raw_url=f'{server.url}/raw', **kwargs)
+
+
+def test_lists_whole_tree_in_one_call(github):
+    client = make_client(github)
+
+    files = client.list_markdown_files('octo', 'demo')
+
+    assert [f['name'] for f in files] == [
+        'README.md', 'docs/guide.markdown', 'docs/deep/notes.md',
+    ]
+    assert len(github.requests) == 1
+    assert files[2]['url'] == f'{github.url}/raw/octo/demo/HEAD/docs/deep/notes.md'
+
+
+def test_parallel_downloads_reuse_connections(github):
+    client = make_client(github, max_workers=2)
+    github.latency = 0.05
+    files = client.list_markdown_files('octo', 'demo') * 4
+
+    downloaded = list(client.download_all(files))
+    client.close()
+
+    assert [content for _, content in downloaded] == [f"# {f['name']}\n" for f in files]
+    assert github.max_active == 2
+    # 1 listing + 12 downloads over at most max_workers keep-alive connections
+    assert len(github.requests) == 13
+    assert len(github.connections) <= 2
+
+
+def test_token_is_sent_with_every_request(github):
+    client = make_client(github, token='secret')
+
+    list(client.download_all(client.list_markdown_files('octo', 'demo')))
+
+    assert all(headers.get('Authorization') == 'token secret'
+               for _, _, headers in github.requests)
+
+
+def test_waits_for_rate_limit_reset_and_retries(github):
+    now = 1000.0
+    calls = []
+
+    def limited(handler):
+        calls.append(handler.path)
+        if len(calls) == 1:
+            return 403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(now + 7)}, b''
+        return 200, {'X-RateLimit-Remaining': '59', 'X-RateLimit-Reset': str(now + 3600)}, \
+            json.dumps(TREE).encode()
+
+    github.routes['/repos/octo/demo/git/trees/HEAD?recursive=1'] = (limited, None, None)
+    slept = []
+    client = make_client(github, sleep=slept.append, clock=lambda: now)
+
+    files = client.list_markdown_files('octo', 'demo')
+
+    assert slept == [7]
+    assert len(files) == 3
+    assert client.rate_limit_remaining == 59
+
+
+def test_long_rate_limit_wait_raises(github):
+    github.routes['/repos/octo/demo/git/trees/HEAD?recursive=1'] = (
+        403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '5000'}, b'')
+    client = make_client(github, max_rate_limit_wait=60, clock=lambda: 1000.0)
+
+    with pytest.raises(RateLimitError):
+        client.list_markdown_files('octo', 'demo')
+
+
+def test_rate_limit_during_downloads_is_reported_by_main(github, tmp_path, monkeypatch, capsys):
+    github.routes['/raw/octo/demo/HEAD/README.md'] = (
+        403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '5000'}, b'')
+    client = make_client(github, max_workers=1, clock=lambda: 1000.0)
+    answers = iter(['2', 'https://github.com/octo/demo', 'all'])
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    monkeypatch.setattr(GitHubClient, 'from_config', classmethod(lambda cls, config: client))
+
+    main([])
+
+    assert f"resets at {time.strftime('%H:%M:%S', time.localtime(5000))}" in capsys.readouterr().out
+
+
+def test_main_checks_every_downloaded_file_with_one_policy(github, tmp_path, monkeypatch):
+    policies = []
+    validate_links = Mini_Project_1.validate_links
+    monkeypatch.setattr(Mini_Project_1, 'validate_links',
+                        lambda links, config, **kwargs: policies.append(kwargs['policy'])
+                        or validate_links(links, config, **kwargs))
+    client = make_client(github, max_workers=1)
+    answers = iter(['2', 'https://github.com/octo/demo', 'all'])
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    monkeypatch.setattr(GitHubClient, 'from_config', classmethod(lambda cls, config: client))
+
+    main([])
+
+    assert len(policies) == 3
+    assert all(policy is policies[0] for policy in policies)
+
+
+@pytest.mark.parametrize('headers, slept', [
+    ({'Retry-After': 'Thu, 01 Jan 1970 00:16:47 GMT'}, [7]),
+    ({'Retry-After': 'soon'}, []),
+    ({'X-RateLimit-Remaining': '0'}, []),
+    ({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': 'never'}, []),
+])
+def test_odd_rate_limit_headers_do_not_crash_downloads(github, headers, slept):
+    answers = iter([(403, headers, b''), (200, {}, b'# README.md\n')])
+    github.routes['/raw/octo/demo/HEAD/README.md'] = (lambda handler: next(answers), None, None)
+    sleeps = []
+    client = make_client(github, sleep=sleeps.append, clock=lambda: 1000.0)
+
+    text = client.download({'name': 'README.md',
+                            'url': f'{github.url}/raw/octo/demo/HEAD/README.md'})
+
+    assert sleeps == slept
+    assert text == ('# README.md\n' if slept else None)
+
+
+def test_root_only_listing(github):
+    github.routes['/repos/octo/demo/git/trees/HEAD'] = (
+        200, {}, json.dumps({'tree': TREE['tree'][:2]}).encode())
+    client = make_client(github)
+
+    files = client.list_markdown_files('octo', 'demo', recursive=False)
+
+    assert [f['name'] for f in files] == ['README.md']
+
+
+def test_unchanged_files_are_served_from_response_cache(github, tmp_path):
+    def conditional(handler):
+        if handler.headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, {'ETag': '"v1"', 'Content-Type': 'text/plain; charset=utf-8'}, \
+            '# Café\n'.encode()
+
+    github.routes['/raw/octo/demo/HEAD/README.md'] = (conditional, None, None)
+    db = str(tmp_path / 'cache.db')
+    file_info = {'name': 'README.md', 'url': f'{github.url}/raw/octo/demo/HEAD/README.md'}
+
+    first = make_client(github, cache=ResponseCache(db))
+    assert first.download(file_info) == '# Café\n'
+    first.close()
+
+    second = make_client(github, cache=ResponseCache(db))
+    response = second.get(file_info['url'])
+    second.close()
+
+    assert response.status_code == 200
+    assert response.from_cache
+    assert response.text == '# Café\n'
+    assert github.requests[-1][2]['If-None-Match'] == '"v1"'
+
+
+def test_changed_file_replaces_cached_copy(github, tmp_path):
+    versions = iter([(b'old', '"v1"'), (b'new', '"v2"')])
+
+    def changing(handler):
+        body, etag = next(versions)
+        return 200, {'ETag': etag}, body
+
+    github.routes['/raw/octo/demo/HEAD/README.md'] = (changing, None, None)
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    client = make_client(github, cache=cache)
+    url = f'{github.url}/raw/octo/demo/HEAD/README.md'
+
+    assert client.get(url).text == 'old'
+    assert client.get(url).text == 'new'
+    assert github.requests[-1][2]['If-None-Match'] == '"v1"'
+    assert cache.get(url)[0] == '"v2"'
+
+
+def test_tree_listing_is_cached_with_its_query(github, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'))
+    github.routes['/repos/octo/demo/git/trees/HEAD?recursive=1'] = (
+        200, {'Last-Modified': 'Mon, 05 Oct 2026 10:00:00 GMT'}, json.dumps(TREE).encode())
+    client = make_client(github, cache=cache)
+
+    client.list_markdown_files('octo', 'demo')
+
+    assert cache.get(f'{github.url}/repos/octo/demo/git/trees/HEAD?recursive=1') is not None
@@ -0,0 +1,73 @@
+import tracemalloc
+
+from html_report import write_report
+from Mini_Project_1 import generate_html_report
+
+
+HEADINGS = {'h1': 1, 'h2': 3, 'h3': 0, 'h4': 0, 'h5': 0, 'h6': 0}
+
+
+def test_report_escapes_document_text(tmp_path):
+    links = [{'url': 'https://example.com/?a=1&b=<x>', 'status': 'Broken (404)'}]
+    images = [{'alt': '<script>alert(1)</script>', 'url': 'img".png'},
+              {'alt': '', 'url': 'plain.png'}]
+    output = tmp_path / 'report.html'
+
+    write_report(str(output), 'a<b>.md', 42, HEADINGS, links, images, links)
+
+    page = output.read_text(encoding='utf-8')
+    assert '<script>alert' not in page
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;' in page
+    assert 'https://example.com/?a=1&amp;b=&lt;x&gt;' in page
+    assert 'img&quot;.png' in page
+    assert '<em>(no alt text)</em>' in page
+    assert 'a&lt;b&gt;.md' in page
+
+
+def test_report_works_offline(tmp_path):
+    output = tmp_path / 'report.html'
+
+    write_report(str(output), 'doc.md', 0, HEADINGS, [], [], [])
+
+    page = output.read_text(encoding='utf-8')
+    assert 'http' not in page
+    assert '<script' not in page
+    assert page.count('<svg') == 2
+    assert 'All links are valid' in page
+
+
+def test_generate_html_report_writes_next_to_source(tmp_path, capsys):
+    source = tmp_path / 'guide.md'
+
+    output = generate_html_report(str(source), 10, HEADINGS, [], [], [])
+
+    assert output == str(tmp_path / 'guide_report.html')
+    assert 'Markdown Analysis Report - guide.md' in (tmp_path / 'guide_report.html').read_text(
+        encoding='utf-8')
+
+
+def test_large_report_streams_in_bounded_memory(tmp_path):
+    links = [{'url': f'https://example.com/{i}', 'status': 'Broken (404)'} for i in range(50000)]
+    output = tmp_path / 'report.html'
+
+    tracemalloc.start()
+    write_report(str(output), 'big.md', 1, HEADINGS, links, [], links)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert output.stat().st_size > 4_000_000
+    assert peak < 1_000_000
+
+
+def test_validated_images_get_status_badges(tmp_path):
+    images = [{'alt': 'big', 'url': 'big.png', 'status': 'OK (local)', 'content_type': 'image/png',
+               'size': 5 << 20, 'oversized': True},
+              {'alt': 'gone', 'url': 'gone.png', 'status': 'Broken (not found)',
+               'content_type': None, 'size': None, 'oversized': False}]
+    output = tmp_path / 'report.html'
+
+    write_report(str(output), 'doc.md', 1, HEADINGS, [], images, [])
+
+    page = output.read_text(encoding='utf-8')
+    assert "badge-warning'>OK (local), image/png, 5,120.0 KB, ⚠️ oversized<" in page
+    assert "badge-danger'>Broken (not found)<" in page
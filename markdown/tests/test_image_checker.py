@@ -0,0 +1,138 @@
+import os
+import struct
+
+import pytest
+
+from image_checker import image_dimensions, resolve_image, validate_images
+from link_policy import CIRCUIT_OPEN_STATUS, CircuitBreaker, ValidationPolicy
+
+
+def png(width, height):
+    return (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' +
+            struct.pack('>II', width, height) + b'\x08\x06\x00\x00\x00' + b'\x00' * 64)
+
+
+def jpeg(width, height):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    sof = b'\xff\xc0' + struct.pack('>HBHH', 17, 8, height, width) + b'\x03' + b'\x00' * 9
+    return b'\xff\xd8' + app0 + sof + b'\xff\xd9'
+
+
+HEADERS = {
+    'a.png': png(640, 480),
+    'b.gif': b'GIF89a' + struct.pack('<HH', 32, 16) + b'\x00' * 32,
+    'c.jpg': jpeg(1920, 1080),
+    'd.bmp': b'BM' + b'\x00' * 16 + struct.pack('<ii', 100, -50) + b'\x00' * 32,
+    'e.webp': b'RIFF\x00\x00\x00\x00WEBPVP8X' + b'\x00' * 8 +
+              (299).to_bytes(3, 'little') + (199).to_bytes(3, 'little') + b'\x00' * 8,
+    'f.svg': b'<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg" '
+             b'width="120px" height="60"></svg>',
+}
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('a.png', (640, 480)), ('b.gif', (32, 16)), ('c.jpg', (1920, 1080)),
+    ('d.bmp', (100, 50)), ('e.webp', (300, 200)), ('f.svg', (120, 60)),
+])
+def test_dimensions_from_headers(tmp_path, name, expected):
+    path = tmp_path / name
+    path.write_bytes(HEADERS[name])
+
+    assert image_dimensions(str(path)) == expected
+
+
+def test_dimensions_of_unknown_format(tmp_path):
+    path = tmp_path / 'notes.txt'
+    path.write_text('not an image')
+
+    assert image_dimensions(str(path)) is None
+
+
+def test_resolve_image():
+    assert resolve_image('img/a.png', 'docs') == os.path.join('docs', 'img', 'a.png')
+    assert resolve_image('../a%20b.png?raw=1', 'docs/guide') == os.path.join('docs', 'a b.png')
+    assert resolve_image('a.png', 'https://raw.example.com/o/r/HEAD/docs/x.md') == \
+        'https://raw.example.com/o/r/HEAD/docs/a.png'
+    assert resolve_image('//cdn.example.com/a.png', '.') == 'https://cdn.example.com/a.png'
+    assert resolve_image('data:image/png;base64,AAAA', '.') is None
+
+
+def test_root_relative_images_resolve_against_the_document_root():
+    assert resolve_image('/img/a.png', 'docs/guide', 'docs') == os.path.join('docs', 'img', 'a.png')
+    assert resolve_image('/img/a.png', 'docs/guide') == os.path.join('docs', 'guide', 'img', 'a.png')
+    assert resolve_image('/img/a.png', 'https://raw.example.com/o/r/HEAD/docs/x.md',
+                         'https://raw.example.com/o/r/HEAD/') == \
+        'https://raw.example.com/o/r/HEAD/img/a.png'
+
+
+def test_local_images_are_checked_relative_to_the_file(tmp_path):
+    (tmp_path / 'img').mkdir()
+    (tmp_path / 'img' / 'a.png').write_bytes(png(10, 20))
+    images = [{'alt': 'a', 'url': 'img/a.png'}, {'alt': 'gone', 'url': 'img/missing.png'}]
+
+    broken = validate_images(images, {}, str(tmp_path))
+
+    assert images[0]['status'] == 'OK (local)'
+    assert images[0]['content_type'] == 'image/png'
+    assert (images[0]['width'], images[0]['height']) == (10, 20)
+    assert images[0]['size'] == len(png(10, 20))
+    assert broken == [images[1]]
+    assert images[1]['status'] == 'Broken (not found)'
+
+
+def test_remote_images_report_type_size_and_oversized(stub_server):
+    stub_server.routes['/big.jpg'] = (200, {'Content-Type': 'image/jpeg'}, b'x' * 3000)
+    stub_server.routes['/small.png'] = (200, {'Content-Type': 'image/png'}, b'x' * 10)
+    stub_server.routes['/page.png'] = (200, {'Content-Type': 'text/html; charset=utf-8'}, b'')
+    stub_server.routes['/gone.png'] = (404, {}, b'')
+    images = [{'alt': name, 'url': f'{stub_server.url}/{name}'}
+              for name in ('big.jpg', 'small.png', 'page.png', 'gone.png', 'small.png')]
+
+    broken = validate_images(images, {'max_image_bytes': 1000, 'max_workers': 4})
+
+    assert [(i['status'], i['content_type'], i['size'], i['oversized']) for i in images] == [
+        ('OK (200)', 'image/jpeg', 3000, True),
+        ('OK (200)', 'image/png', 10, False),
+        ('Broken (not an image: text/html)', 'text/html', 0, False),
+        ('Broken (404)', None, 0, False),
+        ('OK (200)', 'image/png', 10, False),
+    ]
+    assert broken == [images[2], images[3]]
+    # The duplicate is only requested once, and only with HEAD
+    assert sorted(path for _, path, _ in stub_server.requests) == [
+        '/big.jpg', '/gone.png', '/page.png', '/small.png']
+    assert {method for method, _, _ in stub_server.requests} == {'HEAD'}
+
+
+def test_data_uris_are_skipped():
+    images = [{'alt': '', 'url': 'data:image/png;base64,AAAA'}]
+
+    assert validate_images(images, {}) == []
+    assert images[0]['status'].startswith('Skipped')
+
+
+def test_remote_images_are_checked_with_the_validation_policy(stub_server):
+    answers = iter([503, 200])
+    stub_server.routes['/flaky.png'] = (
+        lambda handler: (next(answers), {'Content-Type': 'image/png'}, b'x' * 10), {}, b'')
+    stub_server.routes['/no-head.png'] = (
+        lambda handler: (405 if handler.command == 'HEAD' else 200,
+                         {'Content-Type': 'image/png'}, b'x' * 20), {}, b'')
+    images = [{'alt': name, 'url': f'{stub_server.url}/{name}'}
+              for name in ('flaky.png', 'no-head.png')]
+    policy = ValidationPolicy(max_retries=1, sleep=lambda seconds: None)
+
+    assert validate_images(images, {}, policy=policy) == []
+    assert [(i['status'], i['content_type'], i['size']) for i in images] == [
+        ('OK (200)', 'image/png', 10), ('OK (200)', 'image/png', 20)]
+
+
+def test_dead_image_hosts_trip_the_circuit_breaker():
+    images = [{'alt': str(i), 'url': f'http://127.0.0.1:9/{i}.png'} for i in range(3)]
+    policy = ValidationPolicy(max_retries=0, breaker=CircuitBreaker(threshold=1, reset_after=60))
+
+    broken = validate_images(images, {'max_workers': 1, 'max_per_host': 1}, policy=policy)
+
+    assert broken == images[:1]
+    assert images[0]['status'] == 'Broken (ConnectionError)'
+    assert [i['status'] for i in images[1:]] == [CIRCUIT_OPEN_STATUS] * 2
@@ -0,0 +1,72 @@
+import pytest
+
+from link_cache import LinkCache
+from link_checker import validate_links
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    link_cache = LinkCache(db=":memory:", ok_ttl=100, broken_ttl=10,
+                           max_entries=3, clock=clock)
+    yield link_cache
+    link_cache.close()
+
+
+def test_separate_ttls_for_ok_and_broken(cache, clock):
+    cache.put_many({'https://a.example': 'OK (200)',
+                    'https://b.example': 'Broken (404)'})
+
+    clock.now += 50
+    assert cache.get('https://a.example') == 'OK (200)'
+    assert cache.get('https://b.example') is None
+
+    clock.now += 60
+    assert cache.get('https://a.example') is None
+
+
+def test_evicts_oldest_beyond_max_entries(cache, clock):
+    for i in range(5):
+        clock.now += 1
+        cache.put(f'https://{i}.example', 'OK (200)')
+
+    assert len(cache) == 3
+    assert cache.get_many(f'https://{i}.example' for i in range(5)) == {
+        f'https://{i}.example': 'OK (200)' for i in (2, 3, 4)
+    }
+
+
+def test_persists_between_connections(tmp_path):
+    db = tmp_path / 'links.db'
+    first = LinkCache(db=str(db))
+    first.put('https://a.example', 'OK (301)')
+    first.close()
+
+    second = LinkCache(db=str(db))
+    assert second.get('https://a.example') == 'OK (301)'
+    second.close()
+
+
+def test_validate_links_only_hits_network_for_misses(stub_server, tmp_path):
+    config = {'link_cache_file': str(tmp_path / 'links.db'), 'max_workers': 4}
+    urls = [f'{stub_server.url}/{i}' for i in range(3)]
+
+    validate_links([{'text': u, 'url': u, 'type': 'standard'} for u in urls[:2]], config)
+    links = [{'text': u, 'url': u, 'type': 'standard'} for u in urls]
+    broken = validate_links(links, config)
+
+    assert broken == []
+    assert [link['status'] for link in links] == ['OK (200)'] * 3
+    assert sorted(path for _, path, _ in stub_server.requests) == ['/0', '/1', '/2']
@@ -0,0 +1,87 @@
+import time
+
+from link_checker import normalize_url, validate_links, SKIPPED_STATUS
+
+
+def make_links(urls):
+    return [{'text': url, 'url': url, 'type': 'standard'} for url in urls]
+
+
+def test_statuses_and_broken_links(stub_server):
+    stub_server.routes['/missing'] = (404, {}, b'')
+    links = make_links([
+        f'{stub_server.url}/ok',
+        f'{stub_server.url}/missing',
+        '#anchor',
+        './docs/README.md',
+    ])
+
+    broken = validate_links(links, {'timeout': 5, 'max_workers': 4})
+
+    assert [link['status'] for link in links] == [
+        'OK (200)', 'Broken (404)', SKIPPED_STATUS, SKIPPED_STATUS,
+    ]
+    assert broken == [links[1]]
+
+
+def test_connection_error_reported_as_broken():
+    links = make_links(['http://127.0.0.1:9/unreachable'])
+
+    broken = validate_links(links, {'timeout': 1})
+
+    assert broken == links
+    assert links[0]['status'] == 'Broken (ConnectionError)'
+
+
+def test_broken_links_keep_document_order(stub_server):
+    for i in range(0, 20, 2):
+        stub_server.routes[f'/{i}'] = (500, {}, b'')
+    links = make_links([f'{stub_server.url}/{i}' for i in range(20)])
+
+    broken = validate_links(links, {'max_workers': 8, 'max_per_host': 8})
+
+    assert [link['url'] for link in broken] == [f'{stub_server.url}/{i}' for i in range(0, 20, 2)]
+
+
+def test_concurrency_respects_per_host_limit(stub_server):
+    stub_server.latency = 0.1
+    links = make_links([f'{stub_server.url}/{i}' for i in range(12)])
+
+    start = time.perf_counter()
+    validate_links(links, {'max_workers': 8, 'max_per_host': 3})
+    elapsed = time.perf_counter() - start
+
+    assert stub_server.max_active <= 3
+    assert elapsed < 12 * 0.1
+
+
+def test_normalize_url():
+    assert normalize_url('HTTPS://Example.COM:443') == 'https://example.com/'
+    assert normalize_url('http://example.com:80/a?b=1#frag') == 'http://example.com/a?b=1'
+    assert normalize_url('http://example.com:8080/A') == 'http://example.com:8080/A'
+
+
+def test_duplicate_urls_are_checked_once(stub_server):
+    stub_server.routes['/missing'] = (404, {}, b'')
+    links = make_links([
+        f'{stub_server.url}/page',
+        f'{stub_server.url}/page#intro',
+        f'{stub_server.url}/page#usage',
+        f'{stub_server.url}/missing',
+        f'{stub_server.url}/missing',
+    ])
+
+    broken = validate_links(links, {'max_workers': 4})
+
+    assert sorted(path for _, path, _ in stub_server.requests) == ['/missing', '/page']
+    assert [link['status'] for link in links] == ['OK (200)'] * 3 + ['Broken (404)'] * 2
+    assert broken == links[3:]
+
+
+def test_requests_to_a_host_share_keep_alive_connections(stub_server):
+    links = make_links([f'{stub_server.url}/{i}' for i in range(20)])
+
+    validate_links(links, {'max_workers': 1})
+
+    assert len(stub_server.requests) == 20
+    assert len(stub_server.connections) == 1
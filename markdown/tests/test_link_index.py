@@ -0,0 +1,160 @@
+import io
+import json
+
+import pytest
+
+from extractors import slugify
+from link_checker import SKIPPED_STATUS, validate_links
+from link_index import LOCAL_OK, MISSING_ANCHOR, MISSING_FILE, MISSING_PAGE
+from link_index import LinkIndex, search_roots
+from Mini_Project_1 import analyze_batch
+from output import RecordWriter
+from tokenizer import analyze_content, analyze_file
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / 'guide').mkdir()
+    (tmp_path / 'guide' / 'getting-started.md').write_text(
+        '# Getting Started\n\n## Install it!\n\nBack to [top](#getting-started).\n')
+    (tmp_path / 'guide' / 'logo.png').write_bytes(b'\x89PNG')
+    (tmp_path / 'README.md').write_text('# Project\n\n## Usage\n\n## Usage\n')
+    return tmp_path
+
+
+def link(url, kind='standard'):
+    return {'text': url, 'url': url, 'type': kind}
+
+
+def test_slugify_matches_github_anchors():
+    assert slugify('Install it!') == 'install-it'
+    assert slugify('  API `v2` Reference ') == 'api-v2-reference'
+    assert analyze_content('# Intro\n## Intro\n### Hello, World #\n', ['anchors'])['anchors'] == \
+        ['intro', 'intro-1', 'hello-world']
+
+
+@pytest.mark.parametrize('url, status', [
+    ('guide/getting-started.md', LOCAL_OK),
+    ('./guide/', LOCAL_OK),
+    ('guide/logo.png', LOCAL_OK),
+    ('guide/missing.md', MISSING_FILE),
+    ('guide/getting-started.md#install-it', LOCAL_OK),
+    ('guide/getting-started.md#Install-It', LOCAL_OK),
+    ('guide/getting-started.md#nope', MISSING_ANCHOR),
+    ('#usage-1', LOCAL_OK),
+    ('#usage-2', MISSING_ANCHOR),
+    ('/guide/getting-started.md', LOCAL_OK),
+    ('https://example.com/x.md', SKIPPED_STATUS),
+    ('mailto:someone@example.com', SKIPPED_STATUS),
+])
+@pytest.mark.parametrize('make_index', [LinkIndex.build, LinkIndex.on_demand])
+def test_resolve_relative_and_anchor_links(tree, url, status, make_index):
+    index = make_index([str(tree)])
+
+    assert index.resolve(link(url), str(tree / 'README.md')) == status
+
+
+@pytest.mark.parametrize('url, status', [
+    ('Getting Started', LOCAL_OK),
+    ('getting_started|the guide', LOCAL_OK),
+    ('Getting Started#Install it!', LOCAL_OK),
+    ('Getting Started#Uninstall', MISSING_ANCHOR),
+    ('#Usage', LOCAL_OK),
+    ('Nowhere', MISSING_PAGE),
+])
+@pytest.mark.parametrize('make_index', [LinkIndex.build, LinkIndex.on_demand])
+def test_resolve_wiki_links(tree, url, status, make_index):
+    index = make_index([str(tree)])
+
+    assert index.resolve(link(url, 'wiki'), str(tree / 'README.md')) == status
+
+
+def test_analyzed_anchors_are_used_without_rereading(tree, monkeypatch):
+    readme = str(tree / 'README.md')
+    result = dict(analyze_file(readme, extractors=['anchors']), file=readme)
+    index = LinkIndex.build([str(tree)], [result])
+    monkeypatch.setattr('link_index.analyze_file', pytest.fail)
+
+    assert index.resolve(link('#usage'), readme) == LOCAL_OK
+
+
+def test_on_demand_index_walks_the_tree_only_for_wiki_links(tree, monkeypatch):
+    readme = str(tree / 'README.md')
+    result = dict(analyze_file(readme, extractors=['anchors']), file=readme)
+    index = LinkIndex.on_demand([str(tree)], [result])
+    monkeypatch.setattr('link_index.analyze_file', pytest.fail)
+    monkeypatch.setattr('os.walk', pytest.fail)
+
+    assert index.resolve(link('guide/logo.png'), readme) == LOCAL_OK
+    assert index.resolve(link('guide/gone.md'), readme) == MISSING_FILE
+    assert index.resolve(link('#usage'), readme) == LOCAL_OK
+
+    monkeypatch.undo()
+    assert index.resolve(link('Getting Started', 'wiki'), readme) == LOCAL_OK
+
+
+def test_validate_links_resolves_local_links_with_an_index(tree):
+    links = [link('guide/getting-started.md'), link('guide/gone.md'), link('#usage')]
+    index = LinkIndex.build([str(tree)])
+
+    broken = validate_links(links, {'link_cache_file': None}, index=index,
+                            source=str(tree / 'README.md'))
+
+    assert [l['status'] for l in links] == [LOCAL_OK, MISSING_FILE, LOCAL_OK]
+    assert broken == [links[1]]
+
+
+def test_search_roots_for_globs(tree):
+    assert search_roots([str(tree / 'guide' / '*.md'), str(tree / 'absent')]) == \
+        [str(tree / 'guide')]
+
+
+def test_batch_resolves_links_across_files(tree, capsys):
+    (tree / 'index.md').write_text(
+        '# Index\n\n[start](guide/getting-started.md#install-it) '
+        '[[Getting Started#Nope]] [gone](guide/gone.md)\n')
+
+    results = analyze_batch([str(tree)], {'link_cache_file': None})
+
+    statuses = {l['url']: l['status'] for r in results for l in r['links']}
+    assert statuses['guide/getting-started.md#install-it'] == LOCAL_OK
+    assert statuses['Getting Started#Nope'] == MISSING_ANCHOR
+    assert statuses['guide/gone.md'] == MISSING_FILE
+    assert statuses['#getting-started'] == LOCAL_OK
+
+
+@pytest.mark.parametrize('output', ['text', 'ndjson'])
+def test_batch_resolves_root_relative_images_like_links(tree, output):
+    (tree / 'guide' / 'usage.md').write_text('# Usage\n\n![logo](/guide/logo.png)\n')
+    config = {'link_cache_file': None, 'validate_images': True}
+
+    if output == 'text':
+        results = analyze_batch([str(tree)], config, workers=1)
+    else:
+        stream = io.StringIO()
+        analyze_batch([str(tree)], config, workers=1, writer=RecordWriter(stream, 'ndjson'))
+        results = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    image, = [i for r in results for i in r['images']]
+    assert image['status'] == 'OK (local)'
+    assert image['size'] == len(b'\x89PNG')
+
+
+@pytest.mark.parametrize('output', ['text', 'ndjson'])
+def test_unchanged_files_are_re_resolved_when_a_target_disappears(tree, output):
+    (tree / 'index.md').write_text('# Index\n\n[start](guide/getting-started.md#install-it)\n')
+    config = {'link_cache_file': None, 'manifest_file': str(tree / 'manifest.db')}
+
+    def statuses():
+        if output == 'text':
+            results = analyze_batch([str(tree)], config, workers=1)
+        else:
+            stream = io.StringIO()
+            analyze_batch([str(tree)], config, workers=1,
+                          writer=RecordWriter(stream, 'ndjson'))
+            results = [json.loads(line) for line in stream.getvalue().splitlines()]
+        return {l['url']: l['status'] for r in results for l in r['links']}
+
+    assert statuses()['guide/getting-started.md#install-it'] == LOCAL_OK
+    (tree / 'guide' / 'getting-started.md').unlink()
+    assert statuses()['guide/getting-started.md#install-it'] == MISSING_FILE
@@ -0,0 +1,102 @@
+import time
+
+from link_checker import validate_links
+from link_policy import CIRCUIT_OPEN_STATUS, CircuitBreaker, ValidationPolicy
+
+
+def policy(**kwargs):
+    delays = []
+    kwargs.setdefault('rng', lambda: 0.5)
+    return ValidationPolicy(sleep=delays.append, **kwargs), delays
+
+
+def test_head_rejected_falls_back_to_streamed_get(stub_server):
+    stub_server.routes['/no-head'] = (
+        lambda handler: (405 if handler.command == 'HEAD' else 200, {}, b'x' * 100000), {}, b'')
+    check, _ = policy()
+
+    assert check.check(f'{stub_server.url}/no-head') == 'OK (200)'
+    assert [method for method, _, _ in stub_server.requests] == ['HEAD', 'GET']
+
+
+def test_transient_errors_are_retried_with_jittered_backoff(stub_server):
+    answers = iter([503, 502, 200])
+    stub_server.routes['/flaky'] = (lambda handler: (next(answers), {}, b''), {}, b'')
+    check, delays = policy(max_retries=2, backoff=0.5)
+
+    assert check.check(f'{stub_server.url}/flaky') == 'OK (200)'
+    assert delays == [0.25, 0.5]
+
+
+def test_retries_are_bounded_and_honor_retry_after(stub_server):
+    stub_server.routes['/busy'] = (429, {'Retry-After': '3'}, b'')
+    check, delays = policy(max_retries=2, max_backoff=8)
+
+    assert check.check(f'{stub_server.url}/busy') == 'Broken (429)'
+    assert len(stub_server.requests) == 3
+    assert delays == [3, 3]
+
+
+def test_client_errors_are_not_retried(stub_server):
+    stub_server.routes['/missing'] = (404, {}, b'')
+    check, delays = policy()
+
+    assert check.check(f'{stub_server.url}/missing') == 'Broken (404)'
+    assert len(stub_server.requests) == 1
+    assert delays == []
+
+
+def test_redirects_are_capped_by_max_redirects(stub_server):
+    for i in range(3):
+        stub_server.routes[f'/r{i}'] = (302, {'Location': f'/r{i + 1}'}, b'')
+
+    assert policy(max_redirects=2)[0].check(f'{stub_server.url}/r0') == \
+        'Broken (TooManyRedirects)'
+    assert policy(max_redirects=5)[0].check(f'{stub_server.url}/r0') == 'OK (200)'
+
+
+def test_circuit_breaker_fails_a_dead_host_fast():
+    links = [{'text': '', 'url': f'http://127.0.0.1:9/{i}', 'type': 'standard'}
+             for i in range(5)]
+    check, delays = policy(max_retries=2, breaker=CircuitBreaker(threshold=3))
+
+    broken = validate_links(links, {'max_workers': 1, 'link_cache_file': None}, policy=check)
+
+    # Three URLs fail after their retries; the rest are skipped, not broken
+    assert broken == links[:3]
+    assert [link['status'] for link in links[:3]] == ['Broken (ConnectionError)'] * 3
+    assert [link['status'] for link in links[3:]] == [CIRCUIT_OPEN_STATUS] * 2
+    assert len(delays) == 6
+
+
+def test_one_slow_url_does_not_open_its_hosts_circuit(stub_server):
+    def slow(handler):
+        time.sleep(0.3)
+        return 200, {}, b''
+
+    stub_server.routes['/slow'] = (slow, {}, b'')
+    links = [{'text': '', 'url': f'{stub_server.url}/{path}', 'type': 'standard'}
+             for path in ('slow', 'ok0', 'ok1', 'ok2')]
+    check, _ = policy(timeout=0.1, max_retries=2, breaker=CircuitBreaker(threshold=3))
+
+    broken = validate_links(links, {'max_workers': 1, 'link_cache_file': None}, policy=check)
+
+    assert broken == links[:1]
+    assert links[0]['status'] == 'Broken (Timeout)'
+    assert [link['status'] for link in links[1:]] == ['OK (200)'] * 3
+
+
+def test_circuit_breaker_half_opens_after_reset():
+    now = [0]
+    breaker = CircuitBreaker(threshold=2, reset_after=10, clock=lambda: now[0])
+    breaker.record_failure('a')
+    assert breaker.allow('a')
+    breaker.record_failure('a')
+    assert not breaker.allow('a')
+    assert breaker.allow('b')
+
+    now[0] = 11
+    assert breaker.allow('a')
+    assert not breaker.allow('a')
+    breaker.record_success('a')
+    assert breaker.allow('a')
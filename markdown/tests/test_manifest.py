@@ -0,0 +1,134 @@
+import os
+
+import batch
+from batch import analyze_incremental
+from link_policy import CIRCUIT_OPEN_STATUS
+from manifest import Manifest
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def analyzed(monkeypatch):
+    """Record which files analyze_files actually parses."""
+    parsed = []
+    original = batch.iter_analyze_files
+
+    def spy(files, workers=None, extractors=()):
+        parsed.extend(files)
+        return original(files, 1, extractors)
+
+    monkeypatch.setattr(batch, 'iter_analyze_files', spy)
+    return parsed
+
+
+def run(manifest, files):
+    results, stale = analyze_incremental(files, manifest, workers=1)
+    for result in stale:
+        for link in result['links']:
+            link.setdefault('status', 'OK (200)')
+        manifest.update(result)
+    return results, stale
+
+
+def test_unchanged_files_are_not_reparsed(tmp_path, monkeypatch):
+    parsed = analyzed(monkeypatch)
+    manifest = Manifest(str(tmp_path / 'manifest.db'), clock=FakeClock())
+    a = write(tmp_path / 'a.md', '# A\n\n[x](https://example.com/a)\n')
+    b = write(tmp_path / 'b.md', '# B\n')
+
+    first, _ = run(manifest, [a, b])
+    parsed.clear()
+    second, stale = run(manifest, [a, b])
+
+    assert parsed == []
+    assert stale == []
+    assert second == first
+    assert second[0]['links'][0]['status'] == 'OK (200)'
+
+
+def test_changed_file_is_reparsed(tmp_path, monkeypatch):
+    parsed = analyzed(monkeypatch)
+    manifest = Manifest(str(tmp_path / 'manifest.db'), clock=FakeClock())
+    a = write(tmp_path / 'a.md', '# A\n')
+    b = write(tmp_path / 'b.md', '# B\n')
+    run(manifest, [a, b])
+    parsed.clear()
+
+    write(tmp_path / 'b.md', '# B\n\n## More words\n')
+    results, stale = run(manifest, [a, b])
+
+    assert parsed == [b]
+    assert [r['file'] for r in stale] == [b]
+    assert results[1]['headings']['h2'] == 1
+
+
+def test_touched_file_with_same_content_is_reused(tmp_path, monkeypatch):
+    parsed = analyzed(monkeypatch)
+    manifest = Manifest(str(tmp_path / 'manifest.db'), clock=FakeClock())
+    a = write(tmp_path / 'a.md', '# A\n', mtime_ns=10 ** 18)
+    run(manifest, [a])
+    parsed.clear()
+
+    write(tmp_path / 'a.md', '# A\n', mtime_ns=2 * 10 ** 18)
+    run(manifest, [a])
+
+    assert parsed == []
+
+
+def test_expired_statuses_are_revalidated_without_reparsing(tmp_path, monkeypatch):
+    parsed = analyzed(monkeypatch)
+    clock = FakeClock()
+    manifest = Manifest(str(tmp_path / 'manifest.db'), ok_ttl=100, clock=clock)
+    a = write(tmp_path / 'a.md', '[x](https://example.com/a)\n')
+    run(manifest, [a])
+    parsed.clear()
+
+    clock.now += 101
+    results, stale = analyze_incremental([a], manifest, workers=1)
+
+    assert parsed == []
+    assert stale == results
+
+
+def test_urls_skipped_by_an_open_circuit_are_checked_on_the_next_run(tmp_path, monkeypatch):
+    parsed = analyzed(monkeypatch)
+    manifest = Manifest(str(tmp_path / 'manifest.db'), clock=FakeClock())
+    a = write(tmp_path / 'a.md', '[x](https://example.com/a)\n')
+    results, _ = analyze_incremental([a], manifest, workers=1)
+    results[0]['links'][0]['status'] = CIRCUIT_OPEN_STATUS
+    manifest.update(results[0])
+    parsed.clear()
+
+    results, stale = analyze_incremental([a], manifest, workers=1)
+
+    assert parsed == []
+    assert stale == results
+
+
+def test_manifest_persists_between_runs(tmp_path):
+    db = str(tmp_path / 'manifest.db')
+    a = write(tmp_path / 'a.md', '# A\n')
+    manifest = Manifest(db, clock=FakeClock())
+    run(manifest, [a])
+    manifest.close()
+
+    reopened = Manifest(db, clock=FakeClock())
+    found = reopened.lookup(a)
+
+    assert len(reopened) == 1
+    assert found is not None
+    assert found[0]['headings']['h1'] == 1
+    assert found[1] is True
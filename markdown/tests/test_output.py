@@ -0,0 +1,107 @@
+import io
+import json
+
+import pytest
+
+import batch
+from Mini_Project_1 import analyze_batch, main
+from output import RecordWriter
+
+
+@pytest.fixture
+def docs(tmp_path):
+    (tmp_path / 'a.md').write_text('# A\n\nSee [docs](#usage) and ![logo](logo.png).\n')
+    (tmp_path / 'b.md').write_text('## B\n\nPlain words here.\n')
+    (tmp_path / 'empty.md').write_text('')
+    return tmp_path
+
+
+def test_ndjson_records():
+    stream = io.StringIO()
+    writer = RecordWriter(stream, 'ndjson')
+
+    writer.write({'file': 'a.md', 'word_count': 2})
+    writer.write({'file': 'é.md', 'error': 'empty file'})
+    writer.close()
+
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {'file': 'a.md', 'word_count': 2},
+        {'file': 'é.md', 'error': 'empty file'},
+    ]
+
+
+@pytest.mark.parametrize('records', [[], [{'n': 1}], [{'n': 1}, {'n': 2}]])
+def test_json_array(records):
+    stream = io.StringIO()
+    writer = RecordWriter(stream, 'json')
+    for record in records:
+        writer.write(record)
+    writer.close()
+
+    assert json.loads(stream.getvalue()) == records
+
+
+def test_records_are_written_as_each_file_completes(docs, monkeypatch):
+    analyzed = []
+    original = batch.analyze_path
+
+    def spy(path, extractors=()):
+        analyzed.append(path)
+        return original(path, extractors)
+
+    class Recorder(RecordWriter):
+        def write(self, result):
+            # Only the files up to this one have been parsed so far
+            assert len(analyzed) == self.count + 1
+            super().write(result)
+
+    monkeypatch.setattr(batch, 'analyze_path', spy)
+    writer = Recorder(io.StringIO())
+
+    analyze_batch([str(docs)], {}, workers=1, writer=writer)
+
+    assert writer.count == 3
+
+
+def test_main_streams_ndjson_to_stdout(docs, monkeypatch, capsys):
+    monkeypatch.chdir(docs)
+
+    main(['--format', 'ndjson', '--workers', '1', str(docs)])
+
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [r['file'].rsplit('/', 1)[-1] for r in records] == ['a.md', 'b.md', 'empty.md']
+    assert records[0]['headings']['h1'] == 1
+    assert records[0]['links'][0]['status'] == 'Broken (missing anchor)'
+    # Anchors parsed only for the link index are not part of the record
+    assert set(records[0]) == {'file', 'word_count', 'headings', 'links', 'images'}
+    assert records[0]['images'] == [{'alt': 'logo', 'url': 'logo.png'}]
+    assert records[2] == {'file': str(docs / 'empty.md'), 'error': 'empty file'}
+    assert 'Files analyzed: 2 (1 failed)' in err
+
+
+def test_records_keep_configured_extractors_and_drop_internal_fields(docs):
+    stream = io.StringIO()
+    config = {'extractors': ['anchors'], 'validate_images': True, 'link_cache_file': None}
+
+    analyze_batch([str(docs / 'a.md')], config, workers=1, writer=RecordWriter(stream, 'ndjson'))
+
+    record, = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert record['anchors'] == ['a']
+    assert record['images'] == [{'alt': 'logo', 'url': 'logo.png', 'status': 'Broken (not found)',
+                                 'content_type': None, 'size': None, 'oversized': False}]
+
+
+def test_main_writes_json_file(docs, monkeypatch, capsys):
+    monkeypatch.chdir(docs)
+    output = docs / 'out.json'
+
+    main(['--format', 'json', '--output', str(output), '--workers', '1', str(docs)])
+
+    assert len(json.loads(output.read_text(encoding='utf-8'))) == 3
+    assert capsys.readouterr().out == ''
+
+
+def test_structured_format_needs_paths():
+    with pytest.raises(SystemExit):
+        main(['--format', 'ndjson'])
@@ -0,0 +1,126 @@
+import os
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from Mini_Project_1 import count_words, count_headings, extract_links, extract_images
+from tokenizer import MarkdownTokenizer, analyze_content, analyze_file
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'test.md')
+
+
+def legacy_analysis(content):
+    return {
+        'word_count': count_words(content),
+        'headings': count_headings(content),
+        'links': extract_links(content),
+        'images': extract_images(content),
+    }
+
+
+def test_matches_regex_functions_on_sample():
+    with open(SAMPLE, encoding='utf-8') as f:
+        content = f.read()
+
+    assert analyze_content(content) == legacy_analysis(content)
+
+
+@pytest.mark.parametrize('content', [
+    '',
+    '# Title\n\nSome *text* with `inline code` and a [link](https://a.example).',
+    '```python\n# not counted as words\nprint("x")\n```\nafter',
+    'unclosed ``` fence keeps its text',
+    'an ` unclosed backtick',
+    '``x` adjacent backticks',
+    '#\n\n   \nheading text on a later line',
+    '####### seven hashes\n#nospace',
+    '[text](url) [[Wiki Page]] [ref text][id] ![alt](img.png) ![](empty.png)',
+    '[link text\nover two lines](https://a.example)',
+    'café　naïve\xa0words',
+])
+def test_matches_regex_functions(content):
+    assert analyze_content(content) == legacy_analysis(content)
+
+
+def test_random_documents_fed_in_random_pieces():
+    pieces = ['[', ']', '(', ')', '!', '`', '``', '```', '#', '## ', '\n', ' ',
+              'word', '_', '[[', ']]', '[t](u)', '![a](b)', '[x][y]', '\t', 'é']
+    rnd = random.Random(1234)
+    for _ in range(2000):
+        content = ''.join(rnd.choice(pieces) for _ in range(rnd.randint(0, 30)))
+        tokenizer = MarkdownTokenizer()
+        pos = 0
+        while pos < len(content):
+            step = rnd.randint(1, 6)
+            tokenizer.feed(content[pos:pos + step])
+            pos += step
+
+        assert tokenizer.close() == legacy_analysis(content), repr(content)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 16])
+def test_analyze_file_matches_in_memory_path(tmp_path, chunk_size):
+    with open(SAMPLE, encoding='utf-8') as f:
+        content = f.read()
+    path = tmp_path / 'doc.md'
+    path.write_text(content, encoding='utf-8')
+
+    assert analyze_file(str(path), chunk_size=chunk_size) == analyze_content(content)
+
+
+def test_analyze_file_carries_constructs_across_chunks(tmp_path):
+    content = ('intro\n```\n[not](words)\n```\n'
+               '[a link split](https://example.com/over/the/boundary) after\n#\n\n## late heading\n')
+    path = tmp_path / 'doc.md'
+    path.write_text(content, encoding='utf-8')
+
+    for chunk_size in range(1, len(content) + 1):
+        assert analyze_file(str(path), chunk_size=chunk_size) == analyze_content(content)
+
+
+def test_analyze_file_returns_none_for_blank_file(tmp_path):
+    path = tmp_path / 'blank.md'
+    path.write_text('  \n\n\t\n', encoding='utf-8')
+
+    assert analyze_file(str(path)) is None
+
+
+def test_analyze_file_memory_does_not_grow_with_file_size(tmp_path):
+    block = ('## Section\n\nPlain prose with *emphasis* and `code` in it. ' * 20 +
+             '\n\n```python\nprint("hello")\n```\n\n')
+    peaks = []
+    for repeats in (200, 2000):
+        path = tmp_path / f'doc{repeats}.md'
+        path.write_text(block * repeats, encoding='utf-8')
+
+        tracemalloc.start()
+        analyze_file(str(path), chunk_size=1 << 14)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    assert os.path.getsize(tmp_path / 'doc2000.md') > 10 * peaks[1]
+    assert peaks[1] < 2 * peaks[0]
+
+
+def test_unclosed_bracket_does_not_buffer_the_rest_of_the_file(tmp_path):
+    # '[x](' is never closed: no ')' follows it anywhere
+    block = '## Part\n\nPlain prose with *emphasis* and `code` in it. ' * 10 + '\n\n'
+    peaks = []
+    for repeats in (500, 5000):
+        content = 'intro [x](' + block * repeats + '[[Wiki Page]] and [ref][id]\n'
+        path = tmp_path / f'doc{repeats}.md'
+        path.write_text(content, encoding='utf-8')
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = analyze_file(str(path), chunk_size=1 << 14)
+        elapsed = time.perf_counter() - start
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        assert result == legacy_analysis(content)
+    assert os.path.getsize(tmp_path / 'doc5000.md') > 10 * peaks[1]
+    assert elapsed < 5
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import pytest
+
+from link_index import MISSING_FILE
+from Mini_Project_1 import watch_batch
+from watcher import InotifyWatcher, PollingWatcher
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def watchers():
+    params = [pytest.param(lambda roots: PollingWatcher(roots, interval=0.05), id='polling')]
+    try:
+        InotifyWatcher([]).close()
+        params.append(pytest.param(InotifyWatcher, id='inotify'))
+    except OSError:
+        pass
+    return params
+
+
+@pytest.mark.parametrize('make_watcher', watchers())
+def test_watcher_reports_created_modified_and_removed_files(tmp_path, make_watcher):
+    (tmp_path / 'a.md').write_text('# A\n')
+    (tmp_path / 'b.md').write_text('# B\n')
+    with make_watcher([str(tmp_path)]) as watcher:
+        assert watcher.wait(0.1) == set()
+
+        time.sleep(0.01)
+        (tmp_path / 'a.md').write_text('# A changed\n')
+        (tmp_path / 'b.md').unlink()
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'sub' / 'c.md').write_text('# C\n')
+
+        changed = set()
+        assert wait_for(lambda: changed.update(watcher.wait(0.1)) or
+                        {str(tmp_path / 'a.md'), str(tmp_path / 'b.md'),
+                         str(tmp_path / 'sub' / 'c.md')} <= changed)
+
+
+@pytest.mark.parametrize('make_watcher', watchers())
+def test_watch_reanalyzes_only_changed_files(tmp_path, monkeypatch, make_watcher):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'a.md').write_text('# A\n\nSee [b](b.md).\n')
+    (docs / 'b.md').write_text('# B\n')
+    (docs / 'c.md').write_text('# C\n')
+    report = tmp_path / 'report.html'
+
+    parsed = []
+    import batch
+    real = batch.analyze_path
+    monkeypatch.setattr(batch, 'analyze_path',
+                        lambda path, extractors=(): parsed.append(path) or real(path, extractors))
+
+    stop = threading.Event()
+    results = []
+    watcher = make_watcher([str(docs)])
+    thread = threading.Thread(target=lambda: results.extend(watch_batch(
+        [str(docs)], {'link_cache_file': None}, workers=1, watcher=watcher, stop=stop,
+        report_file=str(report))))
+    thread.start()
+    try:
+        assert wait_for(report.exists)
+        assert sorted(os.path.basename(p) for p in parsed) == ['a.md', 'b.md', 'c.md']
+        parsed.clear()
+
+        time.sleep(0.01)
+        (docs / 'b.md').unlink()
+        (docs / 'c.md').write_text('# C\n\n## Words words words\n')
+        assert wait_for(lambda: '2 watched file(s)' in report.read_text())
+    finally:
+        stop.set()
+        thread.join()
+        watcher.close()
+
+    assert [os.path.basename(p) for p in parsed] == ['c.md']
+    assert [os.path.basename(r['file']) for r in results] == ['a.md', 'c.md']
+    # a.md was not re-parsed, but its link to the deleted file is now broken
+    assert results[0]['links'][0]['status'] == MISSING_FILE
+    assert 'http-equiv="refresh"' in report.read_text()
+
+
+def test_watch_keeps_link_statuses_warm(tmp_path, stub_server):
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'a.md').write_text(f'[x]({stub_server.url}/x)\n')
+    watcher = PollingWatcher([str(docs)], interval=0.05)
+    stop = threading.Event()
+    thread = threading.Thread(target=watch_batch, args=([str(docs)], {'link_cache_file': None}),
+                              kwargs=dict(workers=1, watcher=watcher, stop=stop,
+                                          report_file=str(tmp_path / 'r.html')))
+    thread.start()
+    try:
+        assert wait_for(lambda: len(stub_server.requests) == 1)
+        time.sleep(0.01)
+        (docs / 'a.md').write_text(f'# Edited\n\n[x]({stub_server.url}/x) [y]({stub_server.url}/y)\n')
+        assert wait_for(lambda: len(stub_server.requests) == 2)
+        time.sleep(0.2)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert [path for _, path, _ in stub_server.requests] == ['/x', '/y']
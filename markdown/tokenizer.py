@@ -0,0 +1,365 @@
+"""Single-pass markdown tokenizer.
+
+MarkdownTokenizer produces the same word count, heading counts, links and
+images as count_words, count_headings, extract_links and extract_images in
+Mini_Project_1, including their quirks (e.g. links inside code blocks are
+still reported). Headings, links, wiki links, reference links and images
+are all found by one combined pattern (patterns.TOKENS) instead of one
+scan each, and words are counted on the same buffered text without the
+intermediate copies count_words makes. Text can be fed in pieces;
+constructs that are still open at the end of a piece, such as a code fence
+or a link whose closing bracket has not arrived yet, are carried over to
+the next one.
+"""
+
+import re
+
+from extractors import MAX_LOOKAHEAD, create_extractors, scanners_for
+from patterns import INLINE_CODE as _INLINE_CODE, TOKENS as _TOKENS
+
+# count_words replaces these with spaces before splitting
+_SYNTAX = str.maketrans('#*_[]()!', '        ')
+# For ASCII-whitespace-only text, words are counted on the UTF-8 bytes:
+# separators become b' ', everything else b'x', and each b' x' starts a word
+_SEPARATORS = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f#*_[]()!'
+_WORD_MAP = bytes(0x20 if byte in _SEPARATORS else 0x78 for byte in range(256))
+_UNICODE_SPACE = re.compile('[\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]')
+_GAPS = frozenset('#*_[]()!')
+
+_HEADING_KEYS = (None, 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+# (opener, mid, end_char) of links, wiki links, reference links and images
+# for _undecided_from
+_LINK_SHAPES = (('[', '(', ')'), ('[[', ']', None), ('[', '[', ']'), ('![', '(', ')'))
+
+
+def _undecided_from(buf, pos, opener, mid, end_char):
+    """Return the first match start at or after pos that buf cannot decide.
+
+    A match attempt at an opener is undecided when it runs off the end of
+    buf: no ']' follows it yet, its ']' is the last character, or mid
+    followed the ']' but end_char has not arrived. Everything before the
+    returned position can be matched now without changing the outcome.
+    """
+    n = len(buf)
+    limit = n
+    if len(opener) == 2 and buf.endswith(opener[0]):
+        limit = n - 1
+
+    def first_waiting_on(close):
+        # Openers between the previous ']' and close all stop at close
+        previous = buf.rfind(']', 0, close)
+        return buf.find(opener, max(previous + 1, pos), close)
+
+    last_close = buf.rfind(']')
+    start = buf.find(opener, max(last_close + 1, pos))
+    if 0 <= start < limit:
+        limit = start
+    if last_close == n - 1:
+        start = first_waiting_on(last_close)
+        if 0 <= start < limit:
+            limit = start
+    if end_char:
+        last_end = buf.rfind(end_char)
+        close = buf.find(']' + mid, max(last_end - 1, pos))
+        while 0 <= close < limit:
+            start = first_waiting_on(close)
+            if start >= 0:
+                limit = min(limit, start)
+                break
+            close = buf.find(']' + mid, close + 1)
+    return max(limit, pos)
+
+
+def _is_gap(char):
+    return char in _GAPS or char.isspace()
+
+
+def _count(text, words, mid_word):
+    """Add the words in text to a running (words, mid_word) tally.
+
+    mid_word says whether the text counted so far ended inside a word, in
+    which case a word at the start of text is the same word continued
+    (count_words removes code spans without leaving a gap).
+    """
+    if not text:
+        return words, mid_word
+    if not text.isascii() and _UNICODE_SPACE.search(text):
+        found = len(text.translate(_SYNTAX).split())
+    else:
+        # Much faster than str.translate() and split() on non-ASCII text
+        marked = b' ' + text.encode('utf-8', 'surrogatepass').translate(_WORD_MAP)
+        found = marked.count(b' x')
+    if found and mid_word and not _is_gap(text[0]):
+        found -= 1
+    return words + found, not _is_gap(text[-1])
+
+
+class _WordCounter:
+    """Counts words in fence-free text, skipping `inline code` spans.
+
+    Text is collected by feed() and counted in bulk by flush(), since
+    joining the kept pieces and splitting once is much cheaper than
+    counting every piece between two code spans on its own.
+    """
+
+    def __init__(self):
+        self.words = 0
+        self.mid_word = False
+        self.in_code = False
+        self._kept = []
+        # Text since the open backtick, which count_words leaves alone if
+        # the span is never closed, and the tally that would give
+        self._pending = []
+        self._unclosed = None
+
+    def copy(self):
+        self.flush()
+        other = _WordCounter()
+        other.words = self.words
+        other.mid_word = self.mid_word
+        other.in_code = self.in_code
+        other._unclosed = self._unclosed
+        return other
+
+    def feed(self, text):
+        if self.in_code:
+            tick = text.find('`')
+            if tick < 0:
+                self._pending.append(text)
+                return
+            self.in_code = False
+            self._pending = []
+            self._unclosed = None
+            text = text[tick + 1:]
+
+        # Complete spans are dropped in C; whatever follows the last one
+        # can still hold a backtick that opens a span closed later on
+        pieces = _INLINE_CODE.split(text)
+        tail = pieces.pop()
+        self._kept.extend(pieces)
+        tick = tail.find('`')
+        while tick >= 0:
+            if tick + 1 < len(tail) and tail[tick + 1] != '`':
+                self._kept.append(tail[:tick])
+                self.in_code = True
+                self._pending = [tail[tick:]]
+                self._unclosed = None
+                return
+            # `[^`]+` needs at least one character before the next backtick
+            tick = tail.find('`', tick + 1)
+        self._kept.append(tail)
+
+    def flush(self):
+        if self._kept:
+            self.words, self.mid_word = _count(''.join(self._kept), self.words, self.mid_word)
+            self._kept = []
+        if self.in_code and self._pending:
+            start = self._unclosed or (self.words, self.mid_word)
+            self._unclosed = _count(''.join(self._pending), *start)
+            self._pending = []
+
+    def result(self):
+        self.flush()
+        if self.in_code:
+            return self._unclosed[0]
+        return self.words
+
+
+class MarkdownTokenizer:
+    """Incremental markdown scanner; call feed() with text, then close().
+
+    extractors names registered extractors (see extractors.py) to run in
+    the same pass; their results are added to close()'s dict by name.
+    """
+
+    def __init__(self, extractors=()):
+        # The leading newline lets headings on the first line be found by
+        # the same newline-anchored search as every other line
+        self._buf = '\n'
+        self._words = _WordCounter()
+        self._in_fence = False
+        self._fence_shadow = None
+        self._word_pos = 0
+        self._token_pos = 0
+        # Where the last match of each TOKENS kind ended
+        self._token_ends = dict.fromkeys(('title', 'url', 'page', 'ref', 'src'), 0)
+        self._extractors = create_extractors(extractors)
+        # Pattern extractors share one scan, see extractors.PatternScanner
+        self._scanners = scanners_for(self._extractors)
+        self._scanner_pos = [0] * len(self._scanners)
+        self.headings = {'h1': 0, 'h2': 0, 'h3': 0, 'h4': 0, 'h5': 0, 'h6': 0}
+        self._links = []
+        self._wiki_links = []
+        self._ref_links = []
+        self.images = []
+        self.blank = True
+
+    def feed(self, text):
+        """Scan the next piece of the document."""
+        if self.blank and text and not text.isspace():
+            self.blank = False
+        self._buf += text
+        self._scan(final=False)
+        self._trim()
+
+    def close(self):
+        """Finish the document and return the analysis results."""
+        self._scan(final=True)
+        self._buf = ''
+        if self._in_fence:
+            word_count = self._fence_shadow.result()
+        else:
+            word_count = self._words.result()
+        results = {
+            'word_count': word_count,
+            'headings': self.headings,
+            'links': self._links + self._wiki_links + self._ref_links,
+            'images': self.images,
+        }
+        for extractor in self._extractors:
+            results[extractor.name] = extractor.result()
+        return results
+
+    def _scan(self, final):
+        buf = self._buf
+        if final:
+            end = len(buf)
+        else:
+            # Word counting looks ahead up to two characters after a
+            # backtick, so only hand it complete lines until the end. A
+            # line longer than MAX_LOOKAHEAD is counted in pieces, cut
+            # after a character that is not a backtick.
+            end = buf.rfind('\n') + 1
+            if end < len(buf) - MAX_LOOKAHEAD:
+                end = len(buf.rstrip('`'))
+        if end > self._word_pos:
+            self._scan_words(buf, self._word_pos, end)
+            self._word_pos = end
+        self._token_pos = self._scan_tokens(buf, self._token_pos, final)
+        for i, scanner in enumerate(self._scanners):
+            self._scanner_pos[i] = scanner.scan(buf, self._scanner_pos[i], final)
+
+    def _trim(self):
+        """Drop text that every scanner has finished with."""
+        cut = min(self._word_pos, self._token_pos, *self._scanner_pos)
+        if cut:
+            self._buf = self._buf[cut:]
+            self._word_pos -= cut
+            self._token_pos -= cut
+            for kind in self._token_ends:
+                self._token_ends[kind] -= cut
+            self._scanner_pos = [pos - cut for pos in self._scanner_pos]
+
+    def _scan_words(self, buf, pos, end):
+        # ```fenced``` blocks are removed first, then `inline` spans
+        shadow_from = pos
+        while True:
+            if self._in_fence:
+                close = buf.find('```', pos, end)
+                if close < 0:
+                    if self._fence_shadow is None:
+                        # Nothing has been fed to the counter since the
+                        # fence opened, so its current state is the one
+                        # to continue from if the fence never closes
+                        self._fence_shadow = self._words.copy()
+                    self._fence_shadow.feed(buf[shadow_from:end])
+                    self._fence_shadow.flush()
+                    return
+                self._in_fence = False
+                self._fence_shadow = None
+                pos = close + 3
+            else:
+                start = buf.find('```', pos, end)
+                if start < 0:
+                    self._words.feed(buf[pos:end])
+                    self._words.flush()
+                    return
+                self._words.feed(buf[pos:start])
+                # If the fence is never closed count_words keeps its text
+                self._in_fence = True
+                shadow_from = start
+                pos = start + 3
+
+    def _scan_tokens(self, buf, pos, final):
+        """Find headings, links and images with TOKENS, up to where more text could change them.
+
+        Each kind keeps its own end position: a match of a kind starting
+        before the end of that kind's previous match is skipped, exactly
+        as the separate patterns' finditer would never see it.
+        """
+        n = len(buf)
+        # A construct still open MAX_LOOKAHEAD characters on is plain text,
+        # so one stray '[' cannot keep the rest of the file buffered
+        floor = n - MAX_LOOKAHEAD
+        if final:
+            limit = n
+        else:
+            # Stop before the last line with text on it, since more text
+            # could still extend a heading there, and before the first
+            # link-like construct that has not been closed yet
+            limit = min(buf.rfind('\n', 0, len(buf.rstrip())),
+                        *(_undecided_from(buf, pos, *shape) for shape in _LINK_SHAPES))
+            limit = max(limit, floor, pos)
+        ends = self._token_ends
+        for match in _TOKENS.finditer(buf, pos):
+            start = match.start()
+            if start >= limit:
+                break
+            kind = match.lastgroup
+            if start < ends[kind]:
+                continue
+            if kind == 'title':
+                if match.end(kind) == n and not final and start >= floor:
+                    return start
+                self.headings[_HEADING_KEYS[len(match['hashes'])]] += 1
+                ends[kind] = match.end(kind)
+            elif kind == 'url':
+                self._links.append({'text': match['text'], 'url': match['url'], 'type': 'standard'})
+                ends[kind] = match.end(kind) + 1
+            elif kind == 'page':
+                self._wiki_links.append({'text': match['page'], 'url': match['page'],
+                                         'type': 'wiki'})
+                ends[kind] = match.end(kind) + 2
+            elif kind == 'ref':
+                self._ref_links.append({'text': match['text'], 'url': f"ref:{match['ref']}",
+                                        'type': 'reference'})
+                ends[kind] = match.end(kind) + 1
+            else:
+                self.images.append({'alt': match['alt'], 'url': match['src']})
+                ends[kind] = match.end(kind) + 1
+        return limit
+
+
+def analyze_content(content, extractors=()):
+    """Analyze markdown content in a single pass.
+
+    Returns a dict with 'word_count', 'headings', 'links' and 'images',
+    matching count_words, count_headings, extract_links and extract_images,
+    plus one entry per extractor named in extractors.
+    """
+    tokenizer = MarkdownTokenizer(extractors)
+    tokenizer.feed(content)
+    return tokenizer.close()
+
+
+def analyze_file(filename, chunk_size=1 << 16, extractors=()):
+    """Analyze a markdown file without reading it into memory at once.
+
+    The file is fed to the tokenizer chunk_size characters at a time, so
+    memory use stays roughly constant however large the file is, apart
+    from the links and images found. A construct left open for more than
+    MAX_LOOKAHEAD characters (an unclosed '[', say) is taken as plain
+    text, so a link that long is only found by analyze_content. Returns
+    the same dict as analyze_content, or None if the file is empty or
+    only whitespace.
+    """
+    tokenizer = MarkdownTokenizer(extractors)
+    with open(filename, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            tokenizer.feed(chunk)
+    if tokenizer.blank:
+        return None
+    return tokenizer.close()
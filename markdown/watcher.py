@@ -0,0 +1,195 @@
+"""File watchers for watch mode.
+
+Both watchers have the same interface: wait(timeout) blocks until files
+under the watched roots change (or the timeout passes) and returns the
+set of absolute paths that were created, modified or removed. Editors
+often save with several writes or a rename, so events arriving within
+settle seconds of each other are reported together.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE |
+               _IN_DELETE | _IN_DELETE_SELF)
+_EVENT = struct.Struct('iIII')
+
+
+class _Watcher:
+    def __init__(self, roots, settle=0.05):
+        # Directories are watched recursively; a file root is watched alone
+        self.dirs = [os.path.abspath(root) for root in roots if os.path.isdir(root)]
+        self.files = {os.path.abspath(root) for root in roots if not os.path.isdir(root)}
+        self.settle = settle
+
+    def _wanted(self, path):
+        return path in self.files or any(
+            path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in self.dirs)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PollingWatcher(_Watcher):
+    """Detect changes by comparing file sizes and mtimes every interval seconds."""
+
+    def __init__(self, roots, interval=0.5, settle=0.05):
+        super().__init__(roots, settle)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for root in self.dirs:
+            for directory, dirs, files in os.walk(root):
+                for name in files:
+                    _stat_into(snapshot, os.path.join(directory, name))
+        for path in self.files:
+            _stat_into(snapshot, path)
+        return snapshot
+
+    def _changes(self):
+        snapshot = self._scan()
+        old = self._snapshot
+        self._snapshot = snapshot
+        return {path for path in old.keys() | snapshot.keys() if old.get(path) != snapshot.get(path)}
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return set()
+            time.sleep(delay)
+            changed = self._changes()
+            if changed:
+                time.sleep(self.settle)
+                return changed | self._changes()
+
+
+def _stat_into(snapshot, path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    snapshot[path] = (st.st_mtime_ns, st.st_size)
+
+
+class InotifyWatcher(_Watcher):
+    """Linux inotify watcher (through libc, no extra packages).
+
+    Raises OSError where inotify is not available; use create_watcher to
+    fall back to polling automatically.
+    """
+
+    def __init__(self, roots, settle=0.05):
+        super().__init__(roots, settle)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        try:
+            self._add_watch = libc.inotify_add_watch
+            init = libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify is not available on this platform")
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}
+        try:
+            for root in self.dirs:
+                for directory, dirs, files in os.walk(root):
+                    self._watch(directory)
+            for path in self.files:
+                self._watch(os.path.dirname(path))
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+        self._paths[wd] = directory
+
+    def wait(self, timeout=None):
+        changed = self._read(timeout)
+        if changed:
+            # Collect the rest of the save (temp file, rename, ...) as one change
+            while True:
+                more = self._read(self.settle)
+                if not more:
+                    break
+                changed |= more
+        return {path for path in changed if self._wanted(path)}
+
+    def _read(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].split(b'\0', 1)[0]
+            offset += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped: report everything that exists now
+                changed |= set(PollingWatcher(self.dirs + sorted(self.files))._snapshot)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_IGNORED:
+                del self._paths[wd]
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                # Watch new subdirectories and report the files already in them
+                for sub, dirs, files in os.walk(path):
+                    try:
+                        self._watch(sub)
+                    except OSError:
+                        continue
+                    changed.update(os.path.join(sub, f) for f in files)
+            changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(roots, interval=0.5):
+    """An InotifyWatcher where supported, otherwise a PollingWatcher."""
+    try:
+        return InotifyWatcher(roots)
+    except OSError:
+        return PollingWatcher(roots, interval)
@@ -1,5 +1,18 @@
-from weather_api import get_current_weather, get_forecast
-from storage import save_history
+import argparse
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from config import CACHE_FILE, MAX_CONCURRENCY, RATE_LIMIT_CALLS, POLL_INTERVAL, POLL_JITTER
+from daemon import PollingDaemon
+from forecast_analytics import (ForecastColumns, daily_stats, precipitation_windows,
+                                summarize, trend_slopes)
+from weather_api import RateLimiter, WeatherClient, get_weather_and_forecast
+from weather_batch import fetch_cities, read_cities
+from weather_cache import WeatherCache
+from snapshot import export_snapshot, import_snapshot
+from storage import default_store, save_history
 
 def display_weather(data):
     print("\nCurrent Weather")
@@ -15,12 +28,167 @@ def display_forecast(forecast):
     for item in forecast["list"][:8]:
         print(f"{item['dt_txt']} | {item['main']['temp']}°C | {item['weather'][0]['description']}")
 
-def main():
+    columns = ForecastColumns()
+    columns.add(forecast.get("city", {}).get("name", ""), forecast)
+    print("\nDaily Outlook")
+    print("-------------")
+    for row in daily_stats(columns):
+        print(f"{row['day']:%a %d %b} | min {row['min']:.1f}°C | max {row['max']:.1f}°C | "
+              f"mean {row['mean']:.1f}°C | {row['precipitation']:.1f} mm | "
+              f"{row['pop']:.0%} chance")
+    for window in precipitation_windows(columns):
+        print(f"Precipitation {window['start']:%a %H:%M} - {window['end']:%a %H:%M} | "
+              f"{window['precipitation']:.1f} mm | up to {window['pop']:.0%} chance")
+    slope = trend_slopes(columns)[columns.cities[0]]
+    if slope is not None:
+        print(f"Trend: {slope:+.1f}°C/day")
+
+def display_forecast_summary(summaries):
+    """One line per city from forecast_analytics.summarize."""
+    print("\nForecast Summary")
+    print("----------------")
+    for row in summaries:
+        if row["min"] is None:
+            print(f"{row['city']} | no forecast slots")
+            continue
+        window = row["next_window"]
+        rain = f"rain from {window['start']:%a %H:%M}" if window else "dry"
+        trend = "" if row["trend"] is None else f" | {row['trend']:+.1f}°C/day"
+        print(f"{row['city']} | {row['days']} days | {row['min']:.1f} to {row['max']:.1f}°C | "
+              f"{row['precipitation']:.1f} mm | {rain}{trend}")
+
+def display_daily_stats(rows):
+    print("\nDaily Temperatures")
+    print("------------------")
+    if not rows:
+        print("No history recorded for this selection.")
+    for row in rows:
+        print(f"{row['city']} | {row['day']} | min {row['min']:.1f}°C | max {row['max']:.1f}°C | "
+              f"mean {row['mean']:.1f}°C | {row['count']} readings")
+
+def display_conditions(rows):
+    print("\nConditions")
+    print("----------")
+    if not rows:
+        print("No history recorded for this selection.")
+    for condition, count, share in rows:
+        print(f"{condition} | {count} | {share:.0%}")
+
+def show_history(cities, since=None, until=None, last_days=None, stats=True, conditions=False):
+    """Print aggregates over the stored history for the given cities (all if empty)."""
+    if last_days is not None:
+        since = datetime.now() - timedelta(days=last_days)
+    store = default_store()
+    city = cities or None
+    if stats:
+        display_daily_stats(store.daily_stats(city, since, until))
+    if conditions:
+        display_conditions(store.condition_frequencies(city, since, until))
+
+def run_batch(cities, max_concurrency=MAX_CONCURRENCY, rate_limit=RATE_LIMIT_CALLS):
+    """Fetch many cities concurrently, printing each one as it arrives.
+
+    Returns the results that failed, one per city.
+    """
+    failures = []
+    forecasts = {}
+    total = 0
+    # Cached cities cost no quota; only requests that go out wait for the limiter
+    with WeatherClient(cache=WeatherCache(CACHE_FILE),
+                       limiter=RateLimiter(calls=rate_limit)) as client:
+        for result in fetch_cities(cities, client, max_concurrency):
+            total += 1
+            if "error" in result:
+                failures.append(result)
+                print(f"{result['city']} | Error: {result['error']}")
+                continue
+            weather = result["weather"]
+            print(f"{result['city']} | {weather['main']['temp']}°C | "
+                  f"{weather['weather'][0]['description']} | "
+                  f"{len(result['forecast']['list'])} forecast slots")
+            save_history(result["city"], weather)
+            forecasts[result["city"]] = result["forecast"]
+
+    if forecasts:
+        display_forecast_summary(summarize(ForecastColumns.from_forecasts(forecasts)))
+    print(f"\n{total - len(failures)} of {total} cities fetched")
+    return failures
+
+def run_daemon(cities, interval=POLL_INTERVAL, jitter=POLL_JITTER,
+               max_concurrency=MAX_CONCURRENCY, rate_limit=RATE_LIMIT_CALLS):
+    """Poll cities until Ctrl+C or SIGTERM, saving each poll's readings."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    daemon = PollingDaemon(cities, interval, jitter, max_concurrency=max_concurrency,
+                           limiter=RateLimiter(calls=rate_limit))
+    print(f"Polling {len(daemon.cities)} cities every {interval:g}s (Ctrl+C to stop)")
+    try:
+        daemon.run(stop)
+    except KeyboardInterrupt:
+        pass
+    print(f"Stopped after {daemon.polls} polls")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Weather dashboard")
+    parser.add_argument("cities", nargs="*", help="cities to fetch in one batch")
+    parser.add_argument("--cities-file", help="file with one city per line")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY,
+                        help="requests in flight at once")
+    parser.add_argument("--rate-limit", type=int, default=RATE_LIMIT_CALLS,
+                        help="API calls allowed per minute")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep polling the cities and recording their weather")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="seconds between polls in daemon mode")
+    parser.add_argument("--jitter", type=float, default=POLL_JITTER,
+                        help="random +/- fraction applied to each interval")
+    history = parser.add_argument_group("history", "summarize stored readings for the given "
+                                        "cities (all cities if none are given)")
+    history.add_argument("--stats", action="store_true",
+                         help="daily min/max/mean temperature per city")
+    history.add_argument("--conditions", action="store_true",
+                         help="how often each weather condition was recorded")
+    history.add_argument("--since", help="first date or time to include (ISO format)")
+    history.add_argument("--until", help="date or time to stop before (ISO format)")
+    history.add_argument("--last-days", type=int, help="only the last N days")
+    history.add_argument("--export-snapshot", metavar="FILE",
+                         help="write the selected history to a compact columnar snapshot")
+    history.add_argument("--import-snapshot", metavar="FILE",
+                         help="append the records of a snapshot to the history")
+    args = parser.parse_args(argv)
+    if args.daemon and not (args.cities or args.cities_file):
+        parser.error("--daemon needs cities or --cities-file")
+    return args
+
+def main(argv=()):
+    args = parse_args(argv)
+    cities = list(args.cities)
+    if args.cities_file:
+        cities += read_cities(args.cities_file)
+    if args.import_snapshot:
+        count = import_snapshot(default_store(), args.import_snapshot)
+        print(f"Imported {count} records from {args.import_snapshot}")
+    if args.export_snapshot:
+        since = datetime.now() - timedelta(days=args.last_days) if args.last_days else args.since
+        count = export_snapshot(default_store(), args.export_snapshot,
+                                city=cities or None, start=since, end=args.until)
+        print(f"Exported {count} records to {args.export_snapshot}")
+    if args.stats or args.conditions:
+        show_history(cities, args.since, args.until, args.last_days, args.stats, args.conditions)
+    if args.import_snapshot or args.export_snapshot or args.stats or args.conditions:
+        return 0
+    if args.daemon:
+        run_daemon(cities, args.interval, args.jitter, args.concurrency, args.rate_limit)
+        return 0
+    if cities:
+        failures = run_batch(cities, args.concurrency, args.rate_limit)
+        return 1 if failures else 0
+
     city = input("Enter city name: ")
 
     try:
-        weather = get_current_weather(city)
-        forecast = get_forecast(city)
+        # Both requests are in flight at once on the shared session
+        weather, forecast = get_weather_and_forecast(city)
 
         display_weather(weather)
         display_forecast(forecast)
@@ -31,4 +199,4 @@ def main():
         print("Error:", e)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(sys.argv[1:]))
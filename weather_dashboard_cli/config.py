@@ -1,4 +1,31 @@
 
 BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
 FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
-HISTORY_FILE = "history.json"
\ No newline at end of file
+HISTORY_FILE = "history.json"
+HISTORY_DB = "history.db"
+UNITS = "metric"
+# Seconds to wait for a connection, and for each response read
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+# Keep-alive connections kept open per host
+POOL_SIZE = 10
+# Requests in flight at once in batch mode, and OpenWeatherMap's free-tier
+# quota of RATE_LIMIT_CALLS per RATE_LIMIT_PERIOD seconds
+MAX_CONCURRENCY = 8
+RATE_LIMIT_CALLS = 60
+RATE_LIMIT_PERIOD = 60
+# Response cache: seconds each endpoint's data stays fresh, extra seconds a
+# stale copy may be served while it is refreshed in the background, the
+# number of responses kept in memory, and the SQLite file that keeps them
+# across runs (None keeps the cache in memory only)
+CACHE_TTLS = {"weather": 600, "forecast": 10800}
+CACHE_STALE = {"weather": 300, "forecast": 3600}
+CACHE_MAX_ENTRIES = 1024
+CACHE_FILE = "cache.db"
+# Daemon mode: seconds between polls and the random +/- fraction applied
+# to each interval
+POLL_INTERVAL = 600
+POLL_JITTER = 0.1
+# Forecast summaries: a slot with at least this chance of precipitation
+# counts toward a rain/snow window even if no amount is forecast
+PRECIPITATION_MIN_POP = 0.5
@@ -0,0 +1,84 @@
+import random
+import threading
+import time
+from datetime import datetime
+
+from config import POLL_INTERVAL, POLL_JITTER, MAX_CONCURRENCY
+from storage import default_store, make_record
+from weather_api import RateLimiter, WeatherClient
+from weather_batch import fetch_cities, unique_cities
+
+
+class PollingDaemon:
+    """Poll a list of cities on an interval and record their weather.
+
+    One process, one pooled WeatherClient and one rate limiter serve every
+    poll, so after start-up a poll costs only its network round trips.
+    Polls start every interval seconds, each interval stretched or shrunk
+    by up to jitter (a fraction) so several daemons do not hit the API in
+    lockstep. Each poll's readings are written to the history store in
+    one transaction as soon as the poll completes, so nothing is held in
+    memory between polls.
+
+    Without a client the daemon makes its own, rate-limited by limiter (a
+    RateLimiter for the API quota by default); a client passed in keeps
+    its own limiter.
+    """
+
+    def __init__(self, cities, interval=POLL_INTERVAL, jitter=POLL_JITTER, client=None,
+                 store=None, max_concurrency=MAX_CONCURRENCY,
+                 limiter=None, rng=random.random, clock=time.monotonic):
+        self.cities = unique_cities(cities)
+        self.interval = interval
+        self.jitter = jitter
+        self.own_client = client is None
+        # Every poll wants a fresh reading, so no response cache here
+        self.client = client or WeatherClient(limiter=limiter or RateLimiter())
+        self.store = store
+        self.max_concurrency = max_concurrency
+        self.rng = rng
+        self.clock = clock
+        self.polls = 0
+        self.failures = {}
+        self.saved = 0
+
+    def poll_once(self):
+        """Fetch every city once and save the readings; returns the failed results."""
+        failed = []
+        records = []
+        for result in fetch_cities(self.cities, self.client, self.max_concurrency,
+                                   include_forecast=False):
+            if "error" in result:
+                failed.append(result)
+                self.failures[result["city"]] = self.failures.get(result["city"], 0) + 1
+            else:
+                records.append(make_record(result["city"], result["weather"]))
+        if records:
+            # An empty store is falsy (it has __len__), so test for None
+            store = self.store if self.store is not None else default_store()
+            store.append_many(records)
+            self.saved += len(records)
+        self.polls += 1
+        return failed
+
+    def next_delay(self):
+        """The interval with jitter applied."""
+        return self.interval * (1 + self.jitter * (2 * self.rng() - 1))
+
+    def run(self, stop=None, max_polls=None):
+        """Poll until stop (a threading.Event) is set or max_polls polls have run."""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                started = self.clock()
+                failed = self.poll_once()
+                print(f"[{datetime.now():%H:%M:%S}] polled {len(self.cities)} cities"
+                      f"{f' ({len(failed)} failed)' if failed else ''}, "
+                      f"{self.saved} readings saved")
+                if max_polls is not None and self.polls >= max_polls:
+                    break
+                # Keep a steady schedule: the poll itself counts toward the interval
+                stop.wait(max(0, self.next_delay() - (self.clock() - started)))
+        finally:
+            if self.own_client:
+                self.client.close()
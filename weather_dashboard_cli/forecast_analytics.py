@@ -0,0 +1,182 @@
+
+import operator
+from array import array
+from datetime import date, datetime, timedelta, timezone
+
+from config import PRECIPITATION_MIN_POP
+
+# OpenWeatherMap forecasts come in 3-hour slots
+SLOT_SECONDS = 3 * 60 * 60
+DAY_SECONDS = 24 * 60 * 60
+EPOCH = date(1970, 1, 1)
+
+
+class ForecastColumns:
+    """Forecast slots of one or more cities as flat columns.
+
+    Each response is converted once: time (epoch seconds), temperature,
+    pop (probability of precipitation, 0-1) and precipitation (rain plus
+    snow in mm) are arrays holding every city's slots back to back, and
+    city i's slots are those from offsets[i] to offsets[i + 1]. The
+    summaries below then work on array slices with min/max/sum instead of
+    walking the nested JSON, so a batch of hundreds of forecasts costs
+    little more than the conversion itself.
+    """
+
+    def __init__(self):
+        self.cities = []
+        self.utc_offsets = array("q")
+        self.offsets = array("q", [0])
+        self.time = array("q")
+        self.temperature = array("d")
+        self.pop = array("d")
+        self.precipitation = array("d")
+
+    @classmethod
+    def from_forecasts(cls, forecasts):
+        """Build columns from a {city: forecast response} dict."""
+        columns = cls()
+        for city, forecast in forecasts.items():
+            columns.add(city, forecast)
+        return columns
+
+    def add(self, city, forecast):
+        """Append one forecast response; slots are expected in time order, as sent."""
+        self.cities.append(city)
+        self.utc_offsets.append(forecast.get("city", {}).get("timezone", 0))
+        for item in forecast["list"]:
+            self.time.append(_slot_time(item))
+            self.temperature.append(item["main"]["temp"])
+            self.pop.append(item.get("pop", 0))
+            self.precipitation.append(item.get("rain", {}).get("3h", 0) +
+                                      item.get("snow", {}).get("3h", 0))
+        self.offsets.append(len(self.time))
+
+    def __len__(self):
+        return len(self.cities)
+
+    def segments(self):
+        """Yield (city, UTC offset, first slot, end slot) for every city."""
+        for i, city in enumerate(self.cities):
+            yield city, self.utc_offsets[i], self.offsets[i], self.offsets[i + 1]
+
+
+def _slot_time(item):
+    if "dt" in item:
+        return item["dt"]
+    # dt_txt is in UTC
+    return int(datetime.fromisoformat(item["dt_txt"]).replace(tzinfo=timezone.utc).timestamp())
+
+
+def _local(epoch, utc_offset):
+    return datetime.fromtimestamp(epoch, timezone(timedelta(seconds=utc_offset)))
+
+
+def _days(columns, utc_offset, start, end):
+    """Split slots start..end into runs of the same local day: (date, first, end)."""
+    time = columns.time
+    while start < end:
+        day = (time[start] + utc_offset) // DAY_SECONDS
+        stop = start + 1
+        while stop < end and (time[stop] + utc_offset) // DAY_SECONDS == day:
+            stop += 1
+        yield EPOCH + timedelta(days=day), start, stop
+        start = stop
+
+
+def daily_stats(columns):
+    """Temperature and precipitation per city and local day.
+
+    Returns dicts with city, day, min, max, mean (°C), precipitation (mm)
+    and pop (the day's highest chance of precipitation), in city order.
+    """
+    rows = []
+    for city, utc_offset, start, end in columns.segments():
+        for day, first, stop in _days(columns, utc_offset, start, end):
+            temperature = columns.temperature[first:stop]
+            rows.append({
+                "city": city,
+                "day": day,
+                "min": min(temperature),
+                "max": max(temperature),
+                "mean": sum(temperature) / len(temperature),
+                "precipitation": sum(columns.precipitation[first:stop]),
+                "pop": max(columns.pop[first:stop])
+            })
+    return rows
+
+
+def precipitation_windows(columns, min_pop=PRECIPITATION_MIN_POP):
+    """Runs of consecutive slots where rain or snow is forecast.
+
+    A slot counts when it has any precipitation or a chance of at least
+    min_pop. Returns dicts with city, start and end (local datetimes),
+    precipitation (mm over the window) and pop (its highest chance).
+    """
+    windows = []
+    wet = [mm > 0 or pop >= min_pop for mm, pop in zip(columns.precipitation, columns.pop)]
+    for city, utc_offset, start, end in columns.segments():
+        i = start
+        while i < end:
+            if not wet[i]:
+                i += 1
+                continue
+            stop = i + 1
+            while stop < end and wet[stop]:
+                stop += 1
+            windows.append({
+                "city": city,
+                "start": _local(columns.time[i], utc_offset),
+                "end": _local(columns.time[stop - 1] + SLOT_SECONDS, utc_offset),
+                "precipitation": sum(columns.precipitation[i:stop]),
+                "pop": max(columns.pop[i:stop])
+            })
+            i = stop
+    return windows
+
+
+def trend_slopes(columns):
+    """Least-squares temperature trend of each city's forecast in °C per day.
+
+    Returns {city: slope}; the slope is None with fewer than two slots.
+    """
+    slopes = {}
+    for city, _, start, end in columns.segments():
+        n = end - start
+        if n < 2:
+            slopes[city] = None
+            continue
+        t0 = columns.time[start]
+        x = array("d", ((t - t0) / DAY_SECONDS for t in columns.time[start:end]))
+        y = columns.temperature[start:end]
+        sum_x, sum_y = sum(x), sum(y)
+        spread = n * sum(map(operator.mul, x, x)) - sum_x * sum_x
+        if not spread:
+            slopes[city] = None
+            continue
+        slopes[city] = (n * sum(map(operator.mul, x, y)) - sum_x * sum_y) / spread
+    return slopes
+
+
+def summarize(columns, min_pop=PRECIPITATION_MIN_POP):
+    """One overview per city: days covered, overall min/max, first wet window and trend."""
+    days, windows = {}, {}
+    for row in daily_stats(columns):
+        days.setdefault(row["city"], []).append(row)
+    for window in precipitation_windows(columns, min_pop):
+        windows.setdefault(window["city"], window)
+    slopes = trend_slopes(columns)
+
+    summaries = []
+    for city, _, start, end in columns.segments():
+        temperature = columns.temperature[start:end]
+        summaries.append({
+            "city": city,
+            "days": len(days.get(city, ())),
+            "min": min(temperature) if temperature else None,
+            "max": max(temperature) if temperature else None,
+            "precipitation": sum(columns.precipitation[start:end]),
+            "next_window": windows.get(city),
+            "trend": slopes[city]
+        })
+    return summaries
@@ -0,0 +1,160 @@
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+MAGIC = b"WXSNAP\x00\x01"
+# magic, city code type, condition code type, record count, dictionary length
+HEADER = struct.Struct("<8scc6xQI")
+ALIGN = 8
+
+
+class SnapshotError(Exception):
+    """The file is not a weather history snapshot."""
+
+
+def write_snapshot(path, records):
+    """Write records (dicts like HistoryStore.records() yields) as a columnar snapshot.
+
+    City and condition strings are stored once in a dictionary and each
+    record keeps a small integer code for them; temperatures are float32
+    (NaN when missing) and times are int64 epoch seconds. Columns are
+    little-endian and 8-byte aligned so Snapshot can map them directly.
+    Returns the number of records written.
+    """
+    cities, conditions = {}, {}
+    times, temperatures = array("q"), array("f")
+    city_codes, condition_codes = array("I"), array("I")
+    for record in records:
+        times.append(int(datetime.fromisoformat(record["time"]).timestamp()))
+        temperature = record["temperature"]
+        temperatures.append(math.nan if temperature is None else temperature)
+        city_codes.append(cities.setdefault(record["city"], len(cities)))
+        condition_codes.append(conditions.setdefault(record["condition"], len(conditions)))
+
+    city_codes = _narrow(city_codes, len(cities))
+    condition_codes = _narrow(condition_codes, len(conditions))
+    dictionary = json.dumps({"cities": list(cities), "conditions": list(conditions)},
+                            ensure_ascii=False).encode("utf-8")
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, city_codes.typecode.encode(),
+                               condition_codes.typecode.encode(), len(times), len(dictionary)))
+        file.write(dictionary)
+        _pad(file)
+        for column in (times, temperatures, city_codes, condition_codes):
+            if sys.byteorder != "little":
+                column.byteswap()
+            column.tofile(file)
+            _pad(file)
+    return len(times)
+
+
+def _narrow(codes, size):
+    """Store codes in one byte per record where the dictionary allows it."""
+    for typecode, limit in (("B", 1 << 8), ("H", 1 << 16)):
+        if size <= limit:
+            return array(typecode, codes)
+    return codes
+
+
+def _pad(file):
+    file.write(b"\0" * (-file.tell() % ALIGN))
+
+
+class Snapshot:
+    """Read-only view of a snapshot file, mapped into memory.
+
+    The time, temperature, city and condition columns are memoryviews
+    over the mapped file, so opening a snapshot reads only its header and
+    dictionary whatever the number of records; pages are loaded as the
+    columns are used. city and condition hold codes into the cities and
+    conditions lists.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"{path} is empty")
+        view = memoryview(self._map)
+        if len(view) < HEADER.size or bytes(view[:len(MAGIC)]) != MAGIC:
+            view.release()
+            self.close()
+            raise SnapshotError(f"{path} is not a weather history snapshot")
+
+        _, city_type, condition_type, count, dictionary_length = HEADER.unpack_from(view)
+        offset = HEADER.size
+        dictionary = json.loads(bytes(view[offset:offset + dictionary_length]))
+        self.cities = dictionary["cities"]
+        self.conditions = dictionary["conditions"]
+        offset += dictionary_length
+
+        self._views = [view]
+        columns = []
+        for typecode in ("q", "f", city_type.decode(), condition_type.decode()):
+            offset += -offset % ALIGN
+            size = count * array(typecode).itemsize
+            columns.append(self._column(view[offset:offset + size], typecode))
+            offset += size
+        self.time, self.temperature, self.city, self.condition = columns
+
+    def _column(self, data, typecode):
+        if sys.byteorder == "little":
+            column = data.cast(typecode)
+        else:
+            # The file is little-endian; big-endian machines need a swapped copy
+            column = array(typecode, data.tobytes())
+            column.byteswap()
+            column = memoryview(column)
+        self._views += [data, column]
+        return column
+
+    def __len__(self):
+        return len(self.time)
+
+    def records(self):
+        """Decode every record back into a dict with an ISO time."""
+        for time, temperature, city, condition in zip(self.time, self.temperature,
+                                                      self.city, self.condition):
+            yield {
+                "city": self.cities[city],
+                # float32 keeps about 7 significant digits; drop the conversion noise
+                "temperature": None if math.isnan(temperature) else float(f"{temperature:.7g}"),
+                "condition": self.conditions[condition],
+                "time": datetime.fromtimestamp(time).isoformat()
+            }
+
+    def close(self):
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_snapshot(store, path, **filters):
+    """Write the store's records (filtered like HistoryStore.records) to a snapshot."""
+    return write_snapshot(path, store.records(**filters))
+
+
+def import_snapshot(store, path):
+    """Append every record of a snapshot to the store; returns the number imported."""
+    with Snapshot(path) as snapshot:
+        records = list(snapshot.records())
+    store.append_many(records)
+    return len(records)
@@ -1,23 +1,183 @@
 
 import json
-from config import HISTORY_FILE
-from datetime import datetime
+import os
+import sqlite3
+import threading
+from config import HISTORY_FILE, HISTORY_DB
+from datetime import date, datetime
 
-def save_history(city, weather_data):
-    record = {
+
+class HistoryStore:
+    """Weather history in SQLite, in WAL mode.
+
+    Each record is one INSERT, so saving costs the same however long the
+    history is. WAL lets readers run alongside a writer, and concurrent
+    writers (several CLI runs or a daemon) wait for each other instead of
+    overwriting each other's records. Records are indexed by city and
+    time, so queries for a city and time range and the per-day
+    aggregations below run as index range scans inside SQLite rather than
+    loading the history into Python. A history.json from before the switch is imported once, the
+    first time the store is opened, and renamed to history.json.migrated.
+    """
+
+    def __init__(self, db=HISTORY_DB, legacy_file=HISTORY_FILE):
+        self.conn = sqlite3.connect(db, timeout=30, check_same_thread=False)
+        self.c = self.conn.cursor()
+        self._lock = threading.Lock()
+        self.c.execute('PRAGMA journal_mode=WAL')
+        self.c.execute('PRAGMA synchronous=NORMAL')
+        self.c.execute('''CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            city TEXT NOT NULL,
+            temperature REAL,
+            condition TEXT,
+            time TEXT NOT NULL
+        )''')
+        # Cities are matched case-insensitively, and the index must agree
+        self.c.execute('CREATE INDEX IF NOT EXISTS history_city_nocase_time '
+                       'ON history (city COLLATE NOCASE, time)')
+        self.c.execute('CREATE INDEX IF NOT EXISTS history_time ON history (time)')
+        self.c.execute('CREATE TABLE IF NOT EXISTS migrations (source TEXT PRIMARY KEY)')
+        self.conn.commit()
+        if legacy_file and os.path.exists(legacy_file):
+            self.migrate_json(legacy_file)
+
+    def append(self, record):
+        """Add one record: a dict with city, temperature, condition and time."""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Add several records in one transaction."""
+        with self._lock, self.conn:
+            self.c.executemany(
+                'INSERT INTO history (city,temperature,condition,time) VALUES (?,?,?,?)',
+                [(r["city"], r["temperature"], r["condition"], r["time"]) for r in records]
+            )
+
+    def migrate_json(self, path):
+        """Import a legacy history.json once, then rename it; returns the records imported."""
+        source = os.path.abspath(path)
+        with self._lock:
+            # Take the write lock before checking, so two processes cannot
+            # both import the file
+            self.c.execute('BEGIN IMMEDIATE')
+            try:
+                self.c.execute('SELECT 1 FROM migrations WHERE source=?', (source,))
+                if self.c.fetchone() is not None or not os.path.exists(path):
+                    self.conn.rollback()
+                    return 0
+                try:
+                    with open(path, "r") as file:
+                        history = json.load(file)
+                except json.JSONDecodeError:
+                    history = []
+                self.c.executemany(
+                    'INSERT INTO history (city,temperature,condition,time) VALUES (?,?,?,?)',
+                    [(r["city"], r.get("temperature"), r.get("condition"), r["time"])
+                     for r in history]
+                )
+                self.c.execute('INSERT INTO migrations (source) VALUES (?)', (source,))
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        os.replace(path, path + ".migrated")
+        return len(history)
+
+    def records(self, city=None, start=None, end=None):
+        """Yield stored records oldest first.
+
+        city is a name or a list of names (any case); start and end are
+        datetimes, dates or ISO strings, start inclusive and end exclusive.
+        """
+        where, params = _filters(city, start, end)
+        rows = self._rows('SELECT city, temperature, condition, time FROM history'
+                          f'{where} ORDER BY time, id', params)
+        for city, temperature, condition, time in rows:
+            yield {"city": city, "temperature": temperature, "condition": condition, "time": time}
+
+    def daily_stats(self, city=None, start=None, end=None):
+        """Min, max and mean temperature per city per day, filtered like records()."""
+        where, params = _filters(city, start, end)
+        rows = self._rows(
+            'SELECT lower(city), substr(time, 1, 10) AS day, MIN(temperature), MAX(temperature), '
+            f'AVG(temperature), COUNT(*) FROM history{where} '
+            'GROUP BY lower(city), day ORDER BY lower(city), day', params)
+        return [{"city": city, "day": day, "min": low, "max": high, "mean": mean, "count": count}
+                for city, day, low, high, mean, count in rows]
+
+    def condition_frequencies(self, city=None, start=None, end=None):
+        """(condition, count, share of readings) pairs, most frequent first."""
+        where, params = _filters(city, start, end)
+        rows = list(self._rows(f'SELECT condition, COUNT(*) AS n FROM history{where} '
+                               'GROUP BY condition ORDER BY n DESC, condition', params))
+        total = sum(count for _, count in rows)
+        return [(condition, count, count / total) for condition, count in rows]
+
+    def _rows(self, sql, params):
+        """Run a query and yield its rows in batches, holding the lock only while fetching."""
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany(1000)
+            if not batch:
+                return
+            yield from batch
+
+    def __len__(self):
+        with self._lock:
+            self.c.execute('SELECT COUNT(*) FROM history')
+            return self.c.fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def _filters(city, start, end):
+    """WHERE clause and parameters for a city (or cities) and time range."""
+    clauses = []
+    params = []
+    if city is not None:
+        cities = [city] if isinstance(city, str) else list(city)
+        clauses.append(f"city COLLATE NOCASE IN ({','.join('?' * len(cities))})")
+        params += [" ".join(name.split()) for name in cities]
+    if start is not None:
+        clauses.append("time >= ?")
+        params.append(_time_bound(start))
+    if end is not None:
+        clauses.append("time < ?")
+        params.append(_time_bound(end))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _time_bound(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """The store save_history writes to, opened on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = HistoryStore()
+        return _default_store
+
+
+def make_record(city, weather_data):
+    return {
         "city": city,
         "temperature": weather_data["main"]["temp"],
         "condition": weather_data["weather"][0]["description"],
         "time": datetime.now().isoformat()
     }
 
-    try:
-        with open(HISTORY_FILE, "r") as file:
-            history = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        history = []
-
-    history.append(record)
 
-    with open(HISTORY_FILE, "w") as file:
-        json.dump(history, file, indent=4)
+def save_history(city, weather_data):
+    default_store().append(make_record(city, weather_data))
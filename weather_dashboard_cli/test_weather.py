@@ -59,18 +59,15 @@ def test_display_forecast(capsys):
 # Main flow test (happy path)
 # ----------------------------
 
-@patch("Mini_Project_2.get_current_weather")
-@patch("Mini_Project_2.get_forecast")
+@patch("Mini_Project_2.get_weather_and_forecast")
 @patch("Mini_Project_2.save_history")
 @patch.object(builtins, "input", lambda _: "Chennai")
-def test_main_success(mock_save, mock_forecast, mock_weather):
-    mock_weather.return_value = MOCK_WEATHER
-    mock_forecast.return_value = MOCK_FORECAST
+def test_main_success(mock_save, mock_fetch):
+    mock_fetch.return_value = (MOCK_WEATHER, MOCK_FORECAST)
 
     main()
 
-    mock_weather.assert_called_once_with("Chennai")
-    mock_forecast.assert_called_once_with("Chennai")
+    mock_fetch.assert_called_once_with("Chennai")
     mock_save.assert_called_once_with("Chennai", MOCK_WEATHER)
 
 
@@ -78,10 +75,10 @@ def test_main_success(mock_save, mock_forecast, mock_weather):
 # API failure test
 # ----------------------------
 
-@patch("Mini_Project_2.get_current_weather")
+@patch("Mini_Project_2.get_weather_and_forecast")
 @patch.object(builtins, "input", lambda _: "InvalidCity")
-def test_main_api_failure(mock_weather, capsys):
-    mock_weather.side_effect = Exception("City not found")
+def test_main_api_failure(mock_fetch, capsys):
+    mock_fetch.side_effect = Exception("City not found")
 
     main()
 
@@ -94,12 +91,10 @@ def test_main_api_failure(mock_weather, capsys):
 # Forecast failure test
 # ----------------------------
 
-@patch("Mini_Project_2.get_current_weather")
-@patch("Mini_Project_2.get_forecast")
+@patch("Mini_Project_2.get_weather_and_forecast")
 @patch.object(builtins, "input", lambda _: "Delhi")
-def test_main_forecast_failure(mock_forecast, mock_weather, capsys):
-    mock_weather.return_value = MOCK_WEATHER
-    mock_forecast.side_effect = Exception("Forecast API failed")
+def test_main_forecast_failure(mock_fetch, capsys):
+    mock_fetch.side_effect = Exception("Forecast API failed")
 
     main()
 
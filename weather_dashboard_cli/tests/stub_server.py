@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubServer:
+    """Local stand-in for the OpenWeatherMap API.
+
+    routes maps a path to a (status, body) pair or to a function taking
+    the query parameters and returning one; dict bodies are sent as JSON.
+    Every request is recorded in requests as (path, params, client address).
+    """
+
+    def __init__(self, latency=0):
+        self.routes = {}
+        self.requests = []
+        self.latency = latency
+        self.max_active = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive so connection reuse can be observed
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requests.append((url.path, params, self.client_address))
+                    stub._active += 1
+                    stub.max_active = max(stub.max_active, stub._active)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    route = stub.routes.get(url.path, (404, {"message": "not found"}))
+                    status, body = route(params) if callable(route) else route
+                    data = json.dumps(body).encode() if isinstance(body, (dict, list)) else body
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with stub._lock:
+                        stub._active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
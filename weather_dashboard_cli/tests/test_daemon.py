@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from daemon import PollingDaemon
+from storage import HistoryStore
+from stub_server import StubServer
+from weather_api import WeatherClient
+
+
+def weather(params):
+    if params["q"] == "Atlantis":
+        return 404, {"message": "city not found"}
+    return 200, {"name": params["q"], "main": {"temp": 21.5}, "weather": [{"description": "haze"}]}
+
+
+class TestPollingDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(os.path.join(self.tmp.name, "history.db"), None)
+        self.stub = StubServer()
+        self.stub.routes["/weather"] = weather
+        self.client = WeatherClient(base_url=f"{self.stub.url}/weather",
+                                    forecast_url=f"{self.stub.url}/forecast")
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.close()
+        self.store.close()
+        self.tmp.cleanup()
+
+    def daemon(self, cities, **kwargs):
+        return PollingDaemon(cities, client=self.client, store=self.store, **kwargs)
+
+    def test_polls_reuse_one_connection_and_skip_forecasts(self):
+        daemon = self.daemon(["Pune"], interval=0)
+
+        daemon.run(max_polls=3)
+
+        self.assertEqual([path for path, _, _ in self.stub.requests], ["/weather"] * 3)
+        self.assertEqual(len({address for _, _, address in self.stub.requests}), 1)
+
+    def test_each_poll_is_written_in_one_transaction(self):
+        writes = []
+        append_many = self.store.append_many
+        self.store.append_many = lambda records: writes.append(len(records)) or append_many(records)
+        daemon = self.daemon(["Pune", "Goa", "Atlantis"], interval=0)
+
+        daemon.poll_once()
+        self.assertEqual(len(self.store), 2)
+        daemon.poll_once()
+
+        self.assertEqual(writes, [2, 2])
+        self.assertEqual((len(self.store), daemon.saved), (4, 4))
+
+    def test_failures_are_counted_per_city(self):
+        daemon = self.daemon(["Pune", "Atlantis"], interval=0)
+
+        daemon.run(max_polls=2)
+
+        self.assertEqual(daemon.failures, {"Atlantis": 2})
+        self.assertEqual([r["city"] for r in self.store.records()], ["Pune", "Pune"])
+
+    def test_jitter_stays_within_bounds(self):
+        low = PollingDaemon(["a"], interval=100, jitter=0.1, client=self.client, rng=lambda: 0.0)
+        high = PollingDaemon(["a"], interval=100, jitter=0.1, client=self.client, rng=lambda: 1.0)
+
+        self.assertAlmostEqual(low.next_delay(), 90)
+        self.assertAlmostEqual(high.next_delay(), 110)
+
+    def test_stop_event_ends_the_loop(self):
+        daemon = self.daemon(["Pune"], interval=60)
+        stop = threading.Event()
+        thread = threading.Thread(target=daemon.run, args=(stop,))
+        thread.start()
+        time.sleep(0.2)
+        stop.set()
+        thread.join(2)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(daemon.polls, 1)
+        self.assertEqual(len(self.store), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
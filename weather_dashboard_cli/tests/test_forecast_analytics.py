@@ -0,0 +1,94 @@
+import time
+import unittest
+from datetime import date
+
+from forecast_analytics import (ForecastColumns, daily_stats, precipitation_windows,
+                                summarize, trend_slopes)
+
+# 2026-02-02 00:00 UTC
+START = 1769990400
+
+
+def slot(i, temp, pop=0, rain=None):
+    item = {"dt": START + i * 10800, "main": {"temp": temp}, "pop": pop}
+    if rain is not None:
+        item["rain"] = {"3h": rain}
+    return item
+
+
+def forecast(slots, utc_offset=0):
+    return {"city": {"name": "Pune", "timezone": utc_offset}, "list": slots}
+
+
+class TestForecastAnalytics(unittest.TestCase):
+
+    def test_daily_stats_group_slots_by_local_day(self):
+        slots = [slot(i, 20 + i) for i in range(10)]
+        columns = ForecastColumns.from_forecasts({"Pune": forecast(slots)})
+
+        rows = daily_stats(columns)
+
+        self.assertEqual([row["day"] for row in rows], [date(2026, 2, 2), date(2026, 2, 3)])
+        self.assertEqual((rows[0]["min"], rows[0]["max"], rows[0]["mean"]), (20, 27, 23.5))
+        self.assertEqual((rows[1]["min"], rows[1]["max"]), (28, 29))
+
+        # 21:00 UTC is already the next day five and a half hours east
+        shifted = ForecastColumns.from_forecasts({"Pune": forecast(slots, 19800)})
+        self.assertEqual([row["day"] for row in daily_stats(shifted)][0], date(2026, 2, 2))
+        self.assertEqual(daily_stats(shifted)[1]["min"], 27)
+
+    def test_precipitation_windows_join_wet_slots(self):
+        slots = [slot(0, 20), slot(1, 20, rain=1.5), slot(2, 19, pop=0.8),
+                 slot(3, 19, pop=0.2), slot(4, 18, pop=0.6, rain=0.5)]
+        columns = ForecastColumns.from_forecasts({"Pune": forecast(slots, 19800)})
+
+        windows = precipitation_windows(columns)
+
+        self.assertEqual(len(windows), 2)
+        self.assertEqual(f"{windows[0]['start']:%H:%M}-{windows[0]['end']:%H:%M}", "08:30-14:30")
+        self.assertEqual(windows[0]["precipitation"], 1.5)
+        self.assertEqual(windows[0]["pop"], 0.8)
+        self.assertEqual(windows[1]["precipitation"], 0.5)
+        self.assertEqual(daily_stats(columns)[0]["precipitation"], 2.0)
+
+    def test_trend_slope_in_degrees_per_day(self):
+        warming = [slot(i, 10 + i * 0.25) for i in range(40)]
+        flat = [slot(i, 15) for i in range(40)]
+        columns = ForecastColumns.from_forecasts({"A": forecast(warming), "B": forecast(flat),
+                                                  "C": forecast(warming[:1])})
+
+        slopes = trend_slopes(columns)
+
+        self.assertAlmostEqual(slopes["A"], 2.0)
+        self.assertAlmostEqual(slopes["B"], 0.0)
+        self.assertIsNone(slopes["C"])
+
+    def test_batch_keeps_cities_apart(self):
+        columns = ForecastColumns.from_forecasts({
+            "Pune": forecast([slot(i, 30) for i in range(16)]),
+            "Goa": forecast([slot(i, 25, rain=2 if i == 3 else None) for i in range(16)]),
+            "Nowhere": forecast([]),
+        })
+
+        summaries = {row["city"]: row for row in summarize(columns)}
+
+        self.assertEqual(list(columns.offsets), [0, 16, 32, 32])
+        self.assertEqual((summaries["Pune"]["min"], summaries["Pune"]["days"]), (30, 2))
+        self.assertIsNone(summaries["Pune"]["next_window"])
+        self.assertEqual(summaries["Goa"]["next_window"]["precipitation"], 2)
+        self.assertIsNone(summaries["Nowhere"]["min"])
+
+    def test_hundreds_of_forecasts_stay_cheap(self):
+        forecasts = {f"City{n}": forecast([slot(i, 10 + (i * n) % 17, pop=(i % 5) / 4)
+                                           for i in range(40)]) for n in range(500)}
+
+        start = time.perf_counter()
+        summaries = summarize(ForecastColumns.from_forecasts(forecasts))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(summaries), 500)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
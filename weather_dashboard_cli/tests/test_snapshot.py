@@ -0,0 +1,85 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Mini_Project_2 import main
+from snapshot import HEADER, Snapshot, SnapshotError, write_snapshot
+from storage import HistoryStore
+
+RECORDS = [
+    {"city": "hyderabad", "temperature": 27.23, "condition": "few clouds", "time": "2026-01-27T12:37:05"},
+    {"city": "goa", "temperature": 26.21, "condition": "clear sky", "time": "2026-01-28T12:21:48"},
+    {"city": "hyderabad", "temperature": None, "condition": "haze", "time": "2026-01-28T10:56:05"},
+]
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "history.wx")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(write_snapshot(self.path, RECORDS), 3)
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot.records()), RECORDS)
+
+    def test_columns_are_dictionary_encoded_and_mapped(self):
+        write_snapshot(self.path, RECORDS)
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.cities, ["hyderabad", "goa"])
+            self.assertEqual(list(snapshot.city), [0, 1, 0])
+            self.assertEqual(list(snapshot.condition), [0, 1, 2])
+            self.assertEqual((snapshot.time.format, snapshot.temperature.format,
+                              snapshot.city.format), ("q", "f", "B"))
+            self.assertTrue(math.isnan(snapshot.temperature[2]))
+            self.assertEqual(snapshot.time[0] % 60, 5)
+
+    def test_much_smaller_than_json(self):
+        records = [dict(RECORDS[i % 2], time=f"2026-01-{1 + i // 1000 % 28:02d}T00:00:00")
+                   for i in range(10000)]
+        write_snapshot(self.path, records)
+        json_size = len(json.dumps(records, indent=4))
+
+        self.assertLess(os.path.getsize(self.path), 14 * len(records) + 200)
+        self.assertLess(os.path.getsize(self.path) * 10, json_size)
+
+    def test_empty_snapshot(self):
+        write_snapshot(self.path, [])
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(list(snapshot.records()), [])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"[" + b" " * HEADER.size + b"]")
+
+        with self.assertRaises(SnapshotError):
+            Snapshot(self.path)
+
+    def test_cli_export_and_import(self):
+        source = HistoryStore(os.path.join(self.tmp.name, "a.db"), None)
+        source.append_many(RECORDS)
+        target = HistoryStore(os.path.join(self.tmp.name, "b.db"), None)
+
+        with patch("Mini_Project_2.default_store", return_value=source), patch("builtins.print"):
+            self.assertEqual(main(["hyderabad", "--export-snapshot", self.path]), 0)
+        with patch("Mini_Project_2.default_store", return_value=target), patch("builtins.print"):
+            self.assertEqual(main(["--import-snapshot", self.path]), 0)
+
+        self.assertEqual([r["condition"] for r in target.records()], ["few clouds", "haze"])
+        source.close()
+        target.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
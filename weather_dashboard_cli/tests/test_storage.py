@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from storage import HistoryStore, make_record
+from Mini_Project_2 import main
+
+
+def record(city, temperature, time):
+    return {"city": city, "temperature": temperature, "condition": "haze", "time": time}
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "history.db")
+        self.legacy = os.path.join(self.tmp.name, "history.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_read_back(self):
+        store = HistoryStore(self.db, self.legacy)
+        store.append(record("pune", 30.5, "2026-02-01T10:00:00"))
+        store.append_many([record("goa", 28.0, "2026-02-01T09:00:00"),
+                           record("pune", 31.0, "2026-02-02T10:00:00")])
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual([r["city"] for r in store.records()], ["goa", "pune", "pune"])
+        self.assertEqual([r["temperature"] for r in store.records("pune")], [30.5, 31.0])
+        store.close()
+
+    def test_wal_mode_and_indexes(self):
+        HistoryStore(self.db, self.legacy).close()
+        conn = sqlite3.connect(self.db)
+
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(history)")}
+        self.assertTrue({"history_city_nocase_time", "history_time"} <= indexes)
+        conn.close()
+
+    def test_legacy_json_is_migrated_once(self):
+        with open(self.legacy, "w") as file:
+            json.dump([record("hyderabad", 27.23, "2026-01-27T12:37:05")], file, indent=4)
+
+        store = HistoryStore(self.db, self.legacy)
+        self.assertEqual(len(store), 1)
+        self.assertFalse(os.path.exists(self.legacy))
+        self.assertTrue(os.path.exists(self.legacy + ".migrated"))
+        store.close()
+
+        # Restoring the old file does not import it twice
+        os.replace(self.legacy + ".migrated", self.legacy)
+        store = HistoryStore(self.db, self.legacy)
+        self.assertEqual(len(store), 1)
+        store.close()
+
+    def test_concurrent_writers_keep_every_record(self):
+        HistoryStore(self.db, self.legacy).close()
+
+        def writer(n):
+            store = HistoryStore(self.db, self.legacy)
+            for i in range(50):
+                store.append(record(f"city{n}", i, f"2026-02-01T10:00:{i:02d}"))
+            store.close()
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        store = HistoryStore(self.db, self.legacy)
+        self.assertEqual(len(store), 200)
+        store.close()
+
+    def test_make_record(self):
+        data = {"main": {"temp": 30}, "weather": [{"description": "clear sky"}]}
+
+        rec = make_record("Chennai", data)
+
+        self.assertEqual((rec["city"], rec["temperature"], rec["condition"]),
+                         ("Chennai", 30, "clear sky"))
+
+
+class TestHistoryQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(os.path.join(self.tmp.name, "history.db"), None)
+        self.store.append_many([
+            {"city": "hyderabad", "temperature": 27.0, "condition": "haze", "time": "2026-02-01T08:00:00"},
+            {"city": "Hyderabad", "temperature": 31.0, "condition": "clear sky", "time": "2026-02-01T14:00:00"},
+            {"city": "hyderabad", "temperature": 25.0, "condition": "haze", "time": "2026-02-02T08:00:00"},
+            {"city": "goa", "temperature": 29.0, "condition": "haze", "time": "2026-02-01T09:00:00"},
+            {"city": "goa", "temperature": 30.0, "condition": "rain", "time": "2026-02-03T09:00:00"},
+        ])
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_filter_by_city_and_time_range(self):
+        rows = list(self.store.records("HYDERABAD", start="2026-02-01T12:00", end="2026-02-03"))
+
+        self.assertEqual([r["temperature"] for r in rows], [31.0, 25.0])
+        self.assertEqual(len(list(self.store.records(["goa", "hyderabad"]))), 5)
+
+    def test_daily_stats_per_city(self):
+        rows = self.store.daily_stats(end="2026-02-03")
+
+        self.assertEqual(rows, [
+            {"city": "goa", "day": "2026-02-01", "min": 29.0, "max": 29.0, "mean": 29.0, "count": 1},
+            {"city": "hyderabad", "day": "2026-02-01", "min": 27.0, "max": 31.0, "mean": 29.0,
+             "count": 2},
+            {"city": "hyderabad", "day": "2026-02-02", "min": 25.0, "max": 25.0, "mean": 25.0,
+             "count": 1},
+        ])
+
+    def test_condition_frequencies(self):
+        self.assertEqual(self.store.condition_frequencies(), [
+            ("haze", 3, 0.6), ("clear sky", 1, 0.2), ("rain", 1, 0.2),
+        ])
+        self.assertEqual(self.store.condition_frequencies("goa", start="2026-02-02"),
+                         [("rain", 1, 1.0)])
+
+    def test_cli_prints_history_summaries(self):
+
+        with patch("Mini_Project_2.default_store", return_value=self.store), \
+                patch("builtins.print") as printed:
+            self.assertEqual(main(["hyderabad", "--stats", "--conditions"]), 0)
+
+        lines = [call.args[0] for call in printed.call_args_list if call.args]
+        self.assertIn("hyderabad | 2026-02-01 | min 27.0°C | max 31.0°C | mean 29.0°C | 2 readings",
+                      lines)
+        self.assertIn("haze | 2 | 67%", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
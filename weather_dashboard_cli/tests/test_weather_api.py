@@ -1,10 +1,19 @@
+import time
 import unittest
 from unittest.mock import patch
-from weather_api import get_current_weather
+
+import requests
+
+from stub_server import StubServer
+from weather_api import WeatherClient, get_current_weather
 
 class TestWeatherAPI(unittest.TestCase):
 
-    @patch("weather_api.requests.get")
+    # A fresh shared client with an in-memory cache, so the test neither
+    # reads nor writes the cache file in the working directory
+    @patch("weather_api._default_client", None)
+    @patch("weather_api.CACHE_FILE", None)
+    @patch("weather_api.requests.Session.get")
     def test_get_current_weather(self, mock_get):
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = {
@@ -17,5 +26,57 @@ class TestWeatherAPI(unittest.TestCase):
         self.assertEqual(data["name"], "London")
         self.assertEqual(data["main"]["temp"], 20)
 
+
+class TestWeatherClient(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubServer()
+        self.stub.routes["/weather"] = lambda params: (200, {"name": params["q"], "main": {"temp": 21}})
+        self.stub.routes["/forecast"] = lambda params: (200, {"city": {"name": params["q"]}, "list": []})
+        self.client = WeatherClient(api_key="secret", base_url=f"{self.stub.url}/weather",
+                                    forecast_url=f"{self.stub.url}/forecast", timeout=(1, 1))
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.close()
+
+    def test_sends_city_key_and_units(self):
+        data = self.client.get_current_weather("Pune")
+
+        self.assertEqual(data["name"], "Pune")
+        path, params, _ = self.stub.requests[0]
+        self.assertEqual(path, "/weather")
+        self.assertEqual(params, {"q": "Pune", "appid": "secret", "units": "metric"})
+
+    def test_current_and_forecast_are_fetched_concurrently(self):
+        self.stub.latency = 0.2
+
+        start = time.perf_counter()
+        weather, forecast = self.client.get_weather_and_forecast("Pune")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(weather["name"], "Pune")
+        self.assertEqual(forecast["city"]["name"], "Pune")
+        self.assertEqual(self.stub.max_active, 2)
+        self.assertLess(elapsed, 0.35)
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            self.client.get_current_weather("Pune")
+
+        self.assertEqual(len({address for _, _, address in self.stub.requests}), 1)
+
+    def test_http_errors_are_raised(self):
+        self.stub.routes["/weather"] = (404, {"message": "city not found"})
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.client.get_weather_and_forecast("Atlantis")
+
+    def test_slow_responses_time_out(self):
+        self.stub.latency = 1.5
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.client.get_forecast("Pune")
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from stub_server import StubServer
+from weather_api import RateLimiter, WeatherClient
+from weather_batch import fetch_cities, read_cities
+from weather_cache import WeatherCache
+from Mini_Project_2 import main
+
+
+def weather(params):
+    if params["q"] == "Atlantis":
+        return 404, {"message": "city not found"}
+    return 200, {"name": params["q"], "main": {"temp": 20.5, "humidity": 50},
+                 "weather": [{"description": "clear sky"}]}
+
+
+def forecast(params):
+    slots = [{"dt": 1769990400 + i * 10800, "main": {"temp": 20 + i % 8}} for i in range(40)]
+    return 200, {"city": {"name": params["q"]}, "list": slots}
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_sliding_window(self):
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(calls=3, period=10, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            limiter.acquire()
+        now[0] = 4
+        limiter.acquire()
+
+        self.assertEqual(waits, [6])
+        self.assertEqual(now[0], 10)
+
+
+class TestFetchCities(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubServer()
+        self.stub.routes["/weather"] = weather
+        self.stub.routes["/forecast"] = forecast
+        self.client = WeatherClient(api_key="key", base_url=f"{self.stub.url}/weather",
+                                    forecast_url=f"{self.stub.url}/forecast", timeout=(1, 2))
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.close()
+
+    def test_concurrency_is_bounded(self):
+        self.stub.latency = 0.05
+        cities = [f"City{i}" for i in range(12)]
+
+        start = time.perf_counter()
+        results = list(fetch_cities(cities, self.client, max_concurrency=4))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(sorted(r["city"] for r in results), sorted(cities))
+        self.assertLessEqual(self.stub.max_active, 4)
+        self.assertLess(elapsed, 24 * 0.05)
+
+    def test_failures_are_recorded_per_city(self):
+        results = {r["city"]: r for r in fetch_cities(["Pune", "Atlantis", "Goa"], self.client)}
+
+        self.assertNotIn("error", results["Pune"])
+        self.assertEqual(len(results["Goa"]["forecast"]["list"]), 40)
+        self.assertIn("404", results["Atlantis"]["error"])
+        self.assertIsNone(results["Atlantis"]["weather"])
+
+    def test_results_stream_as_they_complete(self):
+        self.stub.routes["/weather"] = lambda params: (
+            time.sleep(0.5 if params["q"] == "Slow" else 0) or weather(params))
+
+        stream = fetch_cities(["Slow", "Fast"], self.client, max_concurrency=4)
+        start = time.perf_counter()
+        first = next(stream)
+
+        self.assertEqual(first["city"], "Fast")
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(next(stream)["city"], "Slow")
+
+    def test_rate_limit_is_respected(self):
+        self.client.limiter = RateLimiter(calls=4, period=0.3)
+
+        start = time.perf_counter()
+        list(fetch_cities(["A", "B", "C", "D"], self.client))
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.3)
+        self.assertEqual(len(self.stub.requests), 8)
+
+    def test_cached_cities_use_no_rate_limit_slots(self):
+        waits = []
+        self.client.cache = WeatherCache()
+        self.client.limiter = RateLimiter(calls=4, period=1, sleep=waits.append)
+        cities = ["A", "B"]
+        list(fetch_cities(cities, self.client))
+
+        start = time.perf_counter()
+        results = list(fetch_cities(cities * 3, self.client))
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(self.stub.requests), 4)
+        self.assertEqual(waits, [])
+
+    def test_cities_are_deduplicated(self):
+        results = list(fetch_cities(["Pune", " pune ", "GOA", "goa"], self.client))
+
+        self.assertEqual(sorted(r["city"] for r in results), ["GOA", "Pune"])
+
+
+class TestBatchCli(unittest.TestCase):
+
+    def test_reads_cities_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cities.txt")
+            with open(path, "w") as file:
+                file.write("# polled hourly\nPune\n\nGoa  # beach\n")
+            self.assertEqual(read_cities(path), ["Pune", "Goa"])
+
+    def test_main_runs_a_batch_and_reports_failures(self):
+        stub = StubServer()
+        stub.routes["/weather"] = weather
+        stub.routes["/forecast"] = forecast
+        client = WeatherClient(base_url=f"{stub.url}/weather", forecast_url=f"{stub.url}/forecast")
+        saved = []
+        try:
+            with patch("Mini_Project_2.WeatherClient", return_value=client), \
+                    patch("Mini_Project_2.CACHE_FILE", None), \
+                    patch("Mini_Project_2.save_history", lambda city, data: saved.append(city)), \
+                    patch("builtins.print"):
+                status = main(["Pune", "Atlantis"])
+        finally:
+            client.close()
+            stub.close()
+
+        self.assertEqual(status, 1)
+        self.assertEqual(saved, ["Pune"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from stub_server import StubServer
+from weather_api import WeatherClient
+from weather_cache import WeatherCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWeatherCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = WeatherCache(ttls={"weather": 600, "forecast": 10800},
+                                  stale={"weather": 300, "forecast": 0}, clock=self.clock)
+        self.calls = []
+
+    def fetcher(self, value):
+        return lambda: self.calls.append(value) or value
+
+    def test_keyed_by_normalized_city_units_and_endpoint(self):
+        get = self.cache.get_or_fetch
+        self.assertEqual(get("weather", "New York", "metric", self.fetcher(1)), 1)
+        self.assertEqual(get("weather", "  new   york ", "metric", self.fetcher(2)), 1)
+        self.assertEqual(get("weather", "New York", "imperial", self.fetcher(3)), 3)
+        self.assertEqual(get("forecast", "New York", "metric", self.fetcher(4)), 4)
+        self.assertEqual(self.calls, [1, 3, 4])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+
+    def test_ttls_are_per_endpoint(self):
+        self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("w1"))
+        self.cache.get_or_fetch("forecast", "Pune", "metric", self.fetcher("f1"))
+        self.clock.now += 1000
+
+        self.assertEqual(self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("w2")), "w2")
+        self.assertEqual(self.cache.get_or_fetch("forecast", "Pune", "metric", self.fetcher("f2")), "f1")
+
+    def test_stale_entries_are_served_while_revalidating(self):
+        self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("old"))
+        self.clock.now += 700
+        release = threading.Event()
+
+        def slow_fetch():
+            release.wait(5)
+            self.calls.append("new")
+            return "new"
+
+        with ThreadPoolExecutor(2) as background:
+            self.assertEqual(self.cache.get_or_fetch("weather", "Pune", "metric", slow_fetch,
+                                                     background), "old")
+            # A second caller does not start another refresh
+            self.assertEqual(self.cache.get_or_fetch("weather", "Pune", "metric", slow_fetch,
+                                                     background), "old")
+            release.set()
+        self.assertEqual(self.calls, ["old", "new"])
+        self.assertEqual(self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("x")),
+                         "new")
+
+    def test_too_stale_entries_are_refetched(self):
+        self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("old"))
+        self.clock.now += 1000
+
+        with ThreadPoolExecutor(1) as background:
+            self.assertEqual(self.cache.get_or_fetch("weather", "Pune", "metric",
+                                                     self.fetcher("new"), background), "new")
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = WeatherCache(max_entries=2, clock=self.clock)
+        cache.get_or_fetch("weather", "a", "metric", self.fetcher("a"))
+        cache.get_or_fetch("weather", "b", "metric", self.fetcher("b"))
+        cache.get_or_fetch("weather", "a", "metric", self.fetcher("a2"))
+        cache.get_or_fetch("weather", "c", "metric", self.fetcher("c"))
+        cache.get_or_fetch("weather", "b", "metric", self.fetcher("b2"))
+
+        self.assertEqual(self.calls, ["a", "b", "c", "b2"])
+        self.assertEqual(len(cache), 2)
+
+    def test_hits_and_misses_are_counted_across_threads(self):
+        self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("w"))
+
+        def lookups(_):
+            for _ in range(2000):
+                self.cache.get_or_fetch("weather", "Pune", "metric", self.fetcher("x"))
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lookups, range(8)))
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (16000, 1))
+
+    def test_disk_store_survives_restarts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "cache.db")
+            first = WeatherCache(db, clock=self.clock)
+            first.get_or_fetch("forecast", "Pune", "metric", self.fetcher({"list": [1, 2]}))
+            first.close()
+
+            second = WeatherCache(db, clock=self.clock)
+            value = second.get_or_fetch("forecast", "pune", "metric", self.fetcher(None))
+            second.close()
+
+        self.assertEqual(value, {"list": [1, 2]})
+        self.assertEqual(len(self.calls), 1)
+
+
+class TestClientCache(unittest.TestCase):
+
+    def test_repeated_lookups_are_served_locally(self):
+        stub = StubServer()
+        stub.routes["/weather"] = (200, {"name": "Pune"})
+        client = WeatherClient(base_url=f"{stub.url}/weather", forecast_url=f"{stub.url}/forecast",
+                               cache=WeatherCache())
+        try:
+            client.get_current_weather("Pune")
+            start = time.perf_counter()
+            for _ in range(1000):
+                client.get_current_weather("pune")
+            elapsed = time.perf_counter() - start
+        finally:
+            client.close()
+            stub.close()
+
+        self.assertEqual(len(stub.requests), 1)
+        self.assertLess(elapsed / 1000, 0.001)
+
+    def test_background_refreshes_wait_for_the_rate_limiter(self):
+        stub = StubServer()
+        stub.routes["/weather"] = (200, {"name": "Pune"})
+        clock = Clock()
+        acquired = []
+        limiter = type("Limiter", (), {"acquire": lambda self: acquired.append(clock.now)})()
+        client = WeatherClient(base_url=f"{stub.url}/weather", forecast_url=f"{stub.url}/forecast",
+                               cache=WeatherCache(ttls={"weather": 600}, stale={"weather": 300},
+                                                  clock=clock),
+                               limiter=limiter)
+        try:
+            client.get_current_weather("Pune")
+            client.get_current_weather("Pune")
+            clock.now += 700
+            client.get_current_weather("Pune")
+        finally:
+            # Waits for the background refresh
+            client.close()
+            stub.close()
+
+        self.assertEqual(len(stub.requests), 2)
+        self.assertEqual(acquired, [1000.0, 1700.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,28 +1,160 @@
 
 import requests
-from config import BASE_URL, FORECAST_URL
+from requests.adapters import HTTPAdapter
+from config import BASE_URL, FORECAST_URL, UNITS, CONNECT_TIMEOUT, READ_TIMEOUT, POOL_SIZE
+from config import CACHE_FILE, RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD
+from weather_cache import WeatherCache
 from dotenv import load_dotenv
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import os
+import threading
+import time
 
 load_dotenv()
 
 
+class RateLimiter:
+    """Allow at most `calls` requests in any window of `period` seconds.
+
+    A sliding window rather than a token bucket, so a burst at the start
+    of a window can never add up to more than the API's per-minute quota.
+    Thread-safe; acquire() blocks until a request may be sent.
+    """
+
+    def __init__(self, calls=RATE_LIMIT_CALLS, period=RATE_LIMIT_PERIOD,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.calls = calls
+        self.period = period
+        self.clock = clock
+        self.sleep = sleep
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                while self._sent and now - self._sent[0] >= self.period:
+                    self._sent.popleft()
+                if len(self._sent) < self.calls:
+                    self._sent.append(now)
+                    return
+                wait = self.period - (now - self._sent[0])
+            self.sleep(wait)
+
+
+class WeatherClient:
+    """OpenWeatherMap client sharing one pooled keep-alive session.
+
+    Every request has a (connect, read) timeout, and connections are
+    reused across calls, so only the first request to the API pays for the
+    TCP+TLS handshake. get_weather_and_forecast sends both requests at the
+    same time.
+
+    With a WeatherCache, responses are reused until their endpoint's TTL
+    expires, and stale ones are refreshed on the client's thread pool
+    while the old copy is returned.
+
+    With a RateLimiter, every request that goes to the network, including
+    background refreshes, first waits for it; cache hits do not.
+    """
+
+    def __init__(self, api_key=None, base_url=BASE_URL, forecast_url=FORECAST_URL,
+                 units=UNITS, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), pool_size=POOL_SIZE,
+                 cache=None, limiter=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.forecast_url = forecast_url
+        self.units = units
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cache = cache
+        self.limiter = limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get(self, url, city, endpoint):
+        if self.cache is None:
+            return self._request(url, city)
+        return self.cache.get_or_fetch(endpoint, city, self.units,
+                                       lambda: self._request(url, city), self.executor())
+
+    def _request(self, url, city):
+        params = {
+            "q": city,
+            "appid": self.api_key or os.getenv("API_KEY"),
+            "units": self.units
+        }
+        if self.limiter is not None:
+            self.limiter.acquire()
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_current_weather(self, city):
+        return self._get(self.base_url, city, "weather")
+
+    def get_forecast(self, city):
+        return self._get(self.forecast_url, city, "forecast")
+
+    def get_weather_and_forecast(self, city):
+        """Fetch current weather and forecast concurrently; returns (weather, forecast)."""
+        forecast = self.executor().submit(self.get_forecast, city)
+        try:
+            weather = self.get_current_weather(city)
+        except Exception:
+            forecast.cancel()
+            raise
+        return weather, forecast.result()
+
+    def executor(self):
+        """Thread pool for concurrent requests, sized to the connection pool."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                thread_name_prefix="weather")
+            return self._pool
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """The shared client used by the module-level functions."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = WeatherClient(cache=WeatherCache(CACHE_FILE), limiter=RateLimiter())
+        return _default_client
+
+
 def get_current_weather(city):
-    params = {
-        "q": city,
-        "appid": os.getenv("API_KEY"),
-        "units": "metric"
-    }
-    response = requests.get(BASE_URL, params=params)
-    response.raise_for_status()
-    return response.json()
+    return default_client().get_current_weather(city)
 
 def get_forecast(city):
-    params = {
-        "q": city,
-        "appid": os.getenv("API_KEY"),
-        "units": "metric"
-    }
-    response = requests.get(FORECAST_URL, params=params)
-    response.raise_for_status()
-    return response.json()
+    return default_client().get_forecast(city)
+
+def get_weather_and_forecast(city):
+    return default_client().get_weather_and_forecast(city)
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import MAX_CONCURRENCY
+from weather_api import default_client
+from weather_cache import normalize_city
+
+
+def read_cities(path):
+    """City names from a file, one per line; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as file:
+        return [line.split("#", 1)[0].strip() for line in file
+                if line.split("#", 1)[0].strip()]
+
+
+def unique_cities(cities):
+    """Drop repeated cities (ignoring case and spacing), keeping the first spelling."""
+    seen = {}
+    for city in cities:
+        key = normalize_city(city)
+        if key and key not in seen:
+            seen[key] = city.strip()
+    return list(seen.values())
+
+
+def fetch_cities(cities, client=None, max_concurrency=MAX_CONCURRENCY, include_forecast=True):
+    """Fetch current weather and forecast for every city, yielding results as they finish.
+
+    At most max_concurrency requests are in flight at once; requests that
+    reach the network wait for the client's rate limiter, while cached
+    responses are returned without using up the quota. Each city yields one dict
+    with "city", "weather" and "forecast"; if either request failed, the
+    dict also has "error" and the batch carries on with the other cities.
+    With include_forecast=False only current weather is fetched and the
+    dicts have no "forecast".
+    """
+    client = client or default_client()
+    cities = unique_cities(cities)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="batch")
+    try:
+        futures = {}
+        for city in cities:
+            futures[pool.submit(client.get_current_weather, city)] = (city, "weather")
+            if include_forecast:
+                futures[pool.submit(client.get_forecast, city)] = (city, "forecast")
+
+        pending = {city: {} for city in cities}
+        for future in as_completed(futures):
+            city, part = futures[future]
+            try:
+                pending[city][part] = future.result()
+            except Exception as e:
+                pending[city][part] = None
+                pending[city].setdefault("error", f"{part}: {e}")
+            if "weather" in pending[city] and ("forecast" in pending[city] or not include_forecast):
+                yield dict(city=city, **pending.pop(city))
+    finally:
+        # Stop queued requests if the caller stops reading early
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,141 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import CACHE_MAX_ENTRIES, CACHE_TTLS, CACHE_STALE
+
+
+def normalize_city(city):
+    """'  New   York ' and 'new york' name the same city."""
+    return " ".join(city.split()).lower()
+
+
+class WeatherCache:
+    """Two-level TTL cache for API responses: an in-process LRU and an optional SQLite file.
+
+    Entries are keyed by (normalized city, units, endpoint) and each
+    endpoint has its own TTL. Once an entry is older than its TTL but
+    still within the endpoint's stale window, it is returned immediately
+    and refreshed in the background (stale-while-revalidate). Cached
+    responses are shared, so callers must not modify them.
+    """
+
+    def __init__(self, db=None, max_entries=CACHE_MAX_ENTRIES, ttls=CACHE_TTLS,
+                 stale=CACHE_STALE, clock=time.time):
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.stale = stale
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        self.conn = None
+        if db:
+            self.conn = sqlite3.connect(db, check_same_thread=False)
+            self.c = self.conn.cursor()
+            self.c.execute('''CREATE TABLE IF NOT EXISTS responses (
+                city TEXT NOT NULL,
+                units TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (city, units, endpoint)
+            )''')
+            self.conn.commit()
+
+    def get_or_fetch(self, endpoint, city, units, fetch, background=None):
+        """Return the cached response, calling fetch() when there is no usable one.
+
+        With a background executor, stale entries are returned at once and
+        re-fetched on it; without one they are re-fetched before returning.
+        """
+        key = (normalize_city(city), units, endpoint)
+        entry = self._lookup(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = self.clock() - stored_at
+            ttl = self.ttls.get(endpoint, 0)
+            if age < ttl:
+                self._count(hit=True)
+                return value
+            if background is not None and age < ttl + self.stale.get(endpoint, 0):
+                self._count(hit=True)
+                self._revalidate(key, fetch, background)
+                return value
+
+        self._count(hit=False)
+        value = fetch()
+        self._store(key, value)
+        return value
+
+    def _count(self, hit):
+        # Batch lookups run on many threads; += on an attribute is not atomic
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            if self.conn is None:
+                return None
+            self.c.execute('SELECT body, stored_at FROM responses WHERE city=? AND units=? '
+                           'AND endpoint=?', key)
+            row = self.c.fetchone()
+            if row is None:
+                return None
+            entry = (json.loads(row[0]), row[1])
+            self._remember(key, entry)
+            return entry
+
+    def _store(self, key, value):
+        entry = (value, self.clock())
+        with self._lock:
+            self._remember(key, entry)
+            if self.conn is not None:
+                self.c.execute('INSERT OR REPLACE INTO responses (city,units,endpoint,body,stored_at) '
+                               'VALUES (?,?,?,?,?)', key + (json.dumps(value), entry[1]))
+                self.conn.commit()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _revalidate(self, key, fetch, background):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._store(key, fetch())
+            except Exception:
+                # Keep serving the stale copy; the next caller tries again
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        background.submit(refresh)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None